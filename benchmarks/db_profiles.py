@@ -0,0 +1,92 @@
+"""Compare insert and month-query latency across the SQLite profiles.
+
+    python -m benchmarks.db_profiles [--rows 2000] [--queries 200]
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from peewee import SqliteDatabase, fn
+
+from db.migrations import MODELS
+from db import Expense
+from settings import db_profiles
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def run_profile(name, pragmas, rows, queries, seed):
+    rng = random.Random(seed)
+    types = [Expense.MUST_HAVE, Expense.NICE_TO_HAVE, Expense.WASTED]
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = SqliteDatabase(os.path.join(directory, 'bench.db'), pragmas=pragmas)
+
+        with database.bind_ctx(MODELS):
+            database.create_tables(MODELS)
+
+            # One implicit transaction per row, like Form.insert
+            insert_times = []
+            for _ in range(rows):
+                start = time.perf_counter()
+                Expense.create(
+                    name='bench',
+                    amount_of_money=rng.randint(1, 1000) * 1000,
+                    date=datetime.date(rng.randint(2015, 2024), rng.randint(1, 12), rng.randint(1, 28)),
+                    type=rng.choice(types),
+                )
+                insert_times.append(time.perf_counter() - start)
+
+            query_times = []
+            for _ in range(queries):
+                from_date = datetime.date(rng.randint(2015, 2024), rng.randint(1, 12), 1)
+                to_date = from_date.replace(day=28)
+
+                start = time.perf_counter()
+                list(Expense.select(Expense.type, fn.SUM(Expense.amount_of_money)).where(
+                    Expense.date >= from_date,
+                    Expense.date <= to_date,
+                ).group_by(Expense.type).tuples())
+                query_times.append(time.perf_counter() - start)
+
+        database.close()
+
+    return {
+        'profile': name,
+        'insert_mean_ms': statistics.mean(insert_times) * 1000,
+        'insert_p95_ms': percentile(insert_times, 95) * 1000,
+        'query_mean_ms': statistics.mean(query_times) * 1000,
+        'query_p95_ms': percentile(query_times, 95) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--profile', action='append', choices=sorted(db_profiles), help='repeatable, default: all')
+    args = parser.parse_args(argv)
+
+    print(f'{"profile":<10} {"insert mean":>12} {"insert p95":>12} {"query mean":>12} {"query p95":>12}')
+
+    for name in args.profile or db_profiles:
+        result = run_profile(name, db_profiles[name], args.rows, args.queries, args.seed)
+        print(
+            f'{name:<10} '
+            f'{result["insert_mean_ms"]:>10.3f}ms '
+            f'{result["insert_p95_ms"]:>10.3f}ms '
+            f'{result["query_mean_ms"]:>10.3f}ms '
+            f'{result["query_p95_ms"]:>10.3f}ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Fill an empty database with a seeded, realistic ledger for benchmarking.
+
+    python -m benchmarks.generate 1M [--database database.db] [--seed 1]
+
+The size is a row count with an optional k or M suffix (10k, 1M, 10M).
+About one row in twenty is income, dates run from 2017 to 2026. The same
+size and seed always give the same ledger.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+from peewee import chunked
+
+SUFFIXES = {'k': 1000, 'M': 1000 * 1000}
+
+FIRST_DAY = datetime.date(2017, 1, 1)
+LAST_DAY = datetime.date(2026, 12, 31)
+
+# One income row for this many expense rows
+EXPENSES_PER_INCOME = 19
+
+BATCH_SIZE = 20000
+
+# name, type, lowest and highest amount in thousands of VNĐ
+EXPENSES = [
+    ('Ăn sáng', 'MUST_HAVE', 20, 60),
+    ('Ăn trưa', 'MUST_HAVE', 30, 80),
+    ('Đi chợ', 'MUST_HAVE', 100, 600),
+    ('Xăng xe', 'MUST_HAVE', 50, 120),
+    ('Tiền điện', 'MUST_HAVE', 300, 1500),
+    ('Tiền nước', 'MUST_HAVE', 80, 300),
+    ('Tiền nhà', 'MUST_HAVE', 3000, 8000),
+    ('Internet', 'MUST_HAVE', 200, 300),
+    ('Cà phê', 'NICE_TO_HAVE', 25, 70),
+    ('Xem phim', 'NICE_TO_HAVE', 80, 250),
+    ('Quần áo', 'NICE_TO_HAVE', 200, 1500),
+    ('Du lịch', 'NICE_TO_HAVE', 2000, 15000),
+    ('Trà sữa', 'WASTED', 30, 70),
+    ('Đồ ăn vặt', 'WASTED', 20, 100),
+    ('Phí trễ hạn', 'WASTED', 50, 500),
+]
+
+INCOMES = [
+    ('Lương', 10000, 40000),
+    ('Thưởng', 1000, 20000),
+    ('Làm thêm', 500, 5000),
+    ('Lãi tiết kiệm', 100, 2000),
+]
+
+
+def parse_size(value):
+    multiplier = SUFFIXES.get(value[-1:], 1)
+    number = value[:-1] if value[-1:] in SUFFIXES else value
+
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid size: {value}')
+
+
+def spread_dates(count):
+    # Rows are written in date order, like a ledger kept day by day
+    days = (LAST_DAY - FIRST_DAY).days + 1
+    dates = [(FIRST_DAY + datetime.timedelta(days=day)).isoformat() for day in range(days)]
+
+    for index in range(count):
+        yield dates[index * days // count]
+
+
+def expense_rows(count, rng):
+    for date in spread_dates(count):
+        name, type, low, high = rng.choice(EXPENSES)
+        yield (name, rng.randint(low, high) * 1000, date, type)
+
+
+def income_rows(count, rng):
+    for date in spread_dates(count):
+        name, low, high = rng.choice(INCOMES)
+        yield (name, rng.randint(low, high) * 1000, date)
+
+
+def insert_statement(table, fields):
+    sql, _ = table.insert({field: None for field in fields}).sql()
+    return sql
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('size', type=parse_size, help='rows to write, e.g. 10k, 1M or 10M')
+    parser.add_argument('--database', default=os.environ.get('THUCHI_DB', 'database.db'))
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    # Bulk load without fsync; the database module reads these on import
+    os.environ['THUCHI_DB'] = args.database
+    os.environ.setdefault('THUCHI_DB_PROFILE', 'fast')
+
+    from db import Income, Expense, rollup, search
+    from db.importer import insert_batch
+
+    if Income.select().exists() or Expense.select().exists():
+        print(f'{args.database} already has rows, use an empty database')
+        return 1
+
+    incomes = args.size // (EXPENSES_PER_INCOME + 1)
+    expenses = args.size - incomes
+    rng = random.Random(args.seed)
+
+    sources = [
+        (Income, [Income.name, Income.amount_of_money, Income.date], income_rows(incomes, rng)),
+        (Expense, [Expense.name, Expense.amount_of_money, Expense.date, Expense.type], expense_rows(expenses, rng)),
+    ]
+
+    start = time.perf_counter()
+
+    # Summing the monthly totals and indexing the names once at the end is
+    # much faster than running the triggers for every row
+    rollup.drop_triggers()
+    search.drop_triggers()
+
+    try:
+        for table, fields, rows in sources:
+            sql = insert_statement(table, fields)
+
+            for batch in chunked(rows, BATCH_SIZE):
+                insert_batch(sql, batch)
+    finally:
+        rollup.create_triggers()
+        rollup.rebuild()
+        search.create_index()
+        search.rebuild()
+
+    seconds = time.perf_counter() - start
+
+    print(f'{args.database}: {incomes:,} income and {expenses:,} expense rows in {seconds:.1f} s (seed {args.seed})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
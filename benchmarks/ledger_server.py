@@ -0,0 +1,197 @@
+"""Check the ledger server against the database file and time concurrent clients.
+
+    python -m benchmarks.ledger_server [--database database.db] [--month 2026-06]
+                                       [--clients 4] [--requests 50] [--writes 0]
+
+Starts a ledger server on a free localhost port, first checks that every
+read answered over HTTP equals the same read made directly, then runs
+--clients threads that each load --requests random months the way the
+screens do. --writes adds that many expense rows to --month while the
+clients read; leave it at 0 on a ledger you want to keep unchanged.
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+from .screen_loads import parse_month
+
+
+def same_snapshot(left, right):
+    return all(
+        getattr(left, column) == getattr(right, column)
+        for column in ('year', 'month', 'types', 'ids', 'names', 'days', 'amounts', 'codes')
+    )
+
+
+def check(local, remote, year, month):
+    # Returns the names of the reads that differ
+    from db.aggregates import INCOME, EXPENSE
+
+    first = (year - 1, month)
+    reads = [
+        ('income snapshot', lambda ledger: ledger.month_snapshot(INCOME, year, month), same_snapshot),
+        ('expense snapshot', lambda ledger: ledger.month_snapshot(EXPENSE, year, month), same_snapshot),
+        ('totals', lambda ledger: ledger.monthly_totals(year, month, months=3).values, None),
+        ('trend', lambda ledger: ledger.monthly_trend(first, (year, month)).values, None),
+        ('names', lambda ledger: {
+            name: (entry.count, entry.last_date, entry.amount, entry.type)
+            for name, entry in ledger.load_names(EXPENSE).entries.items()
+        }, None),
+        ('search', lambda ledger: ledger.search('ca'), None),
+        ('budgets', lambda ledger: ledger.budgets(year, month), None),
+    ]
+
+    failed = []
+
+    for name, read, compare in reads:
+        expected, actual = read(local), read(remote)
+        same = compare(expected, actual) if compare else expected == actual
+
+        if not same:
+            failed.append(name)
+
+    snapshot = local.month_snapshot(EXPENSE, year, month)
+
+    if len(snapshot) and local.get(EXPENSE, snapshot.ids[0]) != remote.get(EXPENSE, snapshot.ids[0]):
+        failed.append('row')
+
+    return failed
+
+
+def run_clients(remote, months, clients, requests, seed):
+    from db.aggregates import INCOME, EXPENSE
+
+    timings = {'snapshot': [], 'totals': []}
+    lock = threading.Lock()
+
+    def client(number):
+        rng = random.Random(seed + number)
+        local = {'snapshot': [], 'totals': []}
+
+        for _ in range(requests):
+            year, month = rng.choice(months)
+
+            start = time.perf_counter()
+            remote.month_snapshot(rng.choice((INCOME, EXPENSE)), year, month)
+            local['snapshot'].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            remote.monthly_totals(year, month, months=2)
+            local['totals'].append((time.perf_counter() - start) * 1000)
+
+        remote.close()
+
+        with lock:
+            for name, values in local.items():
+                timings[name].extend(values)
+
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return timings, time.perf_counter() - start
+
+
+def run_writes(remote, year, month, writes):
+    from db.aggregates import EXPENSE
+
+    timings = []
+
+    for number in range(writes):
+        start = time.perf_counter()
+        remote.insert(EXPENSE, f'Benchmark {number}', 1000, datetime.date(year, month, 1), 'WASTED')
+        timings.append((time.perf_counter() - start) * 1000)
+
+    remote.close()
+    return timings
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(name, values):
+    print(
+        f'{name:<10} {len(values):>6} requests  median {statistics.median(values):8.2f} ms  '
+        f'p95 {percentile(values, 0.95):8.2f} ms  max {max(values):8.2f} ms'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=os.environ.get('THUCHI_DB', 'database.db'))
+    parser.add_argument('--month', type=parse_month, default=(2026, 6))
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=50, help='months loaded by each client')
+    parser.add_argument('--writes', type=int, default=0, help='expense rows added while the clients read')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f'{args.database} not found, fill it with python -m benchmarks.generate')
+        return 1
+
+    # This process reads the file directly and is the server
+    os.environ['THUCHI_DB'] = args.database
+    os.environ.pop('THUCHI_SERVER', None)
+
+    from db.aggregates import shift_month
+    from db.cache import month_cache
+    from db.ledger import LocalLedger
+    from db.remote import RemoteLedger
+    from db.server import LedgerServer
+
+    year, month = args.month
+    local = LocalLedger()
+    server = LedgerServer(LocalLedger())
+    url = server.start_thread()
+    remote = RemoteLedger(url)
+
+    print(f'Serving {args.database} on {url}')
+
+    try:
+        failed = check(local, remote, year, month)
+
+        if failed:
+            print(f'Server answers differ from the database: {", ".join(failed)}')
+            return 1
+
+        print('Server answers match the database')
+
+        # Every month of the last two years, loaded cold by the server
+        months = [shift_month(year, month, -delta) for delta in range(24)]
+        month_cache.clear()
+
+        writes = []
+        writer = threading.Thread(target=lambda: writes.extend(run_writes(remote, year, month, args.writes)))
+        writer.start()
+        timings, seconds = run_clients(remote, months, args.clients, args.requests, args.seed)
+        writer.join()
+
+        requests = sum(len(values) for values in timings.values())
+        print(f'{args.clients} clients, {requests:,} reads in {seconds:.2f} s ({requests / seconds:,.0f} reads/s)')
+
+        for name, values in timings.items():
+            report(name, values)
+
+        if writes:
+            report('insert', writes)
+    finally:
+        server.stop_thread()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Check that memory stays flat while navigating between screens.
+
+    python -m benchmarks.navigation_memory [--navigations 1000]
+
+Exits with status 1 if the number of live widgets grows or Python heap
+usage grows by more than --max-growth-kb.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from PyQt6.QtWidgets import QApplication
+
+
+def settle(app, seconds=0.0):
+    # Let queued loads deliver their results
+    end = time.perf_counter() + seconds
+    while True:
+        app.processEvents()
+        if time.perf_counter() >= end:
+            break
+        time.sleep(0.001)
+
+
+def navigate(app, window, count):
+    date = window.home.month_input.date().toPyDate()
+    steps = [
+        lambda: window.showIncome(date.month, date.year),
+        window.showHome,
+        lambda: window.showExpense(date.month, date.year),
+        window.showHome,
+    ]
+
+    for index in range(count):
+        steps[index % len(steps)]()
+        settle(app)
+
+
+def measure(app):
+    settle(app, 0.2)
+    gc.collect()
+    return len(QApplication.allWidgets()), tracemalloc.get_traced_memory()[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--navigations', type=int, default=1000)
+    parser.add_argument('--max-growth-kb', type=int, default=512)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from screens.main_window import MainWindow
+
+    window = MainWindow()
+
+    # Create every screen once before measuring
+    navigate(app, window, 8)
+
+    tracemalloc.start()
+    widgets_before, memory_before = measure(app)
+
+    navigate(app, window, args.navigations)
+
+    widgets_after, memory_after = measure(app)
+    tracemalloc.stop()
+
+    growth_kb = (memory_after - memory_before) / 1024
+
+    print(f'navigations: {args.navigations}')
+    print(f'widgets: {widgets_before} -> {widgets_after}')
+    print(f'python heap: {memory_before / 1024:.0f} KiB -> {memory_after / 1024:.0f} KiB ({growth_kb:+.0f} KiB)')
+
+    if widgets_after > widgets_before or growth_kb > args.max_growth_kb:
+        print('FAIL: memory grew with navigation')
+        return 1
+
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
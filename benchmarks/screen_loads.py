@@ -0,0 +1,179 @@
+"""Time the screen loads against a generated ledger and write the results as JSON.
+
+    python -m benchmarks.screen_loads [--database database.db] [--month 2026-06]
+                                      [--runs 5] [--output results.json]
+
+Fill the database first with `python -m benchmarks.generate`. Runs offscreen
+(QT_QPA_PLATFORM=offscreen) unless another platform is set. Each load is
+timed from the call until its result is shown, once with an empty month
+cache (cold) and once straight after (warm).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_month(value):
+    try:
+        date = datetime.datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected YYYY-MM, got {value}')
+
+    return date.year, date.month
+
+
+def settle(app, loaders):
+    from PyQt6.QtCore import QEventLoop
+
+    while any(loader.isLoading() for loader in loaders):
+        app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 50)
+
+
+def time_load(app, load, loader, idle):
+    # idle: every loader that must be quiet before the clock starts
+    settle(app, idle)
+
+    start = time.perf_counter()
+    load()
+    settle(app, [loader])
+
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(cold, warm):
+    return {
+        'cold_ms': [round(value, 2) for value in cold],
+        'cold_median_ms': round(statistics.median(cold), 2),
+        'cold_min_ms': round(min(cold), 2),
+        'cold_max_ms': round(max(cold), 2),
+        'warm_median_ms': round(statistics.median(warm), 2),
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=os.environ.get('THUCHI_DB', 'database.db'))
+    parser.add_argument('--month', type=parse_month, default=(2026, 6))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='JSON file to write, printed when omitted')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f'{args.database} not found, fill it with python -m benchmarks.generate')
+        return 1
+
+    os.environ['THUCHI_DB'] = args.database
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QDate, PYQT_VERSION_STR, QT_VERSION_STR
+    import peewee
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from db import Income, Expense
+    from db.cache import month_cache
+    from settings import db_profile
+    from screens.main_window import MainWindow
+
+    year, month = args.month
+
+    window = MainWindow()
+    home = window.home
+    home.month_input.setDate(QDate(year, month, 1))
+    home.debounce.stop()
+
+    window.showExpense(month, year)
+    expense = window.expenseScreen
+    window.showIncome(month, year)
+    income = window.incomeScreen
+
+    loaders = [
+        home.loader,
+        home.prefetcher,
+        expense.dataLoader,
+        expense.summaryLoader,
+        income.dataLoader,
+        income.summaryLoader,
+    ]
+
+    targets = [
+        ('Home.loadData', home.loadData, home.loader),
+        ('ExpenseScreen.loadData', expense.loadData, expense.dataLoader),
+        ('ExpenseScreen.loadDataSummary', expense.loadDataSummary, expense.summaryLoader),
+        ('IncomeScreen.loadDataSummary', income.loadDataSummary, income.summaryLoader),
+    ]
+
+    results = {}
+
+    for name, load, loader in targets:
+        cold = []
+        warm = []
+
+        for _ in range(args.runs):
+            settle(app, loaders)
+            month_cache.clear()
+            cold.append(time_load(app, load, loader, loaders))
+            warm.append(time_load(app, load, loader, loaders))
+
+        results[name] = summarize(cold, warm)
+
+    report = {
+        'benchmark': 'screen_loads',
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit(),
+        'database': os.path.abspath(args.database),
+        'rows': {
+            'income': Income.select().count(),
+            'expense': Expense.select().count(),
+        },
+        'month': f'{year}-{month:02d}',
+        'runs': args.runs,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sqlite': sqlite3.sqlite_version,
+            'peewee': peewee.__version__,
+            'qt': QT_VERSION_STR,
+            'pyqt': PYQT_VERSION_STR,
+            'qpa_platform': os.environ['QT_QPA_PLATFORM'],
+            'db_profile': db_profile,
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+
+        for name, result in results.items():
+            print(f'{name:32} cold {result["cold_median_ms"]:9.2f} ms  warm {result["warm_median_ms"]:9.2f} ms')
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Measure cold-start import time and time to first paint of main.py.
+
+    python -m benchmarks.startup [--runs 5] [--budget-ms 800] [--top 15]
+
+Imports are measured with `python -X importtime -c "import main"`. Time to
+first paint runs main.main() in a fresh interpreter and stops at the first
+paint event of a window. Exits with status 1 if the median time to first
+paint is over --budget-ms.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child; quits the event loop at the first window paint and
+# prints the seconds since the parent started the process
+PROBE = '''
+import os, sys, time
+from PyQt6.QtWidgets import QApplication
+from PyQt6 import QtCore
+
+started = float(os.environ['THUCHI_STARTUP_STARTED'])
+
+
+class Probe(QtCore.QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Type.Paint and obj.isWidgetType() and obj.isWindow():
+            print(time.time() - started, flush=True)
+            QApplication.instance().exit(0)
+        return False
+
+
+probe = Probe()
+exec_ = QApplication.exec
+
+
+def exec():
+    QApplication.instance().installEventFilter(probe)
+    return exec_()
+
+
+QApplication.exec = staticmethod(exec)
+sys.argv = ['main.py']
+
+import main
+main.main()
+'''
+
+
+def import_times():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    # import time: self [us] | cumulative | imported package
+    # Nested imports are indented by two spaces per level and listed
+    # before the module importing them
+    children = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+
+        if depth == 1:
+            children.append((int(cumulative), name))
+        elif depth == 0:
+            if name == 'main':
+                return int(cumulative), sorted(children, reverse=True)
+
+            children = []
+
+    raise RuntimeError('main was not imported')
+
+
+def first_paint():
+    env = dict(os.environ, THUCHI_STARTUP_STARTED=repr(time.time()))
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+
+    return float(result.stdout.split()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=int, default=800)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    total, times = import_times()
+
+    print(f'import main: {total / 1000:.0f} ms')
+
+    for cumulative, name in times[:args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+    paints = [first_paint() * 1000 for _ in range(args.runs)]
+    median = statistics.median(paints)
+
+    print(f'first paint: median {median:.0f} ms, best {min(paints):.0f} ms over {args.runs} runs (budget {args.budget_ms} ms)')
+
+    if median > args.budget_ms:
+        print('FAIL: over the startup budget')
+        return 1
+
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
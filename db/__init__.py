@@ -1,8 +1,14 @@
 from .database import db
 from .income import Income
 from .expense import Expense
+from .monthly_total import MonthlyTotal
+from .budget import Budget
+from .migrations import migrate
+from helpers import profiling
+from settings import ledger_url
 
-db.create_tables([
-    Income,
-    Expense,
-])
+# A client of a ledger server leaves the database to the server
+if not ledger_url:
+    migrate()
+
+profiling.install(db)
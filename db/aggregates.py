@@ -0,0 +1,112 @@
+import datetime
+from peewee import Tuple
+from .monthly_total import MonthlyTotal
+from .cache import month_cache
+
+INCOME = 'income'
+EXPENSE = 'expense'
+
+
+def month_bounds(year, month):
+    from_date = datetime.date(year, month, 1)
+    to_date = datetime.date(year + int(month/12), month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return from_date, to_date
+
+
+def shift_month(year, month, delta):
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
+
+
+class MonthlyTotals:
+
+    def __init__(self, rows=()):
+        # (kind, year, month, type) -> amount, income rows use type ''
+        self.values = {}
+
+        for kind, year, month, type, amount in rows:
+            self.values[(kind, year, month, type)] = amount
+
+    def get(self, kind, year, month, type=None):
+        if type is not None:
+            return self.values.get((kind, year, month, type), 0)
+
+        return sum(
+            amount for (k, y, m, _), amount in self.values.items()
+            if k == kind and y == year and m == month
+        )
+
+    def apply(self, change):
+        # Adjust by a RowChange without going back to the database
+        year, month = change.date.year, change.date.month
+
+        if change.old_amount is not None:
+            key = (change.kind, year, month, change.old_type)
+            self.values[key] = self.values.get(key, 0) - change.old_amount
+
+        key = (change.kind, year, month, change.new_type)
+        self.values[key] = self.values.get(key, 0) + change.new_amount
+
+
+def monthly_totals(year, month, months=1, kinds=(INCOME, EXPENSE), cached_only=False):
+    # Totals of the `months` months ending with year/month. Months missing
+    # from the cache are read from the rollup table in one query. With
+    # cached_only, returns None instead of querying.
+    keys = [
+        (kind, *shift_month(year, month, -delta))
+        for delta in range(months)
+        for kind in kinds
+    ]
+
+    cached = {key: month_cache.lookup(*key, 'totals', count=False) for key in keys}
+    missing = [key for key, value in cached.items() if value is None]
+
+    if missing and cached_only:
+        return None
+
+    month_cache.record(hits=len(keys) - len(missing), misses=len(missing))
+
+    if missing:
+        versions = {key: month_cache.version(*key) for key in missing}
+        first = min((key[1], key[2]) for key in missing)
+        last = max((key[1], key[2]) for key in missing)
+
+        loaded = {key: {} for key in missing}
+        for kind, row_year, row_month, type, amount in _rollup_query(first, last, {key[0] for key in missing}):
+            key = (kind, row_year, row_month)
+            if key in loaded:
+                loaded[key][type] = amount
+
+        for key, totals in loaded.items():
+            month_cache.store(*key, 'totals', totals, versions[key])
+
+        cached.update(loaded)
+
+    return MonthlyTotals(
+        (kind, row_year, row_month, type, amount)
+        for (kind, row_year, row_month), totals in cached.items()
+        for type, amount in totals.items()
+    )
+
+
+def monthly_trend(first, last, kinds=(INCOME, EXPENSE)):
+    # Totals of every month from first to last, (year, month) inclusive, in
+    # one range query over the rollup table. Not cached: a span of years
+    # would push every month the screens need out of the month cache.
+    return MonthlyTotals(_rollup_query(first, last, kinds))
+
+
+def _rollup_query(first, last, kinds):
+    month_key = Tuple(MonthlyTotal.year, MonthlyTotal.month)
+
+    return MonthlyTotal.select(
+        MonthlyTotal.kind,
+        MonthlyTotal.year,
+        MonthlyTotal.month,
+        MonthlyTotal.type,
+        MonthlyTotal.amount_of_money,
+    ).where(
+        month_key >= Tuple(*first),
+        month_key <= Tuple(*last),
+        MonthlyTotal.kind.in_(list(kinds)),
+    ).tuples()
@@ -0,0 +1,60 @@
+from peewee import (
+    Model,
+    CharField,
+    CompositeKey,
+    IntegerField,
+    Tuple,
+)
+from .database import db
+from .expense import Expense
+
+EXPENSE_TYPES = (Expense.MUST_HAVE, Expense.NICE_TO_HAVE, Expense.WASTED)
+
+
+class Budget(Model):
+    # Spending limit of one expense type from year/month on, until a later
+    # month sets another. 0 means no budget, so it ends an earlier one.
+    type = CharField()
+    year = IntegerField()
+    month = IntegerField()
+    amount_of_money = IntegerField(default=0)
+
+    class Meta:
+        database = db
+        table_name = 'budget'
+        # Type first, so the latest budget of a type is one index lookup
+        primary_key = CompositeKey('type', 'year', 'month')
+
+
+def month_budgets(year, month):
+    # Budget of each expense type in a month, 0 when there is none
+    month_key = Tuple(Budget.year, Budget.month)
+    budgets = {}
+
+    for type in EXPENSE_TYPES:
+        budgets[type] = Budget.select(Budget.amount_of_money).where(
+            Budget.type == type,
+            month_key <= Tuple(year, month),
+        ).order_by(Budget.year.desc(), Budget.month.desc()).limit(1).scalar() or 0
+
+    return budgets
+
+
+def set_budgets(year, month, amounts):
+    # amounts: type -> Budget.amount_of_money from this month on
+    with db.atomic():
+        for type, amount in amounts.items():
+            if type not in EXPENSE_TYPES:
+                raise ValueError(f'invalid type {type!r}, expected one of {", ".join(EXPENSE_TYPES)}')
+
+            if amount < 0:
+                raise ValueError('a budget cannot be negative')
+
+            Budget.insert(
+                type=type,
+                year=year,
+                month=month,
+                amount_of_money=amount,
+            ).on_conflict_replace().execute()
+
+    return month_budgets(year, month)
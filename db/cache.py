@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from settings import month_cache_size
+
+
+class MonthCache:
+    # LRU of per-month data keyed by (table, year, month). Each entry holds
+    # named parts ('rows', 'totals') loaded independently. Writers call
+    # invalidate() for the month they touched; a load that started before
+    # that is not stored, since its version no longer matches.
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, table, year, month):
+        with self.lock:
+            return self.versions.get((table, year, month), 0)
+
+    def lookup(self, table, year, month, part, count=True):
+        key = (table, year, month)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            value = entry.get(part) if entry is not None else None
+
+            if value is not None:
+                self.entries.move_to_end(key)
+
+            if count:
+                if value is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            return value
+
+    def record(self, hits=0, misses=0):
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+
+    def store(self, table, year, month, part, value, version):
+        key = (table, year, month)
+
+        with self.lock:
+            if self.versions.get(key, 0) != version:
+                return
+
+            self.entries.setdefault(key, {})[part] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, table, year, month):
+        key = (table, year, month)
+
+        with self.lock:
+            self.entries.pop(key, None)
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            for key in self.entries:
+                self.versions[key] = self.versions.get(key, 0) + 1
+
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'capacity': self.capacity,
+            }
+
+
+month_cache = MonthCache(month_cache_size)
@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+# A single saved row, as seen by the screens. old_amount and old_type are
+# None for inserts. Forms only edit rows inside their month, so one date is
+# enough to place both the old and the new values.
+RowChange = namedtuple('RowChange', [
+    'kind',
+    'id',
+    'name',
+    'date',
+    'old_amount',
+    'new_amount',
+    'old_type',
+    'new_type',
+])
+
+# A stored row, as the edit forms are filled from. type is '' for income.
+Row = namedtuple('Row', [
+    'kind',
+    'id',
+    'name',
+    'amount_of_money',
+    'date',
+    'type',
+])
+
+# A row to write: an insert when id is None, else an update of that row
+Save = namedtuple('Save', [
+    'kind',
+    'id',
+    'name',
+    'amount_of_money',
+    'date',
+    'type',
+])
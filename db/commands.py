@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import datetime
+import sys
+from settings import db_connect, server_host, server_port, server_readers
+from . import rollup, importer, exporter
+from .aggregates import INCOME, EXPENSE
+
+
+def rollup_command(args):
+    if args.rebuild:
+        count = rollup.rebuild()
+        print(f'Rebuilt {count} monthly totals')
+        return 0
+
+    drift = rollup.verify()
+
+    for (year, month, kind, type), stored, expected in drift:
+        print(f'{year}-{month:02d} {kind} {type or "-"}: stored {stored:,}, expected {expected:,}')
+
+    print(f'{len(drift)} monthly totals drifted')
+    return 1 if drift else 0
+
+
+def import_command(args):
+    with open(args.file, newline='', encoding='utf-8-sig') as stream:
+        result = importer.import_csv(args.kind, stream, batch_size=args.batch_size, source=args.source)
+
+    for line, message in result.errors:
+        print(f'{args.file}:{line}: {message}')
+
+    print(
+        f'Imported {result.inserted:,} of {result.rows:,} rows '
+        f'in {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s), '
+        f'{result.duplicates:,} already imported, {len(result.errors):,} invalid'
+    )
+    return 1 if result.errors else 0
+
+
+def export_command(args):
+    kinds = [INCOME, EXPENSE] if args.kind == 'all' else [args.kind]
+
+    def write(stream):
+        return exporter.export(
+            stream,
+            format=args.format,
+            kinds=kinds,
+            from_date=args.from_date,
+            to_date=args.to_date,
+            types=args.type,
+        )
+
+    if args.output == '-':
+        count = write(sys.stdout)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as stream:
+            count = write(stream)
+
+    print(f'Exported {count:,} rows', file=sys.stderr)
+    return 0
+
+
+def serve_command(args):
+    from .migrations import migrate
+    from .server import LedgerServer
+
+    # Clients never migrate, the server does it for them
+    migrate()
+    server = LedgerServer(readers=args.readers)
+
+    print(f'Serving {db_connect} on http://{args.host}:{args.port}', file=sys.stderr)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+    return 0
+
+
+def add_commands(commands):
+    command = commands.add_parser('rollup', help='verify or rebuild the monthly totals')
+    command.add_argument('--rebuild', action='store_true', help='recompute from the income/expense tables')
+    command.set_defaults(handler=rollup_command)
+
+    command = commands.add_parser('import', help='bulk import income or expense rows from CSV')
+    command.add_argument('kind', choices=[INCOME, EXPENSE])
+    command.add_argument('file', help='CSV with name, amount_of_money, date[, type] columns')
+    command.add_argument('--batch-size', type=int, default=5000, help='rows per transaction')
+    command.add_argument('--source', default=importer.DEFAULT_SOURCE, help='account or bank the file came from, part of the duplicate check')
+    command.set_defaults(handler=import_command)
+
+    command = commands.add_parser('export', help='stream the ledger to CSV or JSON Lines')
+    command.add_argument('--kind', choices=['all', INCOME, EXPENSE], default='all')
+    command.add_argument('--from', dest='from_date', type=datetime.date.fromisoformat, help='first date, YYYY-MM-DD')
+    command.add_argument('--to', dest='to_date', type=datetime.date.fromisoformat, help='last date, YYYY-MM-DD')
+    command.add_argument('--type', action='append', choices=importer.EXPENSE_TYPES, help='expense type, repeatable; leaves income out')
+    command.add_argument('--format', choices=exporter.FORMATS, default='csv')
+    command.add_argument('-o', '--output', default='-', help='file to write, default stdout')
+    command.set_defaults(handler=export_command)
+
+    command = commands.add_parser('serve', help='share the ledger with other machines over HTTP')
+    command.add_argument('--host', default=server_host, help='address to listen on, 0.0.0.0 for the whole network')
+    command.add_argument('--port', type=int, default=server_port)
+    command.add_argument('--readers', type=int, default=server_readers, help='threads answering reads')
+    command.set_defaults(handler=serve_command)
+
+
+def main(argv=None, prog='python -m db'):
+    parser = argparse.ArgumentParser(prog=prog)
+    add_commands(parser.add_subparsers(dest='command', required=True))
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
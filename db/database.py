@@ -1,4 +1,4 @@
 from peewee import SqliteDatabase
-from settings import db_connect
+from settings import db_connect, db_profile, db_profiles
 
-db = SqliteDatabase(db_connect)
+db = SqliteDatabase(db_connect, pragmas=db_profiles[db_profile])
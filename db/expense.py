@@ -18,6 +18,15 @@ class Expense(Model):
     amount_of_money = IntegerField()
     date = DateField()
     type = CharField()
+    # Set for imported rows only, see db/importer.py
+    content_hash = CharField(null=True, unique=True)
 
     class Meta:
         database = db
+        indexes = (
+            # Month range scans, optionally narrowed by type. Also serves
+            # date-only filters, so no separate index on date is needed.
+            (('date', 'type'), False),
+            # Covers the per-name summary the name suggestions are built from
+            (('name', 'date', 'amount_of_money', 'type'), False),
+        )
@@ -0,0 +1,71 @@
+import csv
+import json
+from peewee import Value
+from .income import Income
+from .expense import Expense
+from .aggregates import INCOME, EXPENSE
+
+FORMATS = ('csv', 'jsonl')
+
+# Same column names the importer reads, plus kind and id
+COLUMNS = ['kind', 'id', 'name', 'amount_of_money', 'date', 'type']
+
+
+def ledger_rows(kinds=(INCOME, EXPENSE), from_date=None, to_date=None, types=None):
+    # Yields one tuple per row in COLUMNS order. .iterator() keeps peewee
+    # from caching the result rows, so memory stays flat for any range.
+    # Filtering on expense types leaves income out.
+    if types:
+        kinds = [kind for kind in kinds if kind == EXPENSE]
+
+    for kind in kinds:
+        table = Income if kind == INCOME else Expense
+
+        query = table.select(
+            table.id,
+            table.name,
+            table.amount_of_money,
+            table.date,
+            table.type if kind == EXPENSE else Value(''),
+        )
+
+        if from_date is not None:
+            query = query.where(table.date >= from_date)
+        if to_date is not None:
+            query = query.where(table.date <= to_date)
+        if types:
+            query = query.where(table.type.in_(list(types)))
+
+        for id, name, amount, date, type in query.order_by(table.date, table.id).tuples().iterator():
+            yield kind, id, name, amount, date.isoformat(), type
+
+
+def write_csv(rows, stream):
+    writer = csv.writer(stream)
+    writer.writerow(COLUMNS)
+
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+
+    return count
+
+
+def write_jsonl(rows, stream):
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False))
+        stream.write('\n')
+        count += 1
+
+    return count
+
+
+def export(stream, format='csv', **filters):
+    rows = ledger_rows(**filters)
+
+    if format == 'jsonl':
+        return write_jsonl(rows, stream)
+
+    return write_csv(rows, stream)
@@ -0,0 +1,175 @@
+import csv
+import datetime
+import hashlib
+import time
+from helpers.validation import validate_entry, MAX_AMOUNT
+from .database import db
+from .income import Income
+from .expense import Expense
+from .aggregates import INCOME, EXPENSE
+from .cache import month_cache
+
+TABLES = {
+    INCOME: Income,
+    EXPENSE: Expense,
+}
+
+EXPENSE_TYPES = (Expense.MUST_HAVE, Expense.NICE_TO_HAVE, Expense.WASTED)
+
+# Besides ISO dates, accept the format the screens display
+DATE_FORMATS = ('%d/%m/%Y',)
+
+COLUMNS = {
+    INCOME: ('name', 'amount_of_money', 'date', 'content_hash'),
+    EXPENSE: ('name', 'amount_of_money', 'date', 'type', 'content_hash'),
+}
+
+DEFAULT_SOURCE = 'csv'
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        # Rows already imported from an earlier, overlapping file
+        self.duplicates = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def content_key(date, amount, name, source):
+    # What makes two rows the same content; the name ignores case and spacing
+    return date.isoformat(), str(amount), ' '.join(name.split()).casefold(), source
+
+
+def content_hash(date, amount, name, source, occurrence=0):
+    # occurrence numbers rows of one file with the same content key, so two
+    # equal purchases on the same day are both kept while a re-import of
+    # the same statement still matches them one to one
+    key = '\x1f'.join([*content_key(date, amount, name, source), str(occurrence)])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def parse_date(value):
+    value = value.strip()
+
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+
+    raise ValueError(f'invalid date {value!r}, expected YYYY-MM-DD or DD/MM/YYYY')
+
+
+def parse_row(kind, row):
+    name = row.get('name') or ''
+    amount = (row.get('amount_of_money') or '').strip()
+
+    if not validate_entry(name, amount):
+        raise ValueError(f'name and a whole amount_of_money from 0 to {MAX_AMOUNT:,} are required')
+
+    data = (name, int(amount), parse_date(row.get('date') or ''))
+
+    if kind == EXPENSE:
+        type = (row.get('type') or '').strip().upper()
+
+        if type not in EXPENSE_TYPES:
+            raise ValueError(f'invalid type {type!r}, expected one of {", ".join(EXPENSE_TYPES)}')
+
+        data += (type,)
+
+    return data
+
+
+def insert_statement(kind):
+    # Let peewee render the single-row INSERT once, then bind every row of
+    # a batch to it with executemany. Building the same statement through
+    # insert_many spends most of the import generating SQL in Python.
+    table = TABLES[kind]
+    # Rows whose content hash is already stored are skipped by SQLite.
+    values = {table._meta.fields[column]: None for column in COLUMNS[kind]}
+    sql, _ = table.insert(values).on_conflict(
+        conflict_target=[table.content_hash],
+        action='nothing',
+    ).sql()
+    return sql
+
+
+def insert_batch(sql, batch):
+    with db.atomic():
+        cursor = db.cursor()
+        cursor.executemany(sql, batch)
+
+    return cursor.rowcount
+
+
+def write_batch(kind, sql, batch, months):
+    # The cached months are cleared as each batch commits, so an import
+    # that stops partway leaves no stale month behind
+    try:
+        return insert_batch(sql, batch)
+    finally:
+        for year, month in months:
+            month_cache.invalidate(kind, year, month)
+
+        months.clear()
+
+
+def import_csv(kind, stream, batch_size=5000, source=DEFAULT_SOURCE):
+    # stream: text file with a header row of name, amount_of_money, date
+    # and, for expenses, type. Rows are parsed as they are read and written
+    # in one transaction per batch.
+    sql = insert_statement(kind)
+    result = ImportResult()
+    months = set()
+    occurrences = {}
+    batch = []
+
+    start = time.perf_counter()
+
+    for row in csv.DictReader(stream):
+        result.rows += 1
+
+        try:
+            data = parse_row(kind, row)
+        except ValueError as error:
+            # Header is line 1
+            result.errors.append((result.rows + 1, str(error)))
+            continue
+
+        name, amount, date = data[:3]
+        months.add((date.year, date.month))
+
+        # Counted per content key, not per parsed row: rows that differ only
+        # in name case, spacing or expense type hash alike
+        key = content_key(date, amount, name, source)
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        digest = content_hash(date, amount, name, source, occurrence)
+
+        # Stored the way peewee stores DateField values
+        batch.append((name, amount, date.isoformat(), *data[3:], digest))
+
+        if len(batch) >= batch_size:
+            result.inserted += write_batch(kind, sql, batch, months)
+            batch = []
+
+    if batch:
+        result.inserted += write_batch(kind, sql, batch, months)
+
+    result.duplicates = result.rows - len(result.errors) - result.inserted
+
+    result.seconds = time.perf_counter() - start
+
+    return result
@@ -12,7 +12,13 @@ class Income(Model):
     id = AutoField()
     name = CharField()
     amount_of_money = IntegerField()
-    date = DateField()
+    date = DateField(index=True)
+    # Set for imported rows only, see db/importer.py
+    content_hash = CharField(null=True, unique=True)
 
     class Meta:
         database = db
+        indexes = (
+            # Covers the per-name summary the name suggestions are built from
+            (('name', 'date', 'amount_of_money'), False),
+        )
@@ -0,0 +1,120 @@
+from settings import ledger_url
+from .database import db
+from .income import Income
+from .expense import Expense
+from .aggregates import monthly_totals, monthly_trend, INCOME, EXPENSE
+from .budget import month_budgets, set_budgets
+from .cache import month_cache
+from .changes import Row, RowChange, Save
+from .names import load_names
+from .queries import month_snapshot
+from .search import search, PAGE_SIZE
+
+TABLES = {
+    INCOME: Income,
+    EXPENSE: Expense,
+}
+
+
+class LocalLedger:
+    # Everything the screens read and write, against the SQLite file. The
+    # ledger server runs the same methods for its clients, and RemoteLedger
+    # in db/remote.py has the same interface over HTTP.
+
+    def month_snapshot(self, kind, year, month):
+        return month_snapshot(kind, year, month)
+
+    def monthly_totals(self, year, month, months=1, kinds=(INCOME, EXPENSE), cached_only=False):
+        return monthly_totals(year, month, months, kinds, cached_only)
+
+    def monthly_trend(self, first, last, kinds=(INCOME, EXPENSE)):
+        return monthly_trend(first, last, kinds)
+
+    def load_names(self, kind):
+        return load_names(kind)
+
+    def search(self, text, page=0, page_size=PAGE_SIZE):
+        return search(text, page, page_size)
+
+    def budgets(self, year, month):
+        return month_budgets(year, month)
+
+    def set_budgets(self, year, month, amounts):
+        return set_budgets(year, month, amounts)
+
+    def get(self, kind, id):
+        table = TABLES[kind]
+        row = table.get_by_id(id)
+
+        return Row(kind, row.id, row.name, row.amount_of_money, row.date, _type(row, kind))
+
+    def insert(self, kind, name, amount, date, type=''):
+        return self.save([Save(kind, None, name, amount, date, type)])[0]
+
+    def update(self, kind, id, name, amount, date, type=''):
+        return self.save([Save(kind, id, name, amount, date, type)])[0]
+
+    def save(self, saves):
+        # Writes a list of Save in one transaction, so a batch costs a
+        # single commit. Returns a RowChange for each.
+        changes = []
+        months = set()
+
+        with db.atomic():
+            for save in saves:
+                table = TABLES[save.kind]
+                fields = _fields(save)
+
+                if save.id is None:
+                    row = table.create(**fields)
+                    changes.append(RowChange(
+                        save.kind, row.id, save.name, save.date, None, save.amount_of_money, None, _type(save),
+                    ))
+                else:
+                    original = table.get_by_id(save.id)
+                    table.update(**fields).where(table.id == save.id).execute()
+                    changes.append(RowChange(
+                        save.kind,
+                        save.id,
+                        save.name,
+                        save.date,
+                        original.amount_of_money,
+                        save.amount_of_money,
+                        _type(original, save.kind),
+                        _type(save),
+                    ))
+                    # Forms move a row within its month, but clear both anyway
+                    months.add((save.kind, original.date.year, original.date.month))
+
+                months.add((save.kind, save.date.year, save.date.month))
+
+        for kind, year, month in months:
+            month_cache.invalidate(kind, year, month)
+
+        return changes
+
+
+def _fields(save):
+    fields = {'name': save.name, 'amount_of_money': save.amount_of_money, 'date': save.date}
+
+    if save.kind == EXPENSE:
+        fields['type'] = save.type
+
+    return fields
+
+
+def _type(row, kind=None):
+    # Income rows are totalled under type ''
+    return row.type if (kind or row.kind) == EXPENSE else ''
+
+
+def open_ledger(url=ledger_url):
+    if url:
+        from .remote import RemoteLedger
+        return RemoteLedger(url)
+
+    return LocalLedger()
+
+
+# Shared by the screens; a ledger server when settings.ledger_url is set
+ledger = open_ledger()
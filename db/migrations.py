@@ -0,0 +1,92 @@
+from .database import db
+from .income import Income
+from .expense import Expense
+from .monthly_total import MonthlyTotal
+from .budget import Budget
+from . import rollup, search
+
+MODELS = [
+    Income,
+    Expense,
+    MonthlyTotal,
+    Budget,
+]
+
+
+def add_date_indexes():
+    db.execute_sql('CREATE INDEX IF NOT EXISTS "income_date" ON "income" ("date")')
+    db.execute_sql('CREATE INDEX IF NOT EXISTS "expense_date_type" ON "expense" ("date", "type")')
+
+
+def add_monthly_rollup():
+    rollup.create_triggers()
+    rollup.rebuild()
+
+
+def add_content_hash():
+    for table in ('income', 'expense'):
+        columns = [column.name for column in db.get_columns(table)]
+
+        if 'content_hash' not in columns:
+            db.execute_sql(f'ALTER TABLE "{table}" ADD COLUMN "content_hash" VARCHAR(255)')
+
+        db.execute_sql(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_content_hash" ON "{table}" ("content_hash")')
+
+
+def add_search_index():
+    search.create_index()
+    search.rebuild()
+
+
+def add_name_indexes():
+    db.execute_sql('CREATE INDEX IF NOT EXISTS "income_name_date_amount_of_money" ON "income" ("name", "date", "amount_of_money")')
+    db.execute_sql('CREATE INDEX IF NOT EXISTS "expense_name_date_amount_of_money_type" ON "expense" ("name", "date", "amount_of_money", "type")')
+
+
+def add_budgets():
+    db.create_tables([Budget])
+
+
+def share_search_index():
+    # One index for both tables instead of one each
+    search.drop_table_indexes()
+    search.create_index()
+    search.rebuild()
+
+
+# Every step must be safe to run against a database whose tables were just
+# created from the current models, because a fresh database runs them all.
+MIGRATIONS = [
+    add_date_indexes,
+    add_monthly_rollup,
+    add_content_hash,
+    add_search_index,
+    add_name_indexes,
+    add_budgets,
+    share_search_index,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def current_version():
+    return db.execute_sql('PRAGMA user_version').fetchone()[0]
+
+
+def migrate():
+    version = current_version()
+
+    if version >= SCHEMA_VERSION:
+        return version
+
+    with db.atomic():
+        # Tables that already exist get new columns and indexes from the steps
+        db.create_tables([model for model in MODELS if not model.table_exists()])
+
+        for number, step in enumerate(MIGRATIONS[version:], version + 1):
+            step()
+            # PRAGMA does not accept bound parameters
+            db.execute_sql(f'PRAGMA user_version = {int(number)}')
+
+    return SCHEMA_VERSION
+
@@ -0,0 +1,21 @@
+from peewee import (
+    Model,
+    CharField,
+    CompositeKey,
+    IntegerField,
+)
+from .database import db
+
+
+class MonthlyTotal(Model):
+    # Maintained by the triggers in db/rollup.py, never written by the app
+    year = IntegerField()
+    month = IntegerField()
+    kind = CharField()
+    type = CharField()
+    amount_of_money = IntegerField(default=0)
+
+    class Meta:
+        database = db
+        table_name = 'monthly_total'
+        primary_key = CompositeKey('year', 'month', 'kind', 'type')
@@ -0,0 +1,128 @@
+import datetime
+import heapq
+import unicodedata
+from bisect import bisect_left, insort
+from peewee import fn, Value
+from .income import Income
+from .expense import Expense
+from .aggregates import INCOME
+
+# Uses of a name count half as much for every year since it was last used
+HALF_LIFE_DAYS = 365
+
+
+def normalize(name):
+    # Lower case without accents, so "ca" finds "Cà phê"
+    name = unicodedata.normalize('NFD', name.lower()).replace('đ', 'd')
+    return ''.join(char for char in name if not unicodedata.combining(char))
+
+
+class NameEntry:
+    __slots__ = ('name', 'count', 'last_date', 'amount', 'type')
+
+    def __init__(self, name, count, last_date, amount, type):
+        self.name = name
+        self.count = count
+        self.last_date = last_date
+        # Amount and type of the latest use, to prefill the form
+        self.amount = amount
+        self.type = type
+
+
+class NameIndex:
+    # Distinct names of one table with how often and how lately they were
+    # used. Names are kept sorted by their normalized form so a prefix is
+    # a range found by bisection.
+
+    def __init__(self, entries=()):
+        self.entries = {entry.name: entry for entry in entries}
+        self.keys = sorted((normalize(name), name) for name in self.entries)
+
+    def replace(self, other):
+        # Take over a freshly built index; forms holding this one see it.
+        # Names added while it was loading may be missing from it, so the
+        # entries of this one are merged in first.
+        missing = []
+
+        for name, entry in self.entries.items():
+            fresh = other.entries.get(name)
+
+            if fresh is None:
+                other.entries[name] = entry
+                missing.append((normalize(name), name))
+                continue
+
+            fresh.count = max(fresh.count, entry.count)
+
+            if entry.last_date > fresh.last_date:
+                fresh.last_date = entry.last_date
+                fresh.amount = entry.amount
+                fresh.type = entry.type
+
+        if missing:
+            other.keys = sorted(other.keys + missing)
+
+        self.entries = other.entries
+        self.keys = other.keys
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def add(self, name, date, amount, type=None):
+        entry = self.entries.get(name)
+
+        if entry is None:
+            self.entries[name] = NameEntry(name, 1, date, amount, type)
+            insort(self.keys, (normalize(name), name))
+            return
+
+        entry.count += 1
+
+        if date >= entry.last_date:
+            entry.last_date = date
+            entry.amount = amount
+            entry.type = type
+
+    def suggest(self, text, limit=10, today=None):
+        prefix = normalize(text.strip())
+
+        if not prefix:
+            return []
+
+        today = today or datetime.date.today()
+        start = bisect_left(self.keys, (prefix,))
+        end = bisect_left(self.keys, (prefix + '\uffff',), start)
+
+        def score(entry):
+            age = max((today - entry.last_date).days, 0)
+            return entry.count * 0.5 ** (age / HALF_LIFE_DAYS)
+
+        entries = (self.entries[name] for _, name in self.keys[start:end])
+        return [entry.name for entry in heapq.nlargest(limit, entries, key=score)]
+
+
+def load_names(kind):
+    table = Income if kind == INCOME else Expense
+    type = Value(None) if table is Income else table.type
+
+    # SQLite takes the bare amount and type columns from the row holding
+    # MAX(date); the covering (name, date, ...) index answers it alone
+    query = table.select(
+        table.name,
+        fn.COUNT(table.id),
+        fn.MAX(table.date),
+        table.amount_of_money,
+        type,
+    ).group_by(table.name).tuples()
+
+    return NameIndex(
+        NameEntry(name, count, _as_date(last_date), amount, type)
+        for name, count, last_date, amount, type in query.iterator()
+    )
+
+
+def _as_date(value):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+
+    return value
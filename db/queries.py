@@ -0,0 +1,28 @@
+from .income import Income
+from .expense import Expense
+from .aggregates import INCOME, EXPENSE
+from .cache import month_cache
+from .snapshot import MonthSnapshot
+
+INCOME_TYPES = ('',)
+EXPENSE_TYPES = (Expense.MUST_HAVE, Expense.NICE_TO_HAVE, Expense.WASTED)
+
+SOURCES = {
+    INCOME: (Income, INCOME_TYPES),
+    EXPENSE: (Expense, EXPENSE_TYPES),
+}
+
+
+def month_snapshot(kind, year, month):
+    # The cached snapshot is shared, callers get a copy they may change
+    snapshot = month_cache.lookup(kind, year, month, 'rows')
+    if snapshot is not None:
+        return snapshot.copy()
+
+    version = month_cache.version(kind, year, month)
+    table, types = SOURCES[kind]
+
+    snapshot = MonthSnapshot.load(table, year, month, types)
+
+    month_cache.store(kind, year, month, 'rows', snapshot, version)
+    return snapshot.copy()
@@ -0,0 +1,177 @@
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit, urlencode
+from settings import ledger_timeout
+from helpers import profiling
+from .aggregates import INCOME, EXPENSE
+from .search import PAGE_SIZE
+from . import wire
+
+
+class LedgerError(Exception):
+    # status is None when no reply came. sent tells whether the whole
+    # request went out before that; a write that was sent may have been
+    # made even though its reply was lost.
+
+    def __init__(self, message, status, sent=True):
+        super().__init__(message)
+        self.status = status
+        self.sent = sent
+
+    @property
+    def unknown(self):
+        # Whether the server may have carried out the request
+        return self.status is None and self.sent
+
+
+class RemoteLedger:
+    # The LocalLedger interface, answered by a ledger server (db/server.py).
+    # Every thread keeps its own keep-alive connection. Nothing is cached
+    # here since other machines write to the same ledger.
+
+    def __init__(self, url, timeout=ledger_timeout):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.local.connection = connection
+
+        return connection
+
+    def close(self):
+        connection = getattr(self.local, 'connection', None)
+
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def request(self, method, path, params=None, body=None):
+        url = self.prefix + path
+
+        if params:
+            url += '?' + urlencode(params)
+
+        data = None
+        headers = {}
+
+        if body is not None:
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json; charset=utf-8'
+
+        start = time.perf_counter()
+
+        # A kept-alive connection the server has dropped fails on first use;
+        # reads are retried once on a new one, writes are never repeated
+        # here since the server may already have made them
+        for attempt in range(2):
+            sent = False
+
+            try:
+                connection = self.connection()
+                connection.request(method, url, data, headers)
+                sent = True
+                response = connection.getresponse()
+                content = response.read()
+                break
+            except ConnectionError as error:
+                self.close()
+
+                if method != 'GET' or attempt:
+                    raise LedgerError(f'ledger server unreachable: {error}', None, sent) from error
+            except (OSError, http.client.HTTPException) as error:
+                # Timeouts, unknown hosts, cut off responses
+                self.close()
+                message = str(error) or type(error).__name__
+                raise LedgerError(f'ledger server did not answer: {message}', None, sent) from error
+
+        if profiling.enabled:
+            profiling.record(
+                'request', f'{method} {path}', time.perf_counter() - start,
+                status=response.status, bytes=len(content),
+            )
+
+        # Not every reply comes from the server, a proxy may answer with
+        # its own error page
+        try:
+            payload = json.loads(content)
+        except ValueError:
+            payload = None
+
+            if response.status < 400:
+                raise LedgerError('ledger server sent an unreadable reply', response.status)
+
+        if response.status >= 400:
+            message = payload.get('error') if isinstance(payload, dict) else None
+            raise LedgerError(message or f'{response.status} {response.reason}', response.status)
+
+        return payload
+
+    def month_snapshot(self, kind, year, month):
+        return wire.decode_snapshot(self.request('GET', f'/snapshot/{kind}/{year}/{month}'))
+
+    def monthly_totals(self, year, month, months=1, kinds=(INCOME, EXPENSE), cached_only=False):
+        # Only the server caches; the screens then load in the background
+        if cached_only:
+            return None
+
+        return wire.decode_totals(self.request('GET', '/totals', {
+            'year': year,
+            'month': month,
+            'months': months,
+            'kinds': ','.join(kinds),
+        }))
+
+    def monthly_trend(self, first, last, kinds=(INCOME, EXPENSE)):
+        return wire.decode_totals(self.request('GET', '/trend', {
+            'first': '{}-{:02d}'.format(*first),
+            'last': '{}-{:02d}'.format(*last),
+            'kinds': ','.join(kinds),
+        }))
+
+    def load_names(self, kind):
+        return wire.decode_names(self.request('GET', f'/names/{kind}'))
+
+    def search(self, text, page=0, page_size=PAGE_SIZE):
+        result = self.request('GET', '/search', {'text': text, 'page': page, 'page_size': page_size})
+        return wire.decode_search(result['rows']), result['more']
+
+    def budgets(self, year, month):
+        return self.request('GET', '/budgets', {'year': year, 'month': month})
+
+    def set_budgets(self, year, month, amounts):
+        return self.request('PUT', '/budgets', {'year': year, 'month': month}, body=amounts)
+
+    def get(self, kind, id):
+        return wire.decode_row(self.request('GET', f'/rows/{kind}/{id}'))
+
+    def insert(self, kind, name, amount, date, type=''):
+        return wire.decode_change(self.request('POST', f'/rows/{kind}', body={
+            'name': name,
+            'amount_of_money': amount,
+            'date': date.isoformat(),
+            'type': type,
+        }))
+
+    def update(self, kind, id, name, amount, date, type=''):
+        return wire.decode_change(self.request('PUT', f'/rows/{kind}/{id}', body={
+            'name': name,
+            'amount_of_money': amount,
+            'date': date.isoformat(),
+            'type': type,
+        }))
+
+    def save(self, saves):
+        return [
+            wire.decode_change(change)
+            for change in self.request('POST', '/saves', body=[wire.encode_save(save) for save in saves])
+        ]
@@ -0,0 +1,121 @@
+from peewee import fn, chunked, Value
+from .database import db
+from .income import Income
+from .expense import Expense
+from .monthly_total import MonthlyTotal
+from .aggregates import INCOME, EXPENSE
+
+_UPSERT = '''
+    INSERT INTO "monthly_total" ("year", "month", "kind", "type", "amount_of_money")
+    VALUES (
+        CAST(strftime('%Y', {row}."date") AS INTEGER),
+        CAST(strftime('%m', {row}."date") AS INTEGER),
+        '{kind}',
+        {type},
+        {sign}{row}."amount_of_money"
+    )
+    ON CONFLICT ("year", "month", "kind", "type")
+    DO UPDATE SET "amount_of_money" = "amount_of_money" + excluded."amount_of_money";
+'''
+
+_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS "{table}_rollup_{event}"
+    AFTER {event} ON "{table}"
+    BEGIN
+        {body}
+    END
+'''
+
+SOURCES = [
+    (Income, INCOME, "''"),
+    (Expense, EXPENSE, '{row}."type"'),
+]
+
+
+def create_triggers():
+    for table, kind, type in SOURCES:
+        name = table._meta.table_name
+
+        add = _UPSERT.format(row='NEW', kind=kind, type=type.format(row='NEW'), sign='')
+        remove = _UPSERT.format(row='OLD', kind=kind, type=type.format(row='OLD'), sign='-')
+
+        db.execute_sql(_TRIGGER.format(table=name, event='INSERT', body=add))
+        db.execute_sql(_TRIGGER.format(table=name, event='UPDATE', body=remove + add))
+        db.execute_sql(_TRIGGER.format(table=name, event='DELETE', body=remove))
+
+
+def drop_triggers():
+    # For bulk loads; call create_triggers() and rebuild() afterwards
+    for table, _, _ in SOURCES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            db.execute_sql('DROP TRIGGER IF EXISTS "{}_rollup_{}"'.format(
+                table._meta.table_name, event,
+            ))
+
+
+def raw_totals():
+    # Same shape as MonthlyTotal rows, summed from the raw tables
+    totals = {}
+
+    for table, kind, _ in SOURCES:
+        type = table.type if table is Expense else Value('')
+
+        query = table.select(
+            fn.strftime('%Y', table.date),
+            fn.strftime('%m', table.date),
+            type,
+            fn.SUM(table.amount_of_money),
+        ).group_by(
+            fn.strftime('%Y-%m', table.date),
+            type,
+        ).tuples()
+
+        for year, month, type, amount in query:
+            totals[(int(year), int(month), kind, type)] = amount
+
+    return totals
+
+
+def stored_totals():
+    return {
+        (year, month, kind, type): amount
+        for year, month, kind, type, amount in MonthlyTotal.select(
+            MonthlyTotal.year,
+            MonthlyTotal.month,
+            MonthlyTotal.kind,
+            MonthlyTotal.type,
+            MonthlyTotal.amount_of_money,
+        ).tuples()
+    }
+
+
+def verify():
+    # Returns [(key, stored, expected)] for every rollup that drifted
+    expected = raw_totals()
+    stored = stored_totals()
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        if stored.get(key, 0) != expected.get(key, 0):
+            drift.append((key, stored.get(key, 0), expected.get(key, 0)))
+
+    return drift
+
+
+def rebuild():
+    totals = raw_totals()
+
+    with db.atomic():
+        MonthlyTotal.delete().execute()
+
+        rows = [(*key, amount) for key, amount in totals.items()]
+        for batch in chunked(rows, 100):
+            MonthlyTotal.insert_many(batch, fields=[
+                MonthlyTotal.year,
+                MonthlyTotal.month,
+                MonthlyTotal.kind,
+                MonthlyTotal.type,
+                MonthlyTotal.amount_of_money,
+            ]).execute()
+
+    return len(totals)
@@ -0,0 +1,128 @@
+import datetime
+import re
+from .database import db
+from .income import Income
+from .expense import Expense
+from .aggregates import INCOME, EXPENSE
+
+# One FTS5 index over the names of both tables, so bm25 ranks every match
+# against the same statistics. kind and id say which row a name belongs
+# to; the rowid packs both (id * 2 + the table's offset) so the triggers
+# below find an entry without a scan. remove_diacritics lets "ca phe" find
+# "Cà phê".
+_INDEX = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS "ledger_search" USING fts5(
+        name,
+        kind UNINDEXED,
+        id UNINDEXED,
+        prefix="2 3",
+        tokenize="unicode61 remove_diacritics 2"
+    )
+'''
+
+_ADD = '''
+    INSERT INTO "ledger_search" (rowid, name, kind, id)
+    VALUES (NEW."id" * 2 + {offset}, NEW."name", '{kind}', NEW."id");
+'''
+_RENAME = 'UPDATE "ledger_search" SET name = NEW."name" WHERE rowid = NEW."id" * 2 + {offset};'
+_REMOVE = 'DELETE FROM "ledger_search" WHERE rowid = OLD."id" * 2 + {offset};'
+
+_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS "{table}_ledger_search_{name}"
+    AFTER {event} ON "{table}"
+    BEGIN
+        {body}
+    END
+'''
+
+# table, kind, rowid offset
+SOURCES = [
+    (Income, INCOME, 0),
+    (Expense, EXPENSE, 1),
+]
+
+_SELECT = f'''
+    SELECT found."kind", found."id", found."name",
+           COALESCE(income."date", expense."date"),
+           COALESCE(income."amount_of_money", expense."amount_of_money"),
+           COALESCE(expense."type", '')
+    FROM "ledger_search" AS found
+    LEFT JOIN "income" ON found."kind" = '{INCOME}' AND income."id" = found."id"
+    LEFT JOIN "expense" ON found."kind" = '{EXPENSE}' AND expense."id" = found."id"
+    WHERE "ledger_search" MATCH ?
+    ORDER BY found."rank", 4 DESC, 1, 2 DESC
+    LIMIT ? OFFSET ?
+'''
+
+PAGE_SIZE = 50
+
+
+def create_index():
+    db.execute_sql(_INDEX)
+
+    for table, kind, offset in SOURCES:
+        name = table._meta.table_name
+
+        # Only a changed name needs reindexing
+        for trigger, event, body in (
+            ('INSERT', 'INSERT', _ADD.format(offset=offset, kind=kind)),
+            ('UPDATE', 'UPDATE OF "name"', _RENAME.format(offset=offset)),
+            ('DELETE', 'DELETE', _REMOVE.format(offset=offset)),
+        ):
+            db.execute_sql(_TRIGGER.format(table=name, name=trigger, event=event, body=body))
+
+
+def drop_triggers():
+    # For bulk loads; call create_index() and rebuild() afterwards
+    for table, _, _ in SOURCES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            db.execute_sql('DROP TRIGGER IF EXISTS "{}_ledger_search_{}"'.format(
+                table._meta.table_name, event,
+            ))
+
+
+def drop_table_indexes():
+    # The index of each table used before ledger_search
+    for table, _, _ in SOURCES:
+        name = table._meta.table_name
+
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            db.execute_sql(f'DROP TRIGGER IF EXISTS "{name}_search_{event}"')
+
+        db.execute_sql(f'DROP TABLE IF EXISTS "{name}_search"')
+
+
+def rebuild():
+    db.execute_sql('DELETE FROM "ledger_search"')
+
+    for table, kind, offset in SOURCES:
+        name = table._meta.table_name
+        db.execute_sql(
+            f'INSERT INTO "ledger_search" (rowid, name, kind, id) '
+            f'SELECT "id" * 2 + {offset}, "name", \'{kind}\', "id" FROM "{name}"'
+        )
+
+
+def match_query(text):
+    # Every word of the text as a quoted prefix, all of them must match
+    words = re.findall(r'\w+', text)
+
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(text, page=0, page_size=PAGE_SIZE):
+    # Returns (rows, more): rows are (kind, id, name, date, amount, type),
+    # best match first and newest first among equal matches
+    query = match_query(text)
+
+    if not query:
+        return [], False
+
+    rows = [
+        (kind, id, name, datetime.date.fromisoformat(date), amount, type)
+        for kind, id, name, date, amount, type in db.execute_sql(
+            _SELECT, [query, page_size + 1, page * page_size],
+        ).fetchall()
+    ]
+
+    return rows[:page_size], len(rows) > page_size
@@ -0,0 +1,408 @@
+import asyncio
+import datetime
+import json
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from peewee import DoesNotExist
+from settings import server_host, server_port, server_readers
+from .aggregates import INCOME, EXPENSE
+from .budget import EXPENSE_TYPES
+from .changes import Save
+from helpers.validation import MAX_AMOUNT
+from .importer import parse_row
+from .ledger import LocalLedger
+from .search import PAGE_SIZE
+from . import wire
+
+# Largest request body accepted; a saved row is about a hundred bytes, so
+# this leaves room for batches of thousands
+MAX_BODY = 1024 * 1024
+
+KIND = f'({INCOME}|{EXPENSE})'
+
+# Ranges of the numbers a request may carry, checked before any query:
+# datetime takes years 1 to 9999, SQLite rowids are signed 64 bit
+YEARS = (1, 9999)
+MONTHS = (1, 12)
+IDS = (1, 2 ** 63 - 1)
+
+READ = 'read'
+WRITE = 'write'
+
+# method, path, handler, pool
+ROUTES = [
+    ('GET', rf'/snapshot/{KIND}/(\d+)/(\d+)', 'snapshot', READ),
+    ('GET', r'/totals', 'totals', READ),
+    ('GET', r'/trend', 'trend', READ),
+    ('GET', rf'/names/{KIND}', 'names', READ),
+    ('GET', r'/search', 'search', READ),
+    ('GET', r'/budgets', 'budgets', READ),
+    ('PUT', r'/budgets', 'set_budgets', WRITE),
+    ('GET', rf'/rows/{KIND}/(\d+)', 'row', READ),
+    ('POST', rf'/rows/{KIND}', 'insert', WRITE),
+    ('PUT', rf'/rows/{KIND}/(\d+)', 'update', WRITE),
+    ('POST', r'/saves', 'save', WRITE),
+]
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LedgerServer:
+    # Serves a LocalLedger as JSON over HTTP so several machines can share
+    # one ledger without opening the SQLite file over a file share. The
+    # event loop only parses requests; the queries run on a pool of reader
+    # threads, each with its own connection, and every write goes through
+    # a single writer thread since SQLite allows one writer at a time. In
+    # WAL mode the readers carry on while a write is committed.
+
+    def __init__(self, ledger=None, readers=server_readers):
+        self.ledger = ledger or LocalLedger()
+        self.readers = ThreadPoolExecutor(readers, thread_name_prefix='ledger-reader')
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix='ledger-writer')
+        self.routes = [
+            (method, re.compile(path + '$'), getattr(self, handler), pool)
+            for method, path, handler, pool in ROUTES
+        ]
+        self.server = None
+        self.loop = None
+        self.thread = None
+        self.connections = set()
+
+    async def start(self, host=server_host, port=server_port):
+        # Returns the address bound, port 0 picks a free one
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve(self, host=server_host, port=server_port):
+        await self.start(host, port)
+
+        async with self.server:
+            await self.server.serve_forever()
+
+    def shutdown(self):
+        # On the event loop. Kept-alive connections would hold the server
+        # open, so they are closed too.
+        self.server.close()
+
+        for writer in list(self.connections):
+            writer.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+        self.readers.shutdown(wait=False)
+        self.writer.shutdown(wait=False)
+
+    def start_thread(self, host='127.0.0.1', port=0):
+        # Serves from a daemon thread, for benchmarks and checks against
+        # localhost. Returns the server URL; stop_thread() ends it.
+        started = threading.Event()
+        address = []
+
+        async def run():
+            address.extend(await self.start(host, port))
+            started.set()
+
+            async with self.server:
+                try:
+                    await self.server.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+
+        self.thread = threading.Thread(target=asyncio.run, args=(run(),), name='ledger-server', daemon=True)
+        self.thread.start()
+        started.wait()
+
+        return 'http://{}:{}'.format(*address)
+
+    def stop_thread(self):
+        self.loop.call_soon_threadsafe(self.shutdown)
+        self.thread.join()
+        self.close()
+
+    async def handle(self, reader, writer):
+        self.connections.add(writer)
+
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as error:
+                    await respond(writer, error.status, error_body(error), False)
+                    break
+
+                if request is None:
+                    break
+
+                method, target, body, keep_alive = request
+                status, content = await self.dispatch(method, target, body)
+                await respond(writer, status, content, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client went away mid request
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        parts = urlsplit(target)
+        allowed = False
+
+        for route_method, path, handler, pool in self.routes:
+            match = path.match(parts.path)
+
+            if match is None:
+                continue
+
+            if route_method != method:
+                allowed = True
+                continue
+
+            executor = self.writer if pool == WRITE else self.readers
+            return await self.loop.run_in_executor(
+                executor, self.call, handler, match.groups(), parts.query, body,
+            )
+
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, error_body(f'{method} not allowed')
+
+        return HTTPStatus.NOT_FOUND, error_body(f'no route for {parts.path}')
+
+    def call(self, handler, arguments, query, body):
+        # Runs on a database thread, encoding included
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+
+        try:
+            payload = handler(*arguments, params=params, body=body)
+        except HTTPError as error:
+            return error.status, error_body(error)
+        except DoesNotExist:
+            return HTTPStatus.NOT_FOUND, error_body('no such row')
+        except Exception as error:
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, error_body('internal error')
+
+        return HTTPStatus.OK, encode(payload)
+
+    def snapshot(self, kind, year, month, params, body):
+        year = bounded('year', int(year), YEARS)
+        month = bounded('month', int(month), MONTHS)
+        return wire.encode_snapshot(self.ledger.month_snapshot(kind, year, month))
+
+    def totals(self, params, body):
+        totals = self.ledger.monthly_totals(
+            integer(params, 'year', bounds=YEARS),
+            integer(params, 'month', bounds=MONTHS),
+            integer(params, 'months', 1, bounds=(1, 12 * 100)),
+            kinds(params),
+        )
+        return wire.encode_totals(totals)
+
+    def trend(self, params, body):
+        first = year_month(params, 'first')
+        last = year_month(params, 'last')
+        return wire.encode_totals(self.ledger.monthly_trend(first, last, kinds(params)))
+
+    def names(self, kind, params, body):
+        return wire.encode_names(self.ledger.load_names(kind))
+
+    def search(self, params, body):
+        rows, more = self.ledger.search(
+            params.get('text', ''),
+            integer(params, 'page', 0, bounds=(0, 10 ** 6)),
+            integer(params, 'page_size', PAGE_SIZE, bounds=(1, 1000)),
+        )
+        return {'rows': wire.encode_search(rows), 'more': more}
+
+    def budgets(self, params, body):
+        return self.ledger.budgets(integer(params, 'year', bounds=YEARS), integer(params, 'month', bounds=MONTHS))
+
+    def set_budgets(self, params, body):
+        amounts = json_body(body, dict)
+
+        if not set(amounts) <= set(EXPENSE_TYPES):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'budgets are set for {", ".join(EXPENSE_TYPES)}')
+
+        if not all(type(amount) is int and 0 <= amount <= MAX_AMOUNT for amount in amounts.values()):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'budgets must be whole numbers from 0 to {MAX_AMOUNT:,}')
+
+        year = integer(params, 'year', bounds=YEARS)
+        month = integer(params, 'month', bounds=MONTHS)
+        return self.ledger.set_budgets(year, month, amounts)
+
+    def row(self, kind, id, params, body):
+        return wire.encode_row(self.ledger.get(kind, bounded('id', int(id), IDS)))
+
+    def insert(self, kind, params, body):
+        name, amount, date, type = entry(kind, json_body(body, dict))
+        return wire.encode_change(self.ledger.insert(kind, name, amount, date, type))
+
+    def update(self, kind, id, params, body):
+        name, amount, date, type = entry(kind, json_body(body, dict))
+        id = bounded('id', int(id), IDS)
+        return wire.encode_change(self.ledger.update(kind, id, name, amount, date, type))
+
+    def save(self, params, body):
+        # A batch of inserts and updates, written in one transaction
+        saves = []
+
+        for data in json_body(body, list):
+            if not isinstance(data, dict) or data.get('kind') not in (INCOME, EXPENSE):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f'every save needs a kind, {INCOME} or {EXPENSE}')
+
+            id = data.get('id')
+
+            if id is not None:
+                if type(id) is not int:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, 'id must be a whole number')
+
+                bounded('id', id, IDS)
+
+            saves.append(Save(data['kind'], id, *entry(data['kind'], data)))
+
+        return [wire.encode_change(change) for change in self.ledger.save(saves)]
+
+
+async def read_request(reader):
+    # Returns (method, target, body, keep_alive), None once the client
+    # has closed the connection
+    line = await reader.readline()
+
+    if not line:
+        return None
+
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+
+    headers = {}
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b'\r\n', b'\n', b''):
+            break
+
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+
+    if length > MAX_BODY:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'request body too large')
+
+    body = await reader.readexactly(length) if length else b''
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+    return method, target, body, keep_alive
+
+
+async def respond(writer, status, content, keep_alive):
+    status = HTTPStatus(status)
+    head = (
+        f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        'Content-Type: application/json; charset=utf-8\r\n'
+        f'Content-Length: {len(content)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        '\r\n'
+    )
+
+    writer.write(head.encode('latin-1') + content)
+    await writer.drain()
+
+
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def error_body(error):
+    return encode({'error': str(error)})
+
+
+def integer(params, name, default=None, bounds=None):
+    value = params.get(name)
+
+    if value is None:
+        if default is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'{name} is required')
+        return default
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'{name} must be a whole number')
+
+    return value if bounds is None else bounded(name, value, bounds)
+
+
+def bounded(name, value, bounds):
+    low, high = bounds
+
+    if not low <= value <= high:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'{name} must be from {low} to {high}')
+
+    return value
+
+
+def year_month(params, name):
+    # YYYY-MM to (year, month)
+    try:
+        date = datetime.datetime.strptime(params.get(name, ''), '%Y-%m')
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'{name} must be YYYY-MM')
+
+    return date.year, date.month
+
+
+def kinds(params):
+    values = tuple(params.get('kinds', f'{INCOME},{EXPENSE}').split(','))
+
+    if not set(values) <= {INCOME, EXPENSE}:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'kinds must be {INCOME} and/or {EXPENSE}')
+
+    return values
+
+
+def json_body(body, shape):
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'body must be JSON')
+
+    if not isinstance(data, shape):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'body must be a JSON {"object" if shape is dict else "array"}')
+
+    return data
+
+
+def entry(kind, data):
+    # The same checks as a CSV import row
+    row = {field: str(data.get(field) or '') for field in ('name', 'date', 'type')}
+    row['amount_of_money'] = str(data.get('amount_of_money', ''))
+
+    try:
+        name, amount, date, *type = parse_row(kind, row)
+    except ValueError as error:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, str(error))
+
+    return name, amount, date, type[0] if type else ''
@@ -0,0 +1,88 @@
+import datetime
+from array import array
+from .aggregates import MonthlyTotals
+from .changes import Row, RowChange
+from .names import NameEntry, NameIndex
+from .snapshot import MonthSnapshot
+
+# JSON shapes of what the ledger server sends and receives. Dates travel as
+# YYYY-MM-DD strings, month snapshots as their columns.
+
+
+def encode_snapshot(snapshot):
+    return {
+        'year': snapshot.year,
+        'month': snapshot.month,
+        'types': list(snapshot.types),
+        'ids': snapshot.ids.tolist(),
+        'names': snapshot.names,
+        'days': snapshot.days.tolist(),
+        'amounts': snapshot.amounts.tolist(),
+        'codes': snapshot.codes.tolist(),
+    }
+
+
+def decode_snapshot(data):
+    snapshot = MonthSnapshot(data['year'], data['month'], data['types'])
+    snapshot.ids = array('q', data['ids'])
+    snapshot.names = data['names']
+    snapshot.days = array('b', data['days'])
+    snapshot.amounts = array('q', data['amounts'])
+    snapshot.codes = array('b', data['codes'])
+    return snapshot
+
+
+def encode_totals(totals):
+    return [[*key, amount] for key, amount in totals.values.items()]
+
+
+def decode_totals(data):
+    return MonthlyTotals(tuple(row) for row in data)
+
+
+def encode_names(names):
+    return [
+        [entry.name, entry.count, entry.last_date.isoformat(), entry.amount, entry.type]
+        for entry in names.entries.values()
+    ]
+
+
+def decode_names(data):
+    return NameIndex(
+        NameEntry(name, count, datetime.date.fromisoformat(last_date), amount, type)
+        for name, count, last_date, amount, type in data
+    )
+
+
+def encode_row(row):
+    return {**row._asdict(), 'date': row.date.isoformat()}
+
+
+def decode_row(data):
+    return Row(**{**data, 'date': datetime.date.fromisoformat(data['date'])})
+
+
+def encode_change(change):
+    return {**change._asdict(), 'date': change.date.isoformat()}
+
+
+def decode_change(data):
+    return RowChange(**{**data, 'date': datetime.date.fromisoformat(data['date'])})
+
+
+def encode_save(save):
+    return {**save._asdict(), 'date': save.date.isoformat()}
+
+
+def encode_search(rows):
+    return [
+        [kind, id, name, date.isoformat(), amount, type]
+        for kind, id, name, date, amount, type in rows
+    ]
+
+
+def decode_search(data):
+    return [
+        (kind, id, name, datetime.date.fromisoformat(date), amount, type)
+        for kind, id, name, date, amount, type in data
+    ]
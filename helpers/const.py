@@ -30,3 +30,20 @@ class Vietnamese(enum.Enum):
     STANDARD_LIVING = 'Mức sống tiêu chuẩn'
     MINIUM_STANDARD_LIVING = 'Mức sống tối thiểu'
     EXPENSE_IN_MONTH = 'Chi tiêu trong tháng'
+    LOADING = 'Đang tải...'
+    BALANCE = 'Còn lại'
+    TREND = 'Xu hướng'
+    FROM = 'Từ'
+    TO = 'Đến'
+    SEARCH = 'Tìm kiếm'
+    KIND = 'Loại'
+    PAGE = 'Trang'
+    PREVIOUS_PAGE = 'Trang trước'
+    NEXT_PAGE = 'Trang sau'
+    BUDGET = 'Ngân sách'
+    SET_BUDGET = 'Đặt ngân sách'
+    NO_BUDGET = 'Chưa đặt ngân sách'
+    BUDGET_USED = 'Đã dùng'
+    BUDGET_SAVE_FAILED = 'Không lưu được ngân sách'
+    SAVE_FAILED = 'Không lưu được'
+    SAVE_UNKNOWN = 'Không rõ đã lưu hay chưa, hãy kiểm tra lại'
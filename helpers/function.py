@@ -5,4 +5,52 @@ def iconFromBase64(base64):
     pixmap = QtGui.QPixmap()
     pixmap.loadFromData(QtCore.QByteArray.fromBase64(base64))
     icon = QtGui.QIcon(pixmap)
-    return icon
\ No newline at end of file
+    return icon
+
+def screenSize():
+    # Width and height of the primary screen, on any platform
+    geometry = QtGui.QGuiApplication.primaryScreen().geometry()
+    return geometry.width(), geometry.height()
+
+
+def chartAnimations():
+    # QtCharts is imported here so the startup path does not load it
+    from PyQt6.QtCharts import QChart
+    from settings import chart_animations
+
+    if chart_animations:
+        return QChart.AnimationOption.SeriesAnimations
+
+    return QChart.AnimationOption.NoAnimation
+
+
+def showError(parent, text, error):
+    # A warning with the error behind "Show Details"
+    from PyQt6.QtWidgets import QMessageBox
+
+    box = QMessageBox(parent)
+    box.setIcon(QMessageBox.Icon.Warning)
+    box.setWindowTitle(text)
+    box.setText(text)
+    box.setDetailedText(str(error))
+    box.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+    box.open()
+    return box
+
+
+def showSaveFailed(parent, saves, error):
+    # Names the saves the write queue gave up on
+    from reports import format_money
+    from .const import Vietnamese
+    from .write_queue import unknown
+
+    lines = [
+        f'{save.name}: {format_money(save.amount_of_money)}, {save.date:%d/%m/%Y}'
+        for save in saves
+    ]
+
+    # Without a reply from the ledger server the saves may have been made
+    message = Vietnamese.SAVE_UNKNOWN if unknown(error) else Vietnamese.SAVE_FAILED
+    box = showError(parent, message.value, error)
+    box.setText(message.value + ':\n' + '\n'.join(lines))
+    return box
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from settings import profile, profile_log, profile_log_bytes, profile_log_backups
+
+# Timings of SQL queries and named spans (loads, table filling, charts).
+# Everything is a no-op unless THUCHI_PROFILE / settings.profile is on.
+enabled = profile
+
+# Latest events for the debug overlay
+events = deque(maxlen=500)
+
+# Opened by install()
+logger = None
+
+_local = threading.local()
+
+
+def _stack():
+    if not hasattr(_local, 'spans'):
+        _local.spans = []
+    return _local.spans
+
+
+def record(kind, name, seconds, parent=None, **fields):
+    spans = _stack()
+
+    if parent is None and spans:
+        parent = spans[-1]
+
+    event = {
+        'time': round(time.time(), 3),
+        'kind': kind,
+        'name': name,
+        'ms': round(seconds * 1000, 3),
+        'thread': threading.current_thread().name,
+        'span': parent,
+        **fields,
+    }
+
+    events.append(event)
+
+    if logger is not None:
+        logger.info(json.dumps(event, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def span(name):
+    if not enabled:
+        yield
+        return
+
+    spans = _stack()
+    spans.append(name)
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        spans.pop()
+        record('span', name, seconds)
+
+
+def timed(name, function):
+    # function wrapped in a span of its own
+    if not enabled:
+        return function
+
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class _TimedCursor:
+    # Counts rows and fetch time until the cursor is exhausted or closed,
+    # since SQLite does most of the work of a SELECT while rows are fetched
+
+    def __init__(self, cursor, sql, params, seconds):
+        self._cursor = cursor
+        self._sql = sql
+        self._params = params
+        self._seconds = seconds
+        self._rows = 0
+        self._done = False
+        spans = _stack()
+        self._span = spans[-1] if spans else None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        self._seconds += time.perf_counter() - start
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        self._rows += len(rows)
+
+        if not rows:
+            self._finish()
+
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            # Collected while the interpreter shuts down
+            pass
+
+    def _finish(self):
+        if self._done:
+            return
+
+        self._done = True
+        record(
+            'query', 'sql', self._seconds, parent=self._span,
+            sql=self._sql, params=self._params, rows=self._rows,
+        )
+
+
+def install(database):
+    # Hooks query execution of a peewee database and opens the log
+    global logger
+
+    if not enabled or getattr(database, '_profiled', False):
+        return
+
+    import logging
+    from logging.handlers import RotatingFileHandler
+
+    logger = logging.getLogger('thuchi.profile')
+    handler = RotatingFileHandler(
+        profile_log,
+        maxBytes=profile_log_bytes,
+        backupCount=profile_log_backups,
+        encoding='utf-8',
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    execute_sql = database.execute_sql
+
+    def timed_execute_sql(sql, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        cursor = execute_sql(sql, params, *args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        if cursor.description is None:
+            record('query', 'sql', seconds, sql=sql, params=params, rows=cursor.rowcount)
+            return cursor
+
+        return _TimedCursor(cursor, sql, params, seconds)
+
+    database.execute_sql = timed_execute_sql
+    database._profiled = True
+
+
+def summary(limit=None):
+    # Total time and count per span and for queries, slowest first
+    totals = {}
+
+    for event in list(events):
+        name = event['name']
+
+        if event['kind'] == 'query':
+            name = f"sql in {event['span']}" if event['span'] else 'sql'
+
+        total, count = totals.get(name, (0.0, 0))
+        totals[name] = (total + event['ms'], count + 1)
+
+    return sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
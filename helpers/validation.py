@@ -0,0 +1,18 @@
+# Shared by the Form dialogs and the headless import, so keep it Qt-free
+
+# Largest amount the forms accept, also enforced on imports and the server
+MAX_AMOUNT = 2147483647
+
+
+def validate_entry(name, amount):
+    conditions = [
+        name.strip() != '',
+        amount.strip() != '',
+        # Only digits int() reads, not the likes of '²'
+        amount.isdecimal(),
+    ]
+
+    if False in conditions:
+        return False
+
+    return int(amount) <= MAX_AMOUNT
@@ -0,0 +1,155 @@
+import time
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from helpers import profiling
+
+
+class _Signals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _Job(QRunnable):
+
+    def __init__(self, generation, function, signals):
+        super().__init__()
+        self.generation = generation
+        self.function = function
+        self.signals = signals
+        # The Loader owns the job until its result arrives
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.function()
+        except Exception as error:
+            self.emit('failed', error)
+            return
+
+        self.emit('finished', result)
+
+    def emit(self, name, value):
+        try:
+            getattr(self.signals, name).emit(self.generation, value)
+        except RuntimeError:
+            # Qt objects are already gone, the application is shutting down
+            pass
+
+
+class Loader(QObject):
+    # Runs a load on the thread pool and hands the result back on the GUI
+    # thread. Every load gets a new generation; results of older ones are
+    # dropped, and older loads still waiting for a thread are cancelled.
+    loading = pyqtSignal(bool)
+    failed = pyqtSignal(object)
+
+    def __init__(self, parent=None, pool=None, name=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.generation = 0
+        self.jobs = {}
+        self.callback = None
+        # With profiling on, the query, the callback and the whole load are
+        # timed as spans named after the loader
+        self.name = name
+        self.started = None
+
+        # Unparented and shared with the jobs, so a job finishing after its
+        # Loader was destroyed still has something to emit on
+        self.signals = _Signals()
+        self.signals.finished.connect(self.onFinished)
+        self.signals.failed.connect(self.onFailed)
+
+    def load(self, function, callback):
+        self.cancel()
+        self.generation += 1
+
+        if self.name is not None and profiling.enabled:
+            function = profiling.timed(self.name + '.query', function)
+            callback = profiling.timed(self.name + '.show', callback)
+            self.started = time.perf_counter()
+
+        self.callback = callback
+
+        job = _Job(self.generation, function, self.signals)
+        self.jobs[self.generation] = job
+
+        self.loading.emit(True)
+        self.pool.start(job)
+
+    def cancel(self):
+        loading = self.isLoading()
+
+        for generation, job in list(self.jobs.items()):
+            if self.pool.tryTake(job):
+                del self.jobs[generation]
+
+        # Anything still running finishes into an outdated generation
+        self.generation += 1
+
+        if loading:
+            self.loading.emit(False)
+
+    def isLoading(self):
+        return self.generation in self.jobs
+
+    def onFinished(self, generation, result):
+        self.jobs.pop(generation, None)
+
+        if generation != self.generation:
+            return
+
+        self.loading.emit(False)
+        self.callback(result)
+
+        if self.name is not None and profiling.enabled:
+            profiling.record('span', self.name, time.perf_counter() - self.started)
+
+    def onFailed(self, generation, error):
+        self.jobs.pop(generation, None)
+
+        if generation != self.generation:
+            return
+
+        self.loading.emit(False)
+
+        if self.receivers(self.failed) > 0:
+            self.failed.emit(error)
+        else:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+
+class Writer(QObject):
+    # Runs writes one after another on its own thread. Unlike a Loader it
+    # never cancels or drops one: every write runs and its callback, or
+    # failed, is called on the GUI thread.
+    failed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.count = 0
+        self.jobs = {}
+
+        self.signals = _Signals()
+        self.signals.finished.connect(self.onFinished)
+        self.signals.failed.connect(self.onFailed)
+
+    def write(self, function, callback):
+        self.count += 1
+        job = _Job(self.count, function, self.signals)
+        self.jobs[self.count] = (job, callback)
+        self.pool.start(job)
+
+    def onFinished(self, number, result):
+        _, callback = self.jobs.pop(number)
+        callback(result)
+
+    def onFailed(self, number, error):
+        self.jobs.pop(number, None)
+
+        if self.receivers(self.failed) > 0:
+            self.failed.emit(error)
+        else:
+            traceback.print_exception(type(error), error, error.__traceback__)
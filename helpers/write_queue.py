@@ -0,0 +1,248 @@
+import itertools
+import sys
+import threading
+import traceback
+from PyQt6.QtCore import QObject, QThreadPool, QTimer, pyqtSignal
+from db.changes import RowChange, Save
+from db.ledger import ledger
+from db.remote import LedgerError
+from settings import write_behind_ms, write_retries
+from .worker import _Job, _Signals
+
+
+class WriteQueue(QObject):
+    # Saves of the forms, written behind the screens. A screen shows a save
+    # at once; the queue collects the saves of write_behind_ms and writes
+    # them on its own thread in one transaction, so entering dozens of rows
+    # costs one commit instead of one each. Saves of the same row waiting
+    # in the queue are merged. New rows get a provisional negative id until
+    # they are written.
+    # A failed write does not lose its saves: they stay queued ahead of the
+    # newer ones and are tried again. Only a save that fails write_retries
+    # times is given up, or at once when the ledger server did not reply,
+    # since it may have made the save and a retry would make it twice.
+    # Written RowChanges and {provisional id: stored id} of new rows
+    saved = pyqtSignal(object, object)
+    # The error and the Saves that were given up
+    failed = pyqtSignal(object, object)
+
+    def __init__(self, ledger=ledger, delay=write_behind_ms, retries=write_retries, parent=None):
+        super().__init__(parent)
+        self.ledger = ledger
+        self.retries = retries
+
+        # One writer thread, batches are written in order
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.jobs = {}
+
+        # Row id, or provisional id of a new row -> Save
+        self.pending = {}
+        self.provisional = itertools.count(-1, -1)
+        # Provisional -> stored ids and (key, Save, failures) to try again,
+        # only used on the writer thread
+        self.ids = {}
+        self.retry = []
+
+        # Batches handed to the writer and batches it is done with
+        self.batches = 0
+        self.written = 0
+        self.condition = threading.Condition()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+
+        self.signals = _Signals()
+        self.signals.finished.connect(self.onFinished)
+        self.signals.failed.connect(self.onFailed)
+
+    def insert(self, kind, name, amount, date, type=''):
+        id = next(self.provisional)
+        self.add(id, Save(kind, None, name, amount, date, type))
+
+        return RowChange(kind, id, name, date, None, amount, None, type)
+
+    def update(self, original, name, amount, date, type=''):
+        # original: the db.changes.Row as the screen shows it
+        pending = self.pending.get(original.id)
+        # A new row that is still waiting stays an insert
+        id = pending.id if pending is not None else original.id
+        self.add(original.id, Save(original.kind, id, name, amount, date, type))
+
+        return RowChange(
+            original.kind,
+            original.id,
+            name,
+            date,
+            original.amount_of_money,
+            amount,
+            original.type,
+            type,
+        )
+
+    def add(self, key, save):
+        self.pending[key] = save
+
+        # Not restarted by later saves, so none waits longer than the delay
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+
+        # Saves waiting to be tried again go with the next batch
+        if not self.pending and not self.retry:
+            return
+
+        batch = list(self.pending.items())
+        self.pending = {}
+        self.batches += 1
+
+        job = _Job(self.batches, lambda: self.write(batch), self.signals)
+        self.jobs[self.batches] = job
+        self.pool.start(job)
+
+    def write(self, batch):
+        # On the writer thread. Returns (changes, ids, lost, error).
+        try:
+            items = self.merge(batch)
+            saves = [self.resolve(save) for _, save, _ in items]
+
+            if not saves:
+                return [], {}, [], None
+
+            error = None
+            one_by_one = False
+
+            try:
+                changes = self.ledger.save(saves)
+            except Exception as batch_error:
+                error = batch_error
+                changes = []
+
+            if error is not None and not unknown(error):
+                # One at a time up to the first save that fails, so the
+                # saves before it are written
+                one_by_one = True
+
+                for save in saves:
+                    try:
+                        changes.extend(self.ledger.save([save]))
+                    except Exception as save_error:
+                        error = save_error
+                        break
+                else:
+                    error = None
+
+            ids = {
+                key: change.id
+                for (key, _, _), save, change in zip(items, saves, changes)
+                if save.id is None
+            }
+            self.ids.update(ids)
+
+            lost = []
+
+            if error is not None and not one_by_one:
+                # The whole batch may or may not have been written
+                lost = [save for _, save, _ in items]
+            elif error is not None:
+                key, save, failures = items[len(changes)]
+                self.retry = items[len(changes) + 1:]
+
+                if failures + 1 < self.retries and not unknown(error):
+                    self.retry.insert(0, (key, save, failures + 1))
+                else:
+                    lost.append(save)
+
+            return changes, ids, lost, error
+        finally:
+            with self.condition:
+                self.written += 1
+                self.condition.notify_all()
+
+    def merge(self, batch):
+        # Saves to try again come first. A newer save of the same row takes
+        # their place but keeps their id, so a row whose insert failed is
+        # still inserted.
+        items = {key: (save, failures) for key, save, failures in self.retry}
+        self.retry = []
+
+        for key, save in batch:
+            if key in items:
+                older, failures = items[key]
+                items[key] = (save._replace(id=older.id), failures)
+            else:
+                items[key] = (save, 0)
+
+        return [(key, save, failures) for key, (save, failures) in items.items()]
+
+    def resolve(self, save):
+        # Rows inserted by an earlier batch get their stored ids. A row whose
+        # insert was given up has none and is inserted instead.
+        if save.id is not None and save.id < 0:
+            return save._replace(id=self.ids.get(save.id))
+
+        return save
+
+    def after(self, function):
+        # function, run once every save made so far is written. Loads are
+        # wrapped in it so they never miss a save still in the queue.
+        self.flush()
+        target = self.batches
+
+        def wait_and_call():
+            with self.condition:
+                self.condition.wait_for(lambda: self.written >= target)
+
+            return function()
+
+        return wait_and_call
+
+    def close(self):
+        # On exit: write what is left and wait for it, trying failed saves
+        # again only a few times
+        for _ in range(self.retries):
+            self.flush()
+            self.pool.waitForDone()
+
+            if not self.retry:
+                return
+
+        for _, save, _ in self.retry:
+            print(f'Not saved: {save}', file=sys.stderr)
+
+    def onFinished(self, batch, result):
+        self.jobs.pop(batch, None)
+        changes, ids, lost, error = result
+
+        if changes:
+            self.saved.emit(changes, ids)
+
+        if error is not None:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+            if lost:
+                self.failed.emit(error, lost)
+
+        # The writer may be busy with a later batch; at worst this starts
+        # a batch with nothing to write
+        if self.retry and not self.timer.isActive():
+            self.timer.start()
+
+    def onFailed(self, batch, error):
+        self.jobs.pop(batch, None)
+        # Only a bug in write() gets here, the screens reload what was written
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self.failed.emit(error, [])
+
+
+def unknown(error):
+    # Whether a failed write may still have been made
+    return isinstance(error, LedgerError) and error.unknown
+
+
+# Shared by the forms of every screen
+writes = WriteQueue()
@@ -1,21 +1,18 @@
 import sys
 from PyQt6.QtWidgets import QApplication
-from screens.home import Home
+from PyQt6 import QtCore
+from screens.main_window import MainWindow
 from helpers.function import iconFromBase64
 
-try:
-    import runpy
-    runpy.run_module(mod_name='db.__init__')
-except:
-    pass
-
 icon_base64 = b'AAABAAEAICAAAAEAIACoEAAAFgAAACgAAAAgAAAAQAAAAAEAIAAAAAAAgBAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAEAAAARAAAAAgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACkAAACeAAAA7gAAAP8AAADxAAAAlgAAABYAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACQAAACiAAAA/AAAAMcAAABiAAAANwAAAGAAAADXAAAA7gAAAGUAAAABAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAFAAAAB5AAAABQAAAAAAAAAAAAAAAAAAAB4AAACbAAAA+gAAAMsAAABJAAAAAAAAAAAAAAAAAAAAAAAAAAYAAAB7AAAA9wAAAMEAAAAmAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAARwAAAO0AAADRAAAAPgAAACQAAACSAAAA+AAAANIAAABPAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAmAAAAwAAAAPYAAAB0AAAAAwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAGAAAAKsAAAD+AAAA/wAAANcAAABZAAAAAgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABAAAAagAAAPIAAADIAAAAKgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACEAAAAtAAAAAQAAAAAAAAAAAAAAAAAAAAAAAAAeAAAAQgAAAFAAAABRAAAAUQAAAFEAAABOAAAALQAAAAAAAAAAAAAAHwAAALkAAAD3AAAAeAAAAAMAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAcAAACsAAAA7QAAAP8AAAD+AAAA9gAAAPUAAAD1AAAA9QAAAPgAAAD/AAAAvwAAABwAAAAAAAAAAAAAAGUAAADxAAAAyAAAACkAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABQAAAIYAAABgAAAALQAAAAcAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACwAAAD0AAAA7wAAAGAAAAAAAAAAAAAAAB4AAAC7AAAA9wAAAHUAAAADAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABIAAAAjAAAAWgAAAPkAAACsAAAA+QAAALMAAAAZAAAAAAAAAAAAAABnAAAA8gAAAL8AAAAPAAAADwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAArAAAAfQAAAL0AAADvAAAA/wAAAP8AAAD/AAAA2gAAAAYAAAAvAAAAzwAAAO0AAABbAAAAAAAAAAAAAAAjAAAA2wAAAKkAAADoAAAAygAAAFMAAAACAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAKAAAArgAAAP4AAADXAAAA4QAAAP0AAACJAAAAJQAAAFwAAADuAAAAywAAACkAAAAFAAAAgQAAAPoAAACwAAAAJAAAAAAAAABdAAAA9QAAACYAAACdAAAA+QAAANsAAABtAAAADgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAADAAAALoAAADiAAAAOAAAAAAAAAALAAAAjQAAAPsAAAC0AAAAIAAAABwAAAC6AAAA9gAAAHYAAAAMAAAARwAAAP8AAAD8AAAAzgAAAOsAAACwAAAAAAAAAAAAAAAaAAAAhwAAAOsAAADyAAAAnQAAAFwAAABJAAAAVAAAAIMAAADjAAAA3wAAACYAAAAAAAAAAAAAAAAAAAAAAAAAMQAAAMkAAAD0AAAAjwAAAFcAAADiAAAA/gAAAPkAAADyAAAA3wAAAEQAAAB9AAAAagAAAAkAAAAAAAAAAAAAAAAAAAAAAAAACAAAAF8AAAC5AAAA7QAAAP0AAADzAAAAzQAAAH0AAAAPAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAgAAAGQAAADIAAAA8gAAAM8AAAAuAAAASQAAAFcAAAASAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAADAAAAcAAAANYAAAD7AAAA5gAAAJQAAAATAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAQAAAKsAAADxAAAAgQAAAEwAAABpAAAA2QAAAN0AAAAXAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABcAAAA9gAAADAAAAAAAAAAPgAAAA4AAAANAAAA0gAAAKQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAALcAAACcAAAAAAAAAAAAAADvAAAAOAAAAAAAAABUAAAA9wAAAAcAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA0wAAAHQAAAAAAAAAAAAAAO8AAAA4AAAAAAAAACwAAAD/AAAAGwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAC0AAAAnwAAAAAAAABbAAAA/AAAADgAAAAAAAAAVwAAAP8AAAC9AAAARwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAFcAAAD4AAAANwAAAAAAAAAsAAAADAAAABEAAADXAAAAuAAAAKMAAAD8AAAAZQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAKIAAAD1AAAAjAAAAFYAAAB0AAAA3wAAANcAAACLAAAAAAAAAHUAAADyAAAADwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAQAAAGUAAADLAAAA9QAAAPoAAACJAAAAEAAAAPUAAAAAAAAACAAAAPsAAABHAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABOAAAA9wAAAAYAAABEAAAA9QAAAAAAAAALAAAA/AAAAEQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABEAAADyAAAAewAAAAUAAABeAAAAAAAAAIUAAADtAAAACwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAF4AAAD8AAAAswAAAH8AAAC4AAAA+wAAAFUAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAADoAAACnAAAAyAAAAKUAAAA1AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA///////+P///+A///+AD/+ODwf/gD/B/8B/4P/x4Bg//wAGH/8Hwwf//wDB//AAYD/AABAPhAADAA8AA8AfgD//4D///8Af///EH///zI///8yP///Ih///xAP//+AR///gEf///BH///wR///+A////wf////////////////8='
 
 def main():
     app = QApplication(sys.argv)
-    icon = iconFromBase64(icon_base64)
-    app.setWindowIcon(icon)
-    x = Home()
+    x = MainWindow()
+    # Decoding the icon can wait until the window is on screen
+    QtCore.QTimer.singleShot(
+        0, lambda: app.setWindowIcon(iconFromBase64(icon_base64))
+    )
     sys.exit(app.exec())
 
 
@@ -0,0 +1,14 @@
+# Qt-free reporting used by the screens and the command line
+from .formatting import format_money, format_difference
+from .summary import (
+    EXPENSE_TYPES,
+    budget_alerts,
+    budget_progress,
+    expense_breakdown,
+    expense_changes,
+    income_window,
+    month_report,
+    year_report,
+    trend_report,
+)
+from .text import render_month, render_year
@@ -0,0 +1,11 @@
+def format_money(amount):
+    return "{:,} VNĐ".format(amount)
+
+
+def format_difference(amount):
+    if amount > 0:
+        return "+ {:,} VNĐ".format(amount)
+    elif amount < 0:
+        return "- {:,} VNĐ".format(abs(amount))
+
+    return "0 VNĐ"
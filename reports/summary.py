@@ -0,0 +1,168 @@
+from db import Expense
+from db.aggregates import monthly_totals, monthly_trend, shift_month, INCOME, EXPENSE
+
+EXPENSE_TYPES = [
+    Expense.MUST_HAVE,
+    Expense.NICE_TO_HAVE,
+    Expense.WASTED,
+]
+
+
+def expense_breakdown(totals, year, month):
+    amounts = {type: totals.get(EXPENSE, year, month, type) for type in EXPENSE_TYPES}
+
+    return {
+        'types': amounts,
+        'minimum_standard_of_living': amounts[Expense.MUST_HAVE],
+        'standard_of_living': amounts[Expense.MUST_HAVE] + amounts[Expense.NICE_TO_HAVE],
+        'total': sum(amounts.values()),
+    }
+
+
+def expense_changes(totals, year, month):
+    # Per expense type: last month, this month and the difference
+    last_year, last_month = shift_month(year, month, -1)
+    changes = []
+
+    for type in EXPENSE_TYPES:
+        last = totals.get(EXPENSE, last_year, last_month, type)
+        this = totals.get(EXPENSE, year, month, type)
+
+        changes.append({
+            'type': type,
+            'last_month': last,
+            'this_month': this,
+            'difference': this - last,
+        })
+
+    return changes
+
+
+def budget_progress(totals, budgets, year, month):
+    # Per expense type: budget, spending so far and the percentage of the
+    # budget used, None without a budget. totals follow every save by delta,
+    # so this never goes back to the rows.
+    progress = []
+
+    for type in EXPENSE_TYPES:
+        budget = budgets.get(type, 0)
+        spent = totals.get(EXPENSE, year, month, type)
+
+        progress.append({
+            'type': type,
+            'budget': budget,
+            'spent': spent,
+            'remaining': budget - spent,
+            'percent': spent * 100 / budget if budget else None,
+        })
+
+    return progress
+
+
+def budget_alerts(before, after, thresholds):
+    # (type, threshold) for every threshold a save took spending past
+    alerts = []
+
+    for old, new in zip(before, after):
+        if old['percent'] is None or new['percent'] is None:
+            continue
+
+        for threshold in thresholds:
+            if old['percent'] < threshold <= new['percent']:
+                alerts.append((new['type'], threshold))
+
+    return alerts
+
+
+def income_window(totals, year, month, months=3):
+    # Oldest month first, ending with year/month
+    window = []
+
+    for delta in range(1 - months, 1):
+        window_year, window_month = shift_month(year, month, delta)
+
+        window.append({
+            'year': window_year,
+            'month': window_month,
+            'amount': totals.get(INCOME, window_year, window_month),
+        })
+
+    return window
+
+
+def month_report(year, month, totals=None):
+    # totals must cover the two months before year/month as well
+    if totals is None:
+        totals = monthly_totals(year, month, months=3)
+
+    income = totals.get(INCOME, year, month)
+    expense = totals.get(EXPENSE, year, month)
+
+    return {
+        'year': year,
+        'month': month,
+        'income': income,
+        'expense': expense,
+        'balance': income - expense,
+        'expense_breakdown': expense_breakdown(totals, year, month),
+        'expense_changes': expense_changes(totals, year, month),
+        'income_window': income_window(totals, year, month),
+    }
+
+
+def year_report(year, totals=None):
+    if totals is None:
+        totals = monthly_totals(year, 12, months=12)
+
+    months = []
+
+    for month in range(1, 13):
+        income = totals.get(INCOME, year, month)
+        expense = totals.get(EXPENSE, year, month)
+
+        months.append({
+            'month': month,
+            'income': income,
+            'expense': expense,
+            'balance': income - expense,
+            'expense_types': expense_breakdown(totals, year, month)['types'],
+        })
+
+    income = sum(row['income'] for row in months)
+    expense = sum(row['expense'] for row in months)
+
+    return {
+        'year': year,
+        'income': income,
+        'expense': expense,
+        'balance': income - expense,
+        'months': months,
+    }
+
+
+def trend_report(first, last, totals=None):
+    # One row per month from first to last, (year, month) inclusive
+    if totals is None:
+        totals = monthly_trend(first, last)
+
+    months = []
+    year, month = first
+
+    while (year, month) <= tuple(last):
+        # Income is stored under type '', so every amount is a direct lookup
+        types = {type: totals.get(EXPENSE, year, month, type) for type in EXPENSE_TYPES}
+        income = totals.get(INCOME, year, month, '')
+        expense = sum(types.values())
+
+        months.append({
+            'year': year,
+            'month': month,
+            'income': income,
+            'expense': expense,
+            'balance': income - expense,
+            'expense_types': types,
+        })
+
+        year, month = shift_month(year, month, 1)
+
+    return months
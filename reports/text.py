@@ -0,0 +1,70 @@
+from helpers.const import Vietnamese
+from .formatting import format_money, format_difference
+
+TYPE_LABELS = {
+    'MUST_HAVE': Vietnamese.MUST_HAVE.value,
+    'NICE_TO_HAVE': Vietnamese.NICE_TO_HAVE.value,
+    'WASTED': Vietnamese.WASTED.value,
+}
+
+
+def render_month(report):
+    breakdown = report['expense_breakdown']
+
+    lines = [
+        f'{Vietnamese.MONTH.value} {report["month"]}, {Vietnamese.YEAR.value} {report["year"]}',
+        '',
+        f'{Vietnamese.INCOME.value}: {format_money(report["income"])}',
+        f'{Vietnamese.EXPENSE.value}: {format_money(report["expense"])}',
+        f'{Vietnamese.BALANCE.value}: {format_difference(report["balance"])}',
+        '',
+        f'{Vietnamese.EXPENSE_TYPE.value:<22}{Vietnamese.LAST_MONTH.value:>20}{Vietnamese.THIS_MONTH.value:>20}{"":>20}',
+    ]
+
+    for change in report['expense_changes']:
+        lines.append(
+            f'{TYPE_LABELS[change["type"]]:<22}'
+            f'{format_money(change["last_month"]):>20}'
+            f'{format_money(change["this_month"]):>20}'
+            f'{format_difference(change["difference"]):>20}'
+        )
+
+    lines += [
+        '',
+        f'{Vietnamese.MINIUM_STANDARD_LIVING.value}: {format_money(breakdown["minimum_standard_of_living"])}',
+        f'{Vietnamese.STANDARD_LIVING.value}: {format_money(breakdown["standard_of_living"])}',
+        f'{Vietnamese.EXPENSE_IN_MONTH.value}: {format_money(breakdown["total"])}',
+        '',
+        Vietnamese.INCOME_SECTION.value,
+    ]
+
+    for row in report['income_window']:
+        label = f'{row["month"]}/{row["year"]}'
+        lines.append(f'{label:<22}{format_money(row["amount"]):>20}')
+
+    return '\n'.join(lines)
+
+
+def render_year(report):
+    lines = [
+        f'{Vietnamese.YEAR.value} {report["year"]}',
+        '',
+        f'{Vietnamese.MONTH.value:<12}{Vietnamese.INCOME.value:>20}{Vietnamese.EXPENSE.value:>20}{Vietnamese.BALANCE.value:>20}',
+    ]
+
+    for row in report['months']:
+        lines.append(
+            f'{row["month"]:<12}'
+            f'{format_money(row["income"]):>20}'
+            f'{format_money(row["expense"]):>20}'
+            f'{format_difference(row["balance"]):>20}'
+        )
+
+    lines.append(
+        f'{Vietnamese.TOTAL.value:<12}'
+        f'{format_money(report["income"]):>20}'
+        f'{format_money(report["expense"]):>20}'
+        f'{format_difference(report["balance"]):>20}'
+    )
+
+    return '\n'.join(lines)
@@ -0,0 +1,56 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtGui import QFont
+from PyQt6 import QtCore
+from helpers import profiling
+
+
+class DebugOverlay(QLabel):
+    # Latest profiling timings drawn over the top right corner of the
+    # window; F12 in MainWindow shows and hides it
+    REFRESH_MS = 500
+    SLOWEST = 8
+    LATEST = 8
+    SQL_WIDTH = 60
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setFont(QFont('Monospace', 8))
+        self.setStyleSheet('background-color: rgba(0, 0, 0, 190); color: white; padding: 6px;')
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.timer.start()
+
+    def refresh(self):
+        lines = ['total ms    count  name']
+
+        for name, (total, count) in profiling.summary(self.SLOWEST):
+            lines.append(f'{total:9.1f} {count:7}  {name}')
+
+        lines.append('')
+        lines.append('latest')
+
+        for event in list(profiling.events)[-self.LATEST:]:
+            if event['kind'] == 'query':
+                name = f'{event["rows"]:>7} rows  {event["sql"][:self.SQL_WIDTH]}'
+            else:
+                name = event['name']
+
+            lines.append(f'{event["ms"]:9.1f}  {name}')
+
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 8, 8)
+        self.raise_()
@@ -15,16 +15,28 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QComboBox,
     QSpinBox,
+    QProgressBar,
 )
 from PyQt6.QtGui import QFont, QIntValidator, QBrush, QColor
 from PyQt6.QtCharts import QChart, QChartView, QPieSeries
 from PyQt6 import QtCore
-import ctypes
 import datetime
 from db import Expense as ExpenseTable
-from peewee import fn
+from db.ledger import ledger
+from db.names import NameIndex
+from db.queries import EXPENSE_TYPES
+from db.aggregates import MonthlyTotals, EXPENSE
 from helpers.const import Vietnamese
+from helpers.function import screenSize, chartAnimations, showError, showSaveFailed
+from reports import budget_alerts, budget_progress, expense_breakdown, expense_changes, format_money, format_difference
+from settings import budget_thresholds
+from helpers.validation import validate_entry, MAX_AMOUNT
+from helpers.worker import Loader, Writer
+from helpers.write_queue import writes
+from helpers import profiling
 from calendar import monthrange
+from .table_model import TransactionTableModel
+from .name_completer import NameCompleter
 
 headers = [
     'ID',
@@ -35,6 +47,12 @@ headers = [
     Vietnamese.WASTED.value,
 ]
 
+typeLabels = {
+    ExpenseTable.MUST_HAVE: Vietnamese.MUST_HAVE.value,
+    ExpenseTable.NICE_TO_HAVE: Vietnamese.NICE_TO_HAVE.value,
+    ExpenseTable.WASTED: Vietnamese.WASTED.value,
+}
+
 summaryHeaders = [
     '',
     Vietnamese.LAST_MONTH.value,
@@ -45,11 +63,14 @@ summaryHeaders = [
 
 class Form(QDialog):
 
-    def __init__(self, parent=None, month=1, year=datetime.date.today().year, edit=False, id=None):
+    def __init__(self, parent=None, month=1, year=datetime.date.today().year, edit=False, id=None, original=None, names=None):
         self.month = month
         self.year = year
         self.updated = False
+        self.change = None
         self.id = id
+        self.original = original
+        self.names = names
 
         super(Form, self).__init__(parent)
         form_layout = QFormLayout()
@@ -57,10 +78,14 @@ class Form(QDialog):
         name_label = QLabel(Vietnamese.CONTENT.value)
         self.name_input = QLineEdit()
 
+        if names is not None:
+            self.completer = NameCompleter(names, self.name_input)
+            self.completer.picked.connect(self.prefill)
+
         form_layout.addRow(name_label, self.name_input)
 
         amount_label = QLabel(Vietnamese.AMOUNT_OF_MONEY.value)
-        validator = QIntValidator(0, 2147483647)
+        validator = QIntValidator(0, MAX_AMOUNT)
         self.amount_input = QLineEdit()
         self.amount_input.setValidator(validator)
 
@@ -101,74 +126,140 @@ class Form(QDialog):
             submit_button.clicked.connect(self.update)
             self.setWindowTitle(Vietnamese.EDIT_EXPENSE.value)
 
-    def validated(self):
-        conditions = [
-            self.name_input.text().strip() != '',
-            self.amount_input.text().strip() != '',
-            self.amount_input.text().isdigit(),
-        ]
+    def prefill(self, entry):
+        # Last amount and type used with the picked name
+        self.amount_input.setText(str(entry.amount))
 
-        return not False in conditions
+        index = self.expense_type_input.findData(entry.type)
+        if index >= 0:
+            self.expense_type_input.setCurrentIndex(index)
+
+    def validated(self):
+        return validate_entry(self.name_input.text(), self.amount_input.text())
 
     def insert(self):
         if self.validated():
-            data = ExpenseTable()
-            data.name = self.name_input.text()
-            data.amount_of_money = int(self.amount_input.text())
-            data.type = self.expense_type_input.currentData()
-            data.date = datetime.date(self.year, self.month, int(self.date_input.value()))
-            data.save()
+            name = self.name_input.text()
+            amount = int(self.amount_input.text())
+            type = self.expense_type_input.currentData()
+            date = datetime.date(self.year, self.month, int(self.date_input.value()))
+
+            self.change = writes.insert(EXPENSE, name, amount, date, type)
+
+            if self.names is not None:
+                self.names.add(name, date, amount, type)
 
             self.updated = True
             self.close()
 
     def update(self):
         if self.validated():
-            q = (
-                ExpenseTable.update({
-                    ExpenseTable.name: self.name_input.text(),
-                    ExpenseTable.amount_of_money: int(self.amount_input.text()),
-                    ExpenseTable.type: self.expense_type_input.currentData(),
-                    ExpenseTable.date: datetime.date(self.year, self.month, int(self.date_input.value()))
-                }).where(
-                    ExpenseTable.id == self.id
-                )
-            )
-            q.execute()
+            name = self.name_input.text()
+            amount = int(self.amount_input.text())
+            type = self.expense_type_input.currentData()
+            date = datetime.date(self.year, self.month, int(self.date_input.value()))
+
+            self.change = writes.update(self.original, name, amount, date, type)
             self.updated = True
             self.close()
 
+
+class BudgetForm(QDialog):
+
+    def __init__(self, parent=None, month=1, year=datetime.date.today().year, budgets=None):
+        self.month = month
+        self.year = year
+        self.updated = False
+        self.amounts = {}
+
+        super(BudgetForm, self).__init__(parent)
+        form_layout = QFormLayout()
+        validator = QIntValidator(0, MAX_AMOUNT)
+        self.inputs = {}
+
+        for type in EXPENSE_TYPES:
+            amount_input = QLineEdit()
+            amount_input.setValidator(validator)
+            amount_input.setPlaceholderText(Vietnamese.NO_BUDGET.value)
+
+            amount = (budgets or {}).get(type, 0)
+            if amount:
+                amount_input.setText(str(amount))
+
+            form_layout.addRow(QLabel(typeLabels[type]), amount_input)
+            self.inputs[type] = amount_input
+
+        submit_button = QPushButton(Vietnamese.SAVE.value)
+        submit_button.clicked.connect(self.save)
+
+        cancel_button = QPushButton(Vietnamese.CANCEL.value)
+        cancel_button.clicked.connect(self.close)
+
+        form_layout.addRow(submit_button, cancel_button)
+
+        self.setLayout(form_layout)
+        self.setWindowTitle(f'{Vietnamese.SET_BUDGET.value} {month}/{year}')
+
+    def save(self):
+        # An empty field is 0, no budget
+        self.amounts = {
+            type: int(amount_input.text() or 0)
+            for type, amount_input in self.inputs.items()
+        }
+        self.updated = True
+        self.close()
+
+
 class ExpenseScreen(QWidget):
+    backRequested = QtCore.pyqtSignal()
+    # A row was added or edited
+    changed = QtCore.pyqtSignal()
+    # Expense type and threshold percentage its budget went past
+    budgetAlert = QtCore.pyqtSignal(str, int)
 
     def __init__(self, month, year):
         super().__init__()
         self.month = month
         self.year = year
-        self.initUI()
-        self.loadData()
-        self.loadDataSummary()
+        self.totals = MonthlyTotals()
+        self.budgets = {}
 
-    def initUI(self):
-        user32 = ctypes.windll.user32
+        self.budgetLoader = Loader(self, name='ExpenseScreen.loadBudgets')
+        # Not a Loader, a month change must not cancel a budget being saved
+        self.budgetWriter = Writer(self)
+        self.budgetWriter.failed.connect(self.budgetSaveFailed)
+        self.budgetAlert.connect(self.showBudgetAlert)
+
+        self.dataLoader = Loader(self, name='ExpenseScreen.loadData')
+        self.dataLoader.loading.connect(self.setLoading)
+        self.summaryLoader = Loader(self, name='ExpenseScreen.loadDataSummary')
+        self.summaryLoader.loading.connect(self.setLoading)
 
-        desktop_width = user32.GetSystemMetrics(0)
-        desktop_height = user32.GetSystemMetrics(1)
+        # Name suggestions for the forms, filled in the background
+        self.names = NameIndex()
+        self.namesLoader = Loader(self, name='ExpenseScreen.loadNames')
+        self.namesLoader.load(lambda: ledger.load_names(EXPENSE), self.names.replace)
 
-        width = int(desktop_width)
-        height = int(desktop_height)
+        # Rows saved by the forms are written in the background
+        writes.saved.connect(self.savesWritten)
+        writes.failed.connect(self.saveFailed)
 
-        self.resize(width, height)
+        self.initUI()
+        self.loadData()
+        self.loadDataSummary()
 
-        self.showMaximized()
+    def initUI(self):
+        _, desktop_height = screenSize()
 
         vbox1 = QVBoxLayout()
 
-        label = QLabel(f'{Vietnamese.MONTH.value} {self.month}, {Vietnamese.YEAR.value} {self.year}')
+        self.title_label = QLabel()
         font = QFont('Times', 15)
-        label.setFont(font)
-        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.title_label.setFont(font)
+        self.title_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.showTitle()
 
-        vbox1.addWidget(label)
+        vbox1.addWidget(self.title_label)
         vbox1.addSpacing(15)
 
         hbox1 = QHBoxLayout()
@@ -194,6 +285,11 @@ class ExpenseScreen(QWidget):
 
         vbox1.addWidget(self.table)
 
+        self.loading_label = QLabel(Vietnamese.LOADING.value)
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        vbox1.addWidget(self.loading_label)
+
         hbox2 = QHBoxLayout()
         
         vbox2 = QVBoxLayout()
@@ -219,10 +315,12 @@ class ExpenseScreen(QWidget):
 
         hbox2.addLayout(vbox2)
 
+        hbox2.addStretch()
+        hbox2.addLayout(self.createBudgetBox(font))
         hbox2.addStretch()
 
-        self.chartView = QChartView()
-        self.chartView.setMaximumHeight(desktop_height * 0.278)
+        self.chartView = self.createChart()
+        self.chartView.setMaximumHeight(int(desktop_height * 0.278))
         hbox2.addWidget(self.chartView)
 
 
@@ -230,21 +328,70 @@ class ExpenseScreen(QWidget):
 
         self.setLayout(vbox1)
         self.setWindowTitle(Vietnamese.EXPENSE_SECTION.value)
-        self.show()
+
+    def createChart(self):
+        # One pie for the life of the screen, showChart only changes values
+        self.pieSeries = QPieSeries()
+
+        self.pieSeries.append(Vietnamese.MUST_HAVE.value, 0)
+        self.pieSeries.append(Vietnamese.NICE_TO_HAVE.value, 0)
+        self.pieSeries.append(Vietnamese.WASTED.value, 0)
+        self.pieSeries.slices()[0].setBrush(QBrush(QColor(0, 0, 255)))
+        self.pieSeries.slices()[1].setBrush(QBrush(QColor(255, 165, 0)))
+        self.pieSeries.slices()[2].setBrush(QBrush(QColor(255, 0, 0)))
+        self.pieSeries.setLabelsVisible()
+        self.pieSeries.setVisible(False)
+
+        chart = QChart()
+        chart.legend().setVisible(False)
+        chart.addSeries(self.pieSeries)
+        chart.setAnimationOptions(chartAnimations())
+
+        return QChartView(chart)
+
+    def createBudgetBox(self, font):
+        vbox = QVBoxLayout()
+        vbox.addStretch()
+
+        budget_label = QLabel(Vietnamese.BUDGET.value)
+        budget_label.setFont(font)
+        vbox.addWidget(budget_label)
+
+        self.budgetBars = {}
+
+        for type in EXPENSE_TYPES:
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setMinimumWidth(300)
+
+            vbox.addWidget(QLabel(typeLabels[type]))
+            vbox.addWidget(bar)
+            self.budgetBars[type] = bar
+
+        self.budget_alert_label = QLabel()
+        self.budget_alert_label.setStyleSheet('color: red')
+        vbox.addWidget(self.budget_alert_label)
+
+        budget_button = QPushButton(Vietnamese.SET_BUDGET.value)
+        budget_button.clicked.connect(self.budgetButtonClicked)
+        vbox.addWidget(budget_button)
+
+        vbox.addStretch()
+        return vbox
 
     def createTableView(self):
-        table = QTableWidget()
+        self.model = TransactionTableModel(headers, EXPENSE_TYPES)
+
+        table = QTableView()
+        table.setModel(self.model)
         table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
-        table.setRowCount(10)
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
         table.setColumnHidden(0, True)
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
-        table.cellDoubleClicked.connect(self.cellClicked)
+        table.doubleClicked.connect(self.cellClicked)
         return table
 
     def createTableSummary(self):
@@ -259,166 +406,68 @@ class ExpenseScreen(QWidget):
         table.setMaximumHeight(150)
         return table
 
-    def loadData(self):
-        from_date = datetime.date(self.year, self.month, 1)
-        to_date = datetime.date(self.year + int(self.month/12), self.month % 12 + 1, 1) - datetime.timedelta(days=1)
-
-        data = ExpenseTable.select().where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date
-        ).order_by(ExpenseTable.date)
-
-        self.table.clearContents()
-        row_count = data.count() if data.count() > 0 else 10
-        self.table.setRowCount(row_count + 1)
-
-        center_item = QTableWidgetItem()
-        center_item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-
-        must_have_total = 0
-        nice_to_have_total = 0
-        wasted_total = 0
+    def showTitle(self):
+        self.title_label.setText(f'{Vietnamese.MONTH.value} {self.month}, {Vietnamese.YEAR.value} {self.year}')
 
-        for index, record in enumerate(data):
-            data = [
-                str(record.id),
-                str(record.name),
-                record.date.strftime('%d/%m/%Y'),
-            ]
-
-            money = "{:,} VNĐ".format(record.amount_of_money)
-
-            if record.type == ExpenseTable.MUST_HAVE:
-                data.extend([
-                    money,
-                    '',
-                    '',
-                ])
-                must_have_total += record.amount_of_money
-            elif record.type == ExpenseTable.NICE_TO_HAVE:
-                data.extend([
-                    '',
-                    money,
-                    '',
-                ])
-                nice_to_have_total += record.amount_of_money
-            else:
-                data.extend([
-                    '',
-                    '',
-                    money,
-                ])
-                wasted_total += record.amount_of_money
-
-            column = 0
-            for value in data:
-                item = center_item.clone()
-                item.setText(value)
-
-                self.table.setItem(index, column, item)
-                column += 1
+    def setMonth(self, month, year):
+        if (month, year) == (self.month, self.year):
+            return
 
-        total_data = [
-            '',
-            Vietnamese.TOTAL.value.upper(),
-            '',
-            "{:,} VNĐ".format(must_have_total),
-            "{:,} VNĐ".format(nice_to_have_total),
-            "{:,} VNĐ".format(wasted_total),
-        ]
+        self.month = month
+        self.year = year
+        self.totals = MonthlyTotals()
+        self.budgets = {}
+        self.budget_alert_label.clear()
+        self.showTitle()
+        self.loadData()
+        self.loadDataSummary()
 
-        column = 0
-        for value in total_data:
-            item = center_item.clone()
+    def setLoading(self):
+        loading = self.dataLoader.isLoading() or self.summaryLoader.isLoading()
 
-            font = QFont()
-            font.setBold(True)
+        self.loading_label.setVisible(loading)
+        self.table.setEnabled(not loading)
 
-            item.setFont(font)
-            item.setText(value)
+    def loadData(self):
+        year, month = self.year, self.month
 
-            self.table.setItem(row_count, column, item)
-            column += 1
+        self.dataLoader.load(
+            writes.after(lambda: ledger.month_snapshot(EXPENSE, year, month)),
+            self.model.setSnapshot,
+        )
 
     def loadDataSummary(self):
-        from_date = datetime.date(self.year, self.month, 1)
-        to_date = datetime.date(self.year + int(self.month/12), self.month % 12 + 1, 1) - datetime.timedelta(days=1)
-
-        must_have_total_this_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.MUST_HAVE
-        ).scalar()
-
-        must_have_total_this_month = must_have_total_this_month if must_have_total_this_month is not None else 0
-
-        nice_to_have_total_this_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.NICE_TO_HAVE
-        ).scalar()
-
-        nice_to_have_total_this_month = nice_to_have_total_this_month if nice_to_have_total_this_month is not None else 0
-
-        wasted_total_this_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.WASTED
-        ).scalar()
-
-        wasted_total_this_month = wasted_total_this_month if wasted_total_this_month is not None else 0
-
-        to_date = from_date - datetime.timedelta(days=1)
-        from_date = to_date.replace(day=1)
+        year, month = self.year, self.month
 
-        must_have_total_last_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.MUST_HAVE
-        ).scalar()
-
-        must_have_total_last_month = must_have_total_last_month if must_have_total_last_month is not None else 0
-
-        nice_to_have_total_last_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.NICE_TO_HAVE
-        ).scalar()
-
-        nice_to_have_total_last_month = nice_to_have_total_last_month if nice_to_have_total_last_month is not None else 0
+        self.summaryLoader.load(
+            writes.after(lambda: ledger.monthly_totals(year, month, months=2, kinds=(EXPENSE,))),
+            self.showTotals,
+        )
+        self.loadBudgets()
 
-        wasted_total_last_month = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-            ExpenseTable.type == ExpenseTable.WASTED
-        ).scalar()
+    def loadBudgets(self):
+        year, month = self.year, self.month
 
-        wasted_total_last_month = wasted_total_last_month if wasted_total_last_month is not None else 0
+        self.budgetLoader.load(
+            lambda: ledger.budgets(year, month),
+            self.setBudgets,
+        )
 
-        must_have_difference = must_have_total_this_month - must_have_total_last_month
-        nice_to_have_difference = nice_to_have_total_this_month - nice_to_have_total_last_month
-        wasted_difference = wasted_total_this_month - wasted_total_last_month
+    def showTotals(self, totals):
+        self.totals = totals
+        self.showSummary()
 
+    def showSummary(self):
+        breakdown = expense_breakdown(self.totals, self.year, self.month)
         # Show difference 2 months
         data = [
             [
-                Vietnamese.MUST_HAVE.value,
-                "{:,} VNĐ".format(must_have_total_last_month),
-                "{:,} VNĐ".format(must_have_total_this_month),
-                must_have_difference
-            ],
-            [
-                Vietnamese.NICE_TO_HAVE.value,
-                "{:,} VNĐ".format(nice_to_have_total_last_month),
-                "{:,} VNĐ".format(nice_to_have_total_this_month),
-                nice_to_have_difference
-            ],
-            [
-                Vietnamese.WASTED.value,
-                "{:,} VNĐ".format(wasted_total_last_month),
-                "{:,} VNĐ".format(wasted_total_this_month),
-                wasted_difference
-            ],
+                typeLabels[change['type']],
+                format_money(change['last_month']),
+                format_money(change['this_month']),
+                change['difference'],
+            ]
+            for change in expense_changes(self.totals, self.year, self.month)
         ]
 
         center_item = QTableWidgetItem()
@@ -433,12 +482,10 @@ class ExpenseScreen(QWidget):
                 if column == 3:
                     if value > 0:
                         item.setForeground(QBrush(QColor(255, 0, 0)))
-                        value = "+ {:,} VNĐ".format(value)
                     elif value < 0:
                         item.setForeground(QBrush(QColor(0, 0, 255)))
-                        value = "- {:,} VNĐ".format(abs(value))
-                    else:
-                        value = "0 VNĐ"
+
+                    value = format_difference(value)
 
                 item.setText(value)
 
@@ -446,59 +493,133 @@ class ExpenseScreen(QWidget):
                 column += 1
 
         # Show standard living
-        self.minimum_standard_of_living_label.setText(f'{Vietnamese.MINIUM_STANDARD_LIVING.value}: { "{:,}".format(must_have_total_this_month) } VNĐ')
-        self.standard_of_living_label.setText(f'{Vietnamese.STANDARD_LIVING.value}: { "{:,}".format(must_have_total_this_month + nice_to_have_total_this_month) } VNĐ')
-        self.expense_in_month_label.setText(f'{Vietnamese.EXPENSE_IN_MONTH.value}: { "{:,}".format(must_have_total_this_month + nice_to_have_total_this_month + wasted_total_this_month) } VNĐ')
+        self.minimum_standard_of_living_label.setText(f'{Vietnamese.MINIUM_STANDARD_LIVING.value}: {format_money(breakdown["minimum_standard_of_living"])}')
+        self.standard_of_living_label.setText(f'{Vietnamese.STANDARD_LIVING.value}: {format_money(breakdown["standard_of_living"])}')
+        self.expense_in_month_label.setText(f'{Vietnamese.EXPENSE_IN_MONTH.value}: {format_money(breakdown["total"])}')
+
+        self.showBudgets()
 
         # Show Chart
-        this_month = must_have_total_this_month + nice_to_have_total_this_month + wasted_total_this_month
-        
+        with profiling.span('ExpenseScreen.chart'):
+            self.showChart(breakdown)
+
+    def showChart(self, breakdown):
+        this_month = breakdown['total']
+
+        # The screen is reused across months, hide the pie of an empty one
+        self.pieSeries.setVisible(this_month > 0)
+
         if this_month > 0:
-            must_have_total_this_month_percent = must_have_total_this_month / this_month * 100
-            nice_to_have_total_this_month_percent = nice_to_have_total_this_month / this_month * 100
+            types = breakdown['types']
+            must_have_total_this_month_percent = types[ExpenseTable.MUST_HAVE] / this_month * 100
+            nice_to_have_total_this_month_percent = types[ExpenseTable.NICE_TO_HAVE] / this_month * 100
             wasted_total_this_month_percent = 100 - must_have_total_this_month_percent - nice_to_have_total_this_month_percent
 
-            series = QPieSeries()
+            slices = self.pieSeries.slices()
+            slices[0].setValue(must_have_total_this_month_percent)
+            slices[1].setValue(nice_to_have_total_this_month_percent)
+            slices[2].setValue(wasted_total_this_month_percent)
+
+    def setBudgets(self, budgets):
+        self.budgets = budgets
+        self.showBudgets()
+
+    def showBudgets(self):
+        # Red once spending passes the highest alert threshold
+        limit = max(budget_thresholds)
+
+        for progress in budget_progress(self.totals, self.budgets, self.year, self.month):
+            bar = self.budgetBars[progress['type']]
+
+            if progress['percent'] is None:
+                bar.setValue(0)
+                bar.setFormat(Vietnamese.NO_BUDGET.value)
+                bar.setStyleSheet('')
+                continue
+
+            bar.setValue(min(int(progress['percent']), 100))
+            bar.setFormat(f"{format_money(progress['spent'])} / {format_money(progress['budget'])}")
+            bar.setStyleSheet('QProgressBar::chunk { background-color: red; }' if progress['percent'] >= limit else '')
+
+    def showBudgetAlert(self, type, threshold):
+        self.budget_alert_label.setText(
+            f'{typeLabels[type]}: {Vietnamese.BUDGET_USED.value} {threshold}% {Vietnamese.BUDGET.value.lower()}'
+        )
+
+    def applyChange(self, change):
+        before = budget_progress(self.totals, self.budgets, self.year, self.month)
+
+        self.model.applyChange(change)
+        self.totals.apply(change)
+        self.showSummary()
+
+        after = budget_progress(self.totals, self.budgets, self.year, self.month)
 
-            series.append(Vietnamese.MUST_HAVE.value, must_have_total_this_month_percent)
-            series.append(Vietnamese.NICE_TO_HAVE.value, nice_to_have_total_this_month_percent)
-            series.append(Vietnamese.WASTED.value, wasted_total_this_month_percent)
-            series.slices()[0].setBrush(QBrush(QColor(0, 0, 255)))
-            series.slices()[1].setBrush(QBrush(QColor(255, 165, 0)))
-            series.slices()[2].setBrush(QBrush(QColor(255, 0, 0)))
-            series.setLabelsVisible()
+        for type, threshold in budget_alerts(before, after, budget_thresholds):
+            self.budgetAlert.emit(type, threshold)
 
-            chart = QChart()
-            chart.legend().setVisible(False)
-            chart.addSeries(series)
-            chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+        self.changed.emit()
 
-            self.chartView.setChart(chart)
+    def savesWritten(self, changes, ids):
+        self.model.replaceIds(ids)
+
+    def saveFailed(self, error, saves):
+        # Show what was written instead of the saves that were lost
+        self.loadData()
+        self.loadDataSummary()
+        self.changed.emit()
+
+        saves = [save for save in saves if save.kind == EXPENSE]
+
+        if saves:
+            showSaveFailed(self, saves, error)
+
+    def budgetButtonClicked(self):
+        self.budgetForm = BudgetForm(month=self.month, year=self.year, budgets=self.budgets)
+        self.budgetForm.exec()
+
+        if self.budgetForm.updated:
+            self.saveBudgets(self.budgetForm.amounts)
+
+    def saveBudgets(self, amounts):
+        year, month = self.year, self.month
+
+        self.budgetWriter.write(
+            lambda: ledger.set_budgets(year, month, amounts),
+            lambda budgets: self.budgetsSaved(year, month, budgets),
+        )
+
+    def budgetsSaved(self, year, month, budgets):
+        if (year, month) == (self.year, self.month):
+            # A read started before the write would bring back the old ones
+            self.budgetLoader.cancel()
+            self.setBudgets(budgets)
+        else:
+            # Budgets carry over, this month may have a new one too
+            self.loadBudgets()
+
+    def budgetSaveFailed(self, error):
+        showError(self, Vietnamese.BUDGET_SAVE_FAILED.value, error)
+        self.loadBudgets()
 
     def backButtonClicked(self):
-        from .home import Home
-        self.screen = Home()
-        self.close()
+        self.backRequested.emit()
 
     def addButtonClicked(self):
-        self.form = Form(month=self.month, year=self.year)
+        self.form = Form(month=self.month, year=self.year, names=self.names)
         self.form.exec()
         
         if self.form.updated:
-            self.loadData()
-            self.loadDataSummary()
+            self.applyChange(self.form.change)
 
-    def cellClicked(self, row):
-        item = self.table.item(row, 0)
+    def cellClicked(self, index):
+        # Filled from the table, which already shows saves still queued
+        item = self.model.record(index.row(), EXPENSE)
 
-        try:
-            id = int(item.text())
-        except:
+        if item is None:
             return
 
-        item = ExpenseTable.get(ExpenseTable.id == id)
-
-        self.form = Form(month=self.month, year=self.year, edit=True, id=id)
+        self.form = Form(month=self.month, year=self.year, edit=True, id=item.id, original=item, names=self.names)
         self.form.name_input.setText(item.name)
         self.form.amount_input.setText(str(item.amount_of_money))
         
@@ -514,5 +635,4 @@ class ExpenseScreen(QWidget):
         self.form.exec()
 
         if self.form.updated:
-            self.loadData()
-            self.loadDataSummary()
\ No newline at end of file
+            self.applyChange(self.form.change)
\ No newline at end of file
@@ -7,36 +7,39 @@ from PyQt6.QtWidgets import (
     QPushButton,
 )
 from PyQt6.QtGui import QFont, QBrush, QColor
-from PyQt6.QtCharts import QChart, QChartView, QBarSeries, QBarSet
-from peewee import fn
 from PyQt6 import QtCore
-from db import Income as IncomeTable, Expense as ExpenseTable
-import ctypes
-import datetime
+from db.aggregates import shift_month, INCOME, EXPENSE
+from db.ledger import ledger
 from helpers.const import Vietnamese
-
-from .income import IncomeScreen
-from .expense import ExpenseScreen
+from helpers.worker import Loader
+from helpers.write_queue import writes
+from helpers.function import chartAnimations
+from helpers import profiling
 
 
 class Home(QWidget):
+    incomeRequested = QtCore.pyqtSignal(int, int)
+    expenseRequested = QtCore.pyqtSignal(int, int)
+    trendRequested = QtCore.pyqtSignal(int, int)
+    searchRequested = QtCore.pyqtSignal()
+    # Wait this long after the last month change before querying
+    DEBOUNCE_MS = 250
 
     def __init__(self):
         super().__init__()
+        self.loader = Loader(self, name='Home.loadData')
+        self.loader.loading.connect(self.setLoading)
+        self.prefetcher = Loader(self, name='Home.prefetch')
+
+        self.debounce = QtCore.QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.loadData)
+
         self.initUI()
         self.loadData()
 
     def initUI(self):
-        user32 = ctypes.windll.user32
-
-        desktop_width = user32.GetSystemMetrics(0)
-        desktop_height = user32.GetSystemMetrics(1)
-
-        width = int(desktop_width * 0.23)
-        height = int(desktop_height * 0.34)
-
-        self.resize(width, height)
-
         hbox1 = QHBoxLayout()
         hbox1.addStretch()
 
@@ -50,8 +53,16 @@ class Home(QWidget):
 
         vbox1.addWidget(label)
 
-        self.chartView = QChartView()
-        vbox1.addWidget(self.chartView)
+        # QtCharts is slow to import, the chart view is created with the
+        # first data so the window can paint before it
+        self.chartView = None
+        self.chart_layout = QVBoxLayout()
+        vbox1.addLayout(self.chart_layout, 1)
+
+        self.loading_label = QLabel(Vietnamese.LOADING.value)
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        vbox1.addWidget(self.loading_label)
 
         self.month_input = QDateEdit()
         self.month_input.setCurrentSection(
@@ -61,7 +72,7 @@ class Home(QWidget):
             QtCore.QDateTime.currentDateTime()
         )
         self.month_input.setDisplayFormat("MM/yyyy")
-        self.month_input.dateChanged.connect(self.loadData)
+        self.month_input.dateChanged.connect(self.monthChanged)
         vbox1.addWidget(self.month_input)
 
         hbox2 = QHBoxLayout()
@@ -76,6 +87,20 @@ class Home(QWidget):
         hbox2.addWidget(expense_button)
         
         vbox1.addLayout(hbox2)
+
+        hbox3 = QHBoxLayout()
+
+        trend_button = QPushButton(Vietnamese.TREND.value)
+        trend_button.clicked.connect(self.trendButtonClicked)
+
+        search_button = QPushButton(Vietnamese.SEARCH.value)
+        search_button.clicked.connect(self.searchRequested)
+
+        hbox3.addWidget(trend_button)
+        hbox3.addWidget(search_button)
+
+        vbox1.addLayout(hbox3)
+
         vbox1.addSpacing(30)
 
         hbox1.addLayout(vbox1)
@@ -83,56 +108,101 @@ class Home(QWidget):
         hbox1.addStretch()
         self.setLayout(hbox1)
         self.setWindowTitle(Vietnamese.REVENUE_AND_EXPENDITURE_SOFTWARE.value)
-        self.show()
+
+    def setLoading(self, loading):
+        self.loading_label.setVisible(loading)
+
+        if self.chartView is not None:
+            self.chartView.setEnabled(not loading)
+
+    def monthChanged(self):
+        date = self.month_input.date().toPyDate()
+        totals = ledger.monthly_totals(date.year, date.month, cached_only=True)
+
+        if totals is None:
+            self.debounce.start()
+            return
+
+        self.debounce.stop()
+        self.loader.cancel()
+        self.monthLoaded(date, totals)
 
     def loadData(self):
         date = self.month_input.date().toPyDate()
 
-        from_date = date.replace(day=1)
-        to_date = datetime.date(date.year + int(date.month/12), date.month % 12 + 1, 1) - datetime.timedelta(days=1)
+        self.loader.load(
+            writes.after(lambda: ledger.monthly_totals(date.year, date.month)),
+            lambda totals: self.monthLoaded(date, totals),
+        )
+
+    def monthLoaded(self, date, totals):
+        with profiling.span('Home.chart'):
+            self.showData(date, totals)
+        self.prefetch(date)
 
-        imcome_total = IncomeTable.select(fn.SUM(IncomeTable.amount_of_money)).where(
-            IncomeTable.date >= from_date,
-            IncomeTable.date <= to_date,
-        ).scalar()
+    def prefetch(self, date):
+        # Warm the month cache with the previous and next month
+        year, month = shift_month(date.year, date.month, 1)
 
-        imcome_total = imcome_total if imcome_total is not None else 0
+        self.prefetcher.load(
+            lambda: ledger.monthly_totals(year, month, months=3),
+            lambda totals: None,
+        )
 
-        expense_total = ExpenseTable.select(fn.SUM(ExpenseTable.amount_of_money)).where(
-            ExpenseTable.date >= from_date,
-            ExpenseTable.date <= to_date,
-        ).scalar()
+    def createChart(self):
+        from PyQt6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QValueAxis
 
-        expense_total = expense_total if expense_total is not None else 0
+        # One chart for the life of the screen, showData only changes values
+        self.incomeSet = QBarSet(Vietnamese.INCOME.value)
+        self.incomeSet.setBrush(QBrush(QColor(0, 0, 255)))
+        self.incomeSet << 0
+        self.expenseSet = QBarSet(Vietnamese.EXPENSE.value)
+        self.expenseSet.setBrush(QBrush(QColor(255, 0, 0)))
+        self.expenseSet << 0
 
         series = QBarSeries()
-        set0 = QBarSet(Vietnamese.INCOME.value)
-        set0.setBrush(QBrush(QColor(0, 0, 255)))
-        set1 = QBarSet(Vietnamese.EXPENSE.value)
-        set1.setBrush(QBrush(QColor(255, 0, 0)))
-
-        set0 << imcome_total
-        set1 << expense_total
+        series.append(self.incomeSet)
+        series.append(self.expenseSet)
 
-        series.append(set0)
-        series.append(set1)
+        self.axisY = QValueAxis()
+        self.axisY.setVisible(False)
 
         chart = QChart()
         chart.addSeries(series)
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+        chart.addAxis(self.axisY, QtCore.Qt.AlignmentFlag.AlignLeft)
+        series.attachAxis(self.axisY)
+        chart.setAnimationOptions(chartAnimations())
 
-        self.chartView.setChart(chart)
+        self.chartView = QChartView(chart)
+        self.chart_layout.addWidget(self.chartView)
+
+    def showData(self, date, totals):
+        if self.chartView is None:
+            self.createChart()
+
+        imcome_total = totals.get(INCOME, date.year, date.month)
+        expense_total = totals.get(EXPENSE, date.year, date.month)
+
+        self.incomeSet.replace(0, imcome_total)
+        self.expenseSet.replace(0, expense_total)
+        self.axisY.setRange(0, max(imcome_total, expense_total) or 1)
+
+    def refresh(self):
+        # Data of the shown month changed elsewhere, the cache knows which
+        self.debounce.stop()
+        self.loadData()
 
     def incomeButtonClicked(self):
         date = self.month_input.date().toPyDate()
 
-        self.screen = IncomeScreen(date.month, date.year)
-
-        self.close()
+        self.incomeRequested.emit(date.month, date.year)
 
     def expenseButtonClicked(self):
         date = self.month_input.date().toPyDate()
 
-        self.screen = ExpenseScreen(date.month, date.year)
+        self.expenseRequested.emit(date.month, date.year)
+
+    def trendButtonClicked(self):
+        date = self.month_input.date().toPyDate()
 
-        self.close()
\ No newline at end of file
+        self.trendRequested.emit(date.month, date.year)
@@ -18,12 +18,21 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont, QIntValidator
 from PyQt6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QValueAxis
 from PyQt6 import QtCore
-from db import Income as IncomeTable
+from db.ledger import ledger
+from db.names import NameIndex
+from db.queries import INCOME_TYPES
+from db.aggregates import MonthlyTotals, INCOME
 import datetime
-from peewee import fn
 from calendar import monthrange
-import ctypes
 from helpers.const import Vietnamese
+from helpers.function import screenSize, chartAnimations, showSaveFailed
+from reports import income_window, format_money
+from helpers.validation import validate_entry, MAX_AMOUNT
+from helpers.worker import Loader
+from helpers.write_queue import writes
+from helpers import profiling
+from .table_model import TransactionTableModel
+from .name_completer import NameCompleter
 
 
 headers = [
@@ -36,11 +45,14 @@ headers = [
 
 class Form(QDialog):
 
-    def __init__(self, parent=None, month=1, year=datetime.date.today().year, edit=False, id=None):
+    def __init__(self, parent=None, month=1, year=datetime.date.today().year, edit=False, id=None, original=None, names=None):
         self.month = month
         self.year = year
         self.updated = False
+        self.change = None
         self.id = id
+        self.original = original
+        self.names = names
 
         super(Form, self).__init__(parent)
         form_layout = QFormLayout()
@@ -48,10 +60,14 @@ class Form(QDialog):
         name_label = QLabel(Vietnamese.CONTENT.value)
         self.name_input = QLineEdit()
 
+        if names is not None:
+            self.completer = NameCompleter(names, self.name_input)
+            self.completer.picked.connect(self.prefill)
+
         form_layout.addRow(name_label, self.name_input)
 
         amount_label = QLabel(Vietnamese.AMOUNT_OF_MONEY.value)
-        validator = QIntValidator(0, 2147483647)
+        validator = QIntValidator(0, MAX_AMOUNT)
         self.amount_input = QLineEdit()
         self.amount_input.setValidator(validator)
 
@@ -84,74 +100,80 @@ class Form(QDialog):
             submit_button.clicked.connect(self.update)
             self.setWindowTitle(Vietnamese.EDIT_INCOME.value)
 
-    def validated(self):
-        conditions = [
-            self.name_input.text().strip() != '',
-            self.amount_input.text().strip() != '',
-            self.amount_input.text().isdigit(),
-        ]
+    def prefill(self, entry):
+        # Last amount used with the picked name
+        self.amount_input.setText(str(entry.amount))
 
-        return not False in conditions
+    def validated(self):
+        return validate_entry(self.name_input.text(), self.amount_input.text())
 
     
     def insert(self):
         if self.validated():
-            data = IncomeTable()
-            data.name = self.name_input.text()
-            data.amount_of_money = int(self.amount_input.text())
-            data.date = datetime.date(self.year, self.month, int(self.date_input.value()))
-            data.save()
+            name = self.name_input.text()
+            amount = int(self.amount_input.text())
+            date = datetime.date(self.year, self.month, int(self.date_input.value()))
+
+            self.change = writes.insert(INCOME, name, amount, date)
+
+            if self.names is not None:
+                self.names.add(name, date, amount)
 
             self.updated = True
             self.close()
 
     def update(self):
         if self.validated():
-            q = (
-                IncomeTable.update({
-                    IncomeTable.name: self.name_input.text(),
-                    IncomeTable.amount_of_money: int(self.amount_input.text()),
-                    IncomeTable.date: datetime.date(self.year, self.month, int(self.date_input.value()))
-                }).where(
-                    IncomeTable.id == self.id
-                )
-            )
-            q.execute()
+            name = self.name_input.text()
+            amount = int(self.amount_input.text())
+            date = datetime.date(self.year, self.month, int(self.date_input.value()))
+
+            self.change = writes.update(self.original, name, amount, date)
             self.updated = True
             self.close()
             
 
 class IncomeScreen(QWidget):
+    backRequested = QtCore.pyqtSignal()
+    # A row was added or edited
+    changed = QtCore.pyqtSignal()
 
     def __init__(self, month, year):
         super().__init__()
         self.month = month
         self.year = year
-        self.initUI()
-        self.loadData()
-        self.loadDataSummary()
+        self.totals = MonthlyTotals()
 
-    def initUI(self):
-        user32 = ctypes.windll.user32
+        self.dataLoader = Loader(self, name='IncomeScreen.loadData')
+        self.dataLoader.loading.connect(self.setLoading)
+        self.summaryLoader = Loader(self, name='IncomeScreen.loadDataSummary')
+        self.summaryLoader.loading.connect(self.setLoading)
 
-        desktop_width = user32.GetSystemMetrics(0)
-        desktop_height = user32.GetSystemMetrics(1)
+        # Name suggestions for the forms, filled in the background
+        self.names = NameIndex()
+        self.namesLoader = Loader(self, name='IncomeScreen.loadNames')
+        self.namesLoader.load(lambda: ledger.load_names(INCOME), self.names.replace)
 
-        width = int(desktop_width)
-        height = int(desktop_height)
+        # Rows saved by the forms are written in the background
+        writes.saved.connect(self.savesWritten)
+        writes.failed.connect(self.saveFailed)
 
-        self.resize(width, height)
+        self.initUI()
+        self.loadData()
+        self.loadDataSummary()
 
-        self.showMaximized()
+    def initUI(self):
+        _, desktop_height = screenSize()
 
         vbox1 = QVBoxLayout()
 
-        label = QLabel(f'{Vietnamese.MONTH.value} {self.month}, {Vietnamese.YEAR.value} {self.year}')
+        self.title_label = QLabel()
         font = QFont('Times', 15)
-        label.setFont(font)
-        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.title_label.setFont(font)
+        self.title_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.showTitle()
 
-        vbox1.addWidget(label)
+        vbox1.addWidget(self.title_label)
         vbox1.addSpacing(15)
 
         hbox1 = QHBoxLayout()
@@ -176,6 +198,11 @@ class IncomeScreen(QWidget):
 
         vbox1.addWidget(self.table)
 
+        self.loading_label = QLabel(Vietnamese.LOADING.value)
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        vbox1.addWidget(self.loading_label)
+
         hbox2 = QHBoxLayout()
         
         self.summaryTable = self.createTableSummary()
@@ -183,27 +210,49 @@ class IncomeScreen(QWidget):
         hbox2.addWidget(self.summaryTable)
         hbox2.addStretch()
 
-        self.chartView = QChartView()
-        self.chartView.setMaximumHeight(desktop_height * 0.278)
+        self.chartView = self.createChart()
+        self.chartView.setMaximumHeight(int(desktop_height * 0.278))
         hbox2.addWidget(self.chartView)
 
         vbox1.addLayout(hbox2)
 
         self.setLayout(vbox1)
         self.setWindowTitle(Vietnamese.INCOME_SECTION.value)
-        self.show()
+
+    def createChart(self):
+        # One bar set per month of the window, kept for the life of the
+        # screen; showChart only changes labels and values
+        series = QBarSeries()
+        self.barSets = []
+
+        for _ in range(3):
+            bar_set = QBarSet('')
+            bar_set << 0
+            series.append(bar_set)
+            self.barSets.append(bar_set)
+
+        self.axisY = QValueAxis()
+        self.axisY.setLabelFormat("%d")
+
+        chart = QChart()
+        chart.addAxis(self.axisY, QtCore.Qt.AlignmentFlag.AlignLeft)
+        chart.addSeries(series)
+        series.attachAxis(self.axisY)
+        chart.setAnimationOptions(chartAnimations())
+
+        return QChartView(chart)
 
     def createTableView(self):
-        table = QTableWidget()
+        self.model = TransactionTableModel(headers, INCOME_TYPES)
+
+        table = QTableView()
+        table.setModel(self.model)
         table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
-        table.setRowCount(10)
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
         table.setColumnHidden(0, True)
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
-        table.cellDoubleClicked.connect(self.cellClicked)
+        table.doubleClicked.connect(self.cellClicked)
         return table
 
     
@@ -219,84 +268,51 @@ class IncomeScreen(QWidget):
         return table
 
 
-    def loadData(self):
-        from_date = datetime.date(self.year, self.month, 1)
-        to_date = datetime.date(self.year + int(self.month/12), self.month % 12 + 1, 1) - datetime.timedelta(days=1)
+    def showTitle(self):
+        self.title_label.setText(f'{Vietnamese.MONTH.value} {self.month}, {Vietnamese.YEAR.value} {self.year}')
 
-        data = IncomeTable.select().where(
-            IncomeTable.date >= from_date,
-            IncomeTable.date <= to_date
-        ).order_by(IncomeTable.date)
-
-        self.table.clearContents()
-        row_count = data.count() if data.count() > 0 else 10
-        self.table.setRowCount(row_count + 1)
-
-        center_item = QTableWidgetItem()
-        center_item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-
-        total = 0
-
-        for index, record in enumerate(data):
-            data = [
-                str(record.id),
-                str(record.name),
-                record.date.strftime('%d/%m/%Y'),
-                "{:,} VNĐ".format(record.amount_of_money),
-            ]
-
-            total += record.amount_of_money
-
-            column = 0
-            for value in data:
-                item = center_item.clone()
-                item.setText(value)
-
-                self.table.setItem(index, column, item)
-                column += 1
-
-        total_data = [
-            '',
-            Vietnamese.TOTAL.value.upper(),
-            '',
-            "{:,} VNĐ".format(total),
-        ]
+    def setMonth(self, month, year):
+        if (month, year) == (self.month, self.year):
+            return
 
-        column = 0
-        for value in total_data:
-            item = center_item.clone()
+        self.month = month
+        self.year = year
+        self.totals = MonthlyTotals()
+        self.showTitle()
+        self.loadData()
+        self.loadDataSummary()
 
-            font = QFont()
-            font.setBold(True)
+    def setLoading(self):
+        loading = self.dataLoader.isLoading() or self.summaryLoader.isLoading()
 
-            item.setFont(font)
-            item.setText(value)
+        self.loading_label.setVisible(loading)
+        self.table.setEnabled(not loading)
 
-            self.table.setItem(row_count, column, item)
-            column += 1
+    def loadData(self):
+        year, month = self.year, self.month
 
+        self.dataLoader.load(
+            writes.after(lambda: ledger.month_snapshot(INCOME, year, month)),
+            self.model.setSnapshot,
+        )
 
     def loadDataSummary(self):
-        from_date = datetime.date(self.year, self.month, 1)
-        to_date = datetime.date(self.year + int(self.month/12), self.month % 12 + 1, 1) - datetime.timedelta(days=1)
+        year, month = self.year, self.month
 
-        headers = []
-        data = []
-
-        for _ in range(3):
-            headers.insert(0, f'{to_date.month}/{to_date.year}')
-
-            amount = IncomeTable.select(fn.SUM(IncomeTable.amount_of_money)).where(
-                IncomeTable.date >= from_date,
-                IncomeTable.date <= to_date,
-            ).scalar()
+        self.summaryLoader.load(
+            writes.after(lambda: ledger.monthly_totals(year, month, months=3, kinds=(INCOME,))),
+            self.showTotals,
+        )
 
-            amount = amount if amount is not None else 0
+    def showTotals(self, totals):
+        self.totals = totals
+        self.showSummary()
 
-            data.insert(0, amount)
+    def showSummary(self):
+        window = income_window(self.totals, self.year, self.month)
 
-            to_date = from_date - datetime.timedelta(days=1)
-            from_date = to_date.replace(day=1)
+        headers = [f'{row["month"]}/{row["year"]}' for row in window]
+        data = [row['amount'] for row in window]
 
         self.summaryTable.setHorizontalHeaderLabels(headers)
 
@@ -305,59 +321,59 @@ class IncomeScreen(QWidget):
 
         for index, value in enumerate(data):
             item = center_item.clone()
-            item.setText("{:,} VNĐ".format(value))
+            item.setText(format_money(value))
             self.summaryTable.setItem(0, index, item)
-        
-        series = QBarSeries()
-        set0 = QBarSet(headers[0])
-        set1 = QBarSet(headers[1])
-        set2 = QBarSet(headers[2])
 
-        set0 << data[0]
-        set1 << data[1]
-        set2 << data[2]
+        with profiling.span('IncomeScreen.chart'):
+            self.showChart(headers, data)
 
-        series.append(set0)
-        series.append(set1)
-        series.append(set2)
+    def showChart(self, headers, data):
+        for bar_set, header, value in zip(self.barSets, headers, data):
+            bar_set.setLabel(header)
+            bar_set.replace(0, value)
 
-        axisY = QValueAxis()
-        axisY.setRange(0, max(data) + 500000)
-        axisY.setLabelFormat("%d")
+        self.axisY.setRange(0, max(data) + 500000)
 
-        chart = QChart()
-        chart.addAxis(axisY, QtCore.Qt.AlignmentFlag.AlignLeft)
-        chart.addSeries(series)
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+    def applyChange(self, change):
+        self.model.applyChange(change)
+        self.totals.apply(change)
+        self.showSummary()
+        self.changed.emit()
+
+    def savesWritten(self, changes, ids):
+        self.model.replaceIds(ids)
 
-        self.chartView.setChart(chart)
+    def saveFailed(self, error, saves):
+        # Show what was written instead of the saves that were lost
+        self.loadData()
+        self.loadDataSummary()
+        self.changed.emit()
+
+        saves = [save for save in saves if save.kind == INCOME]
+
+        if saves:
+            showSaveFailed(self, saves, error)
 
     def backButtonClicked(self):
-        from .home import Home
-        self.screen = Home()
-        self.close()
+        self.backRequested.emit()
 
 
     def addButtonClicked(self):
-        self.form = Form(month=self.month, year=self.year)
+        self.form = Form(month=self.month, year=self.year, names=self.names)
         self.form.exec()
         
         if self.form.updated:
-            self.loadData()
-            self.loadDataSummary()
+            self.applyChange(self.form.change)
 
 
-    def cellClicked(self, row):
-        item = self.table.item(row, 0)
+    def cellClicked(self, index):
+        # Filled from the table, which already shows saves still queued
+        item = self.model.record(index.row(), INCOME)
 
-        try:
-            id = int(item.text())
-        except:
+        if item is None:
             return
 
-        item = IncomeTable.get(IncomeTable.id == id)
-
-        self.form = Form(month=self.month, year=self.year, edit=True, id=id)
+        self.form = Form(month=self.month, year=self.year, edit=True, id=item.id, original=item, names=self.names)
         self.form.name_input.setText(item.name)
         self.form.amount_input.setText(str(item.amount_of_money))
         self.form.date_input.setValue(item.date.day)
@@ -365,5 +381,4 @@ class IncomeScreen(QWidget):
         self.form.exec()
 
         if self.form.updated:
-            self.loadData()
-            self.loadDataSummary()
\ No newline at end of file
+            self.applyChange(self.form.change)
\ No newline at end of file
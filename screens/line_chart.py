@@ -0,0 +1,96 @@
+import math
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
+from PyQt6.QtCore import QPointF, QDateTime
+from PyQt6.QtGui import QPainter
+from PyQt6 import QtCore
+
+
+def downsample(points, limit):
+    # Keeps the lowest and the highest point of every bucket, so peaks and
+    # dips survive when there are more points than the chart can show
+    if len(points) <= limit:
+        return points
+
+    size = math.ceil(len(points) / max(1, limit // 2))
+    result = []
+
+    for start in range(0, len(points), size):
+        bucket = points[start:start + size]
+        low = min(bucket, key=lambda point: point[1])
+        high = max(bucket, key=lambda point: point[1])
+
+        result.extend(sorted({low, high}))
+
+    return result
+
+
+class LineChart(QChartView):
+    # Date based line chart. The series and axes are created once; setData
+    # replaces their points in place.
+    PIXELS_PER_POINT = 4
+    MINIMUM_POINTS = 24
+
+    def __init__(self, lines, date_format='MM/yyyy'):
+        # lines: [(label, QColor)], one series each
+        super().__init__()
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        chart = QChart()
+
+        self.axisX = QDateTimeAxis()
+        self.axisX.setFormat(date_format)
+        chart.addAxis(self.axisX, QtCore.Qt.AlignmentFlag.AlignBottom)
+
+        self.axisY = QValueAxis()
+        self.axisY.setLabelFormat('%.0f')
+        chart.addAxis(self.axisY, QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        self.series = []
+
+        for label, color in lines:
+            series = QLineSeries()
+            series.setName(label)
+            series.setColor(color)
+            chart.addSeries(series)
+            series.attachAxis(self.axisX)
+            series.attachAxis(self.axisY)
+            self.series.append(series)
+
+        self.setChart(chart)
+        self.points = [[] for _ in self.series]
+        self.limit = None
+
+    def setData(self, dates, columns):
+        # dates: QDateTime of every point, columns: one list of values per line
+        x_values = [float(date.toMSecsSinceEpoch()) for date in dates]
+        self.points = [list(zip(x_values, column)) for column in columns]
+        self.redraw()
+
+    def pointLimit(self):
+        width = int(self.chart().plotArea().width())
+        return max(self.MINIMUM_POINTS, width // self.PIXELS_PER_POINT)
+
+    def redraw(self):
+        limit = self.limit = self.pointLimit()
+
+        for series, points in zip(self.series, self.points):
+            series.replace([QPointF(x, y) for x, y in downsample(points, limit)])
+
+        values = [y for points in self.points for _, y in points]
+
+        if not values:
+            return
+
+        x_values = [x for x, _ in self.points[0]]
+        self.axisX.setRange(
+            QDateTime.fromMSecsSinceEpoch(int(x_values[0])),
+            QDateTime.fromMSecsSinceEpoch(int(x_values[-1])),
+        )
+        self.axisY.setRange(min(0, min(values)), max(values) * 1.05 or 1)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+
+        # A narrower chart shows fewer points
+        if any(self.points) and self.pointLimit() != self.limit:
+            self.redraw()
@@ -0,0 +1,135 @@
+from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget
+from PyQt6.QtGui import QShortcut, QKeySequence
+from db.aggregates import INCOME
+from helpers.const import Vietnamese
+from helpers.function import screenSize
+from helpers import profiling
+from helpers.write_queue import writes
+from .home import Home
+
+
+class MainWindow(QMainWindow):
+    # One window for the whole app; screens are created on first use and
+    # then reused, only reloading when asked for a different month
+
+    def __init__(self):
+        super().__init__()
+        self.incomeScreen = None
+        self.expenseScreen = None
+        self.trendScreen = None
+        self.searchScreen = None
+        self.homeStale = False
+        self.initUI()
+
+        # The month cache only changes once queued saves are written
+        writes.saved.connect(self.savesWritten)
+        QApplication.instance().aboutToQuit.connect(writes.close)
+
+    def initUI(self):
+        desktop_width, desktop_height = screenSize()
+
+        self.home_width = int(desktop_width * 0.23)
+        self.home_height = int(desktop_height * 0.34)
+
+        self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
+
+        self.home = Home()
+        self.home.incomeRequested.connect(self.showIncome)
+        self.home.expenseRequested.connect(self.showExpense)
+        self.home.trendRequested.connect(self.showTrend)
+        self.home.searchRequested.connect(self.showSearch)
+        self.stack.addWidget(self.home)
+
+        if profiling.enabled:
+            from .debug_overlay import DebugOverlay
+
+            self.overlay = DebugOverlay(self)
+            QShortcut(QKeySequence('F12'), self, self.overlay.toggle)
+
+        self.setWindowTitle(Vietnamese.REVENUE_AND_EXPENDITURE_SOFTWARE.value)
+        self.showHome()
+
+    def switchTo(self, screen):
+        self.stack.setCurrentWidget(screen)
+        self.setWindowTitle(screen.windowTitle())
+
+    def showHome(self):
+        self.switchTo(self.home)
+
+        if self.homeStale:
+            self.homeStale = False
+            self.home.refresh()
+
+        self.showNormal()
+        self.resize(self.home_width, self.home_height)
+
+    def showIncome(self, month, year):
+        if self.incomeScreen is None:
+            from .income import IncomeScreen
+
+            self.incomeScreen = IncomeScreen(month, year)
+            self.addScreen(self.incomeScreen)
+        else:
+            self.incomeScreen.setMonth(month, year)
+
+        self.switchTo(self.incomeScreen)
+        self.showMaximized()
+
+    def showExpense(self, month, year):
+        if self.expenseScreen is None:
+            from .expense import ExpenseScreen
+
+            self.expenseScreen = ExpenseScreen(month, year)
+            self.addScreen(self.expenseScreen)
+        else:
+            self.expenseScreen.setMonth(month, year)
+
+        self.switchTo(self.expenseScreen)
+        self.showMaximized()
+
+    def showTrend(self, month, year):
+        if self.trendScreen is None:
+            from .trend import TrendScreen
+
+            self.trendScreen = TrendScreen(month, year)
+            self.trendScreen.backRequested.connect(self.showHome)
+            self.stack.addWidget(self.trendScreen)
+        else:
+            self.trendScreen.setMonth(month, year)
+
+        self.switchTo(self.trendScreen)
+        self.showMaximized()
+
+    def showSearch(self):
+        if self.searchScreen is None:
+            from .search import SearchScreen
+
+            self.searchScreen = SearchScreen()
+            self.searchScreen.backRequested.connect(self.showHome)
+            self.searchScreen.monthRequested.connect(self.showMonth)
+            self.stack.addWidget(self.searchScreen)
+
+        self.switchTo(self.searchScreen)
+        self.showMaximized()
+        self.searchScreen.search_input.setFocus()
+
+    def showMonth(self, kind, month, year):
+        if kind == INCOME:
+            self.showIncome(month, year)
+        else:
+            self.showExpense(month, year)
+
+    def addScreen(self, screen):
+        screen.backRequested.connect(self.showHome)
+        screen.changed.connect(self.markHomeStale)
+        self.stack.addWidget(screen)
+
+    def markHomeStale(self):
+        self.homeStale = True
+
+    def savesWritten(self, changes, ids):
+        if self.stack.currentWidget() is self.home:
+            self.home.refresh()
+        else:
+            self.homeStale = True
@@ -0,0 +1,38 @@
+from PyQt6.QtWidgets import QCompleter
+from PyQt6.QtCore import QStringListModel, pyqtSignal
+
+
+class NameCompleter(QCompleter):
+    # Suggestions for a name QLineEdit from a db.names.NameIndex, ranked by
+    # the index rather than filtered by Qt. picked carries the NameEntry of
+    # a chosen suggestion.
+    picked = pyqtSignal(object)
+    LIMIT = 10
+
+    def __init__(self, names, line_edit):
+        super().__init__(line_edit)
+        self.names = names
+
+        self.suggestions = QStringListModel(self)
+        self.setModel(self.suggestions)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setWidget(line_edit)
+
+        line_edit.textEdited.connect(self.suggest)
+        self.activated.connect(self.choose)
+
+    def suggest(self, text):
+        names = self.names.suggest(text, self.LIMIT)
+        self.suggestions.setStringList(names)
+
+        if names:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def choose(self, name):
+        self.widget().setText(name)
+        entry = self.names.get(name)
+
+        if entry is not None:
+            self.picked.emit(entry)
@@ -0,0 +1,212 @@
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+    QStyle,
+)
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QFont
+from PyQt6 import QtCore
+from db.aggregates import INCOME
+from db.ledger import ledger
+from helpers.const import Vietnamese
+from helpers.worker import Loader
+from helpers.write_queue import writes
+from reports import format_money
+
+headers = [
+    Vietnamese.KIND.value,
+    Vietnamese.CONTENT.value,
+    Vietnamese.DATE.value,
+    Vietnamese.AMOUNT_OF_MONEY.value,
+]
+
+
+class SearchResultsModel(QAbstractTableModel):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (kind, id, name, date, amount, type) of the page shown
+        self.rows = []
+
+    def setRows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def record(self, row):
+        if 0 <= row < len(self.rows):
+            return self.rows[row]
+
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return headers[section]
+
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        kind, _, name, date, amount, _ = self.rows[index.row()]
+        column = index.column()
+
+        if column == 0:
+            return Vietnamese.INCOME.value if kind == INCOME else Vietnamese.EXPENSE.value
+        if column == 1:
+            return name
+        if column == 2:
+            return date.strftime('%d/%m/%Y')
+
+        return format_money(amount)
+
+
+class SearchScreen(QWidget):
+    backRequested = QtCore.pyqtSignal()
+    # kind, month, year of a double-clicked result
+    monthRequested = QtCore.pyqtSignal(str, int, int)
+    # Wait this long after the last key press before searching
+    DEBOUNCE_MS = 250
+
+    def __init__(self):
+        super().__init__()
+        self.page = 0
+
+        self.loader = Loader(self, name='SearchScreen.loadData')
+        self.loader.loading.connect(self.setLoading)
+
+        self.debounce = QtCore.QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.firstPage)
+
+        self.initUI()
+
+    def initUI(self):
+        vbox1 = QVBoxLayout()
+
+        title_label = QLabel(Vietnamese.SEARCH.value)
+        title_label.setFont(QFont('Times', 15))
+        title_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+
+        vbox1.addWidget(title_label)
+        vbox1.addSpacing(15)
+
+        hbox1 = QHBoxLayout()
+        back_button = QPushButton()
+        back_button.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowBack)
+        )
+        back_button.clicked.connect(self.backButtonClicked)
+        hbox1.addWidget(back_button)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(Vietnamese.SEARCH.value)
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.searchChanged)
+        self.search_input.returnPressed.connect(self.firstPage)
+        hbox1.addWidget(self.search_input)
+
+        vbox1.addLayout(hbox1)
+        vbox1.addSpacing(15)
+
+        self.model = SearchResultsModel(self)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.doubleClicked.connect(self.cellClicked)
+        vbox1.addWidget(self.table)
+
+        self.loading_label = QLabel(Vietnamese.LOADING.value)
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        vbox1.addWidget(self.loading_label)
+
+        hbox2 = QHBoxLayout()
+        hbox2.addStretch()
+
+        self.previous_button = QPushButton(Vietnamese.PREVIOUS_PAGE.value)
+        self.previous_button.clicked.connect(self.previousPage)
+        hbox2.addWidget(self.previous_button)
+
+        self.page_label = QLabel()
+        hbox2.addWidget(self.page_label)
+
+        self.next_button = QPushButton(Vietnamese.NEXT_PAGE.value)
+        self.next_button.clicked.connect(self.nextPage)
+        hbox2.addWidget(self.next_button)
+
+        hbox2.addStretch()
+        vbox1.addLayout(hbox2)
+
+        self.setLayout(vbox1)
+        self.setWindowTitle(Vietnamese.SEARCH.value)
+        self.showPage([], False)
+
+    def setLoading(self, loading):
+        self.loading_label.setVisible(loading)
+
+    def searchChanged(self):
+        self.debounce.start()
+
+    def firstPage(self):
+        self.debounce.stop()
+        self.loadData(0)
+
+    def previousPage(self):
+        self.loadData(self.page - 1)
+
+    def nextPage(self):
+        self.loadData(self.page + 1)
+
+    def loadData(self, page):
+        text = self.search_input.text()
+
+        self.loader.load(
+            writes.after(lambda: ledger.search(text, page)),
+            lambda result: self.showPage(*result, page=page),
+        )
+
+    def showPage(self, rows, more, page=0):
+        self.page = page
+        self.model.setRows(rows)
+        self.table.scrollToTop()
+
+        self.previous_button.setEnabled(page > 0)
+        self.next_button.setEnabled(more)
+        self.page_label.setText(f'{Vietnamese.PAGE.value} {page + 1}')
+
+    def cellClicked(self, index):
+        record = self.model.record(index.row())
+
+        if record is None:
+            return
+
+        kind, _, _, date, _, _ = record
+        self.monthRequested.emit(kind, date.month, date.year)
+
+    def backButtonClicked(self):
+        self.backRequested.emit()
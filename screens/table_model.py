@@ -0,0 +1,189 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QFont
+from helpers.const import Vietnamese
+from reports import format_money
+from db.changes import Row, RowChange
+from db.snapshot import MonthSnapshot
+
+
+class TransactionTableModel(QAbstractTableModel):
+    # Rows are handed to the view in batches as it scrolls
+    BATCH_SIZE = 100
+
+    def __init__(self, headers, types, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        # One amount column per type; income has the single type ''
+        self.snapshot = MonthSnapshot(0, 0, types)
+        self.loaded = 0
+        self.totals = self.snapshot.totals()
+
+        self.boldFont = QFont()
+        self.boldFont.setBold(True)
+
+    def setSnapshot(self, snapshot):
+        self.beginResetModel()
+        self.snapshot = snapshot
+        self.loaded = min(self.BATCH_SIZE, len(snapshot))
+        self.totals = snapshot.totals()
+        self.endResetModel()
+
+    def applyChange(self, change):
+        # Patch the single row a RowChange describes, keeping date order
+        snapshot = self.snapshot
+
+        if change.old_amount is not None:
+            self.removeRecord(change.id)
+            self.totals[snapshot.typeCode(change.old_type or '')] -= change.old_amount
+
+        self.insertRecord(change)
+        self.totals[snapshot.typeCode(change.new_type or '')] += change.new_amount
+
+        if self.loaded == len(snapshot):
+            self.dataChanged.emit(
+                self.index(self.loaded, 0),
+                self.index(self.loaded, len(self.headers) - 1),
+            )
+
+    def removeRecord(self, id):
+        row = self.snapshot.find(id)
+
+        if row is None:
+            return
+
+        if row < self.loaded:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.snapshot.remove(row)
+            self.loaded -= 1
+            self.endRemoveRows()
+        else:
+            self.snapshot.remove(row)
+
+    def insertRecord(self, change):
+        snapshot = self.snapshot
+        day = change.date.day
+        row = snapshot.position(day, change.id)
+        record = (row, change.id, change.name, day, change.new_amount, change.new_type or '')
+
+        # Rows past the fetched ones are picked up by fetchMore later
+        if row < self.loaded or self.loaded == len(snapshot):
+            self.beginInsertRows(QModelIndex(), row, row)
+            snapshot.insert(*record)
+            self.loaded += 1
+            self.endInsertRows()
+        else:
+            snapshot.insert(*record)
+
+    def replaceIds(self, ids):
+        # Rows saved under a provisional id move to their stored id
+        snapshot = self.snapshot
+
+        for provisional, id in ids.items():
+            row = snapshot.find(provisional)
+
+            if row is None:
+                continue
+
+            change = RowChange(
+                None,
+                id,
+                snapshot.names[row],
+                snapshot.date(row),
+                None,
+                snapshot.amounts[row],
+                None,
+                snapshot.types[snapshot.codes[row]],
+            )
+            self.removeRecord(provisional)
+            self.insertRecord(change)
+
+    def record(self, row, kind):
+        # The Row an edit form is filled from
+        if not 0 <= row < self.loaded:
+            return None
+
+        snapshot = self.snapshot
+
+        return Row(
+            kind,
+            snapshot.ids[row],
+            snapshot.names[row],
+            snapshot.amounts[row],
+            snapshot.date(row),
+            snapshot.types[snapshot.codes[row]],
+        )
+
+    def isTotalRow(self, row):
+        return row == self.loaded == len(self.snapshot)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        # The total row is only shown once every record has been fetched
+        return self.loaded + (1 if self.loaded == len(self.snapshot) else 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.snapshot)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        count = min(self.BATCH_SIZE, len(self.snapshot) - self.loaded)
+        last = self.loaded + count - 1
+
+        if self.loaded + count == len(self.snapshot):
+            last += 1
+
+        self.beginInsertRows(QModelIndex(), self.loaded, last)
+        self.loaded += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        if role == Qt.ItemDataRole.FontRole:
+            return self.boldFont if self.isTotalRow(index.row()) else None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.displayText(index.row(), index.column())
+
+        return None
+
+    def displayText(self, row, column):
+        if self.isTotalRow(row):
+            if column == 1:
+                return Vietnamese.TOTAL.value.upper()
+            if column >= 3:
+                return format_money(self.totals[column - 3])
+            return ''
+
+        snapshot = self.snapshot
+
+        if column == 0:
+            # Provisional ids of rows not written yet are not shown
+            id = snapshot.ids[row]
+            return str(id) if id > 0 else ''
+        if column == 1:
+            return snapshot.names[row]
+        if column == 2:
+            return f'{snapshot.days[row]:02d}/{snapshot.month:02d}/{snapshot.year}'
+
+        if column - 3 != snapshot.codes[row]:
+            return ''
+
+        return format_money(snapshot.amounts[row])
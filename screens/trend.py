@@ -0,0 +1,138 @@
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QDateEdit,
+    QPushButton,
+    QStyle,
+)
+from PyQt6.QtGui import QFont, QColor
+from PyQt6 import QtCore
+from db.ledger import ledger
+from helpers.const import Vietnamese
+from helpers.worker import Loader
+from helpers.write_queue import writes
+from helpers import profiling
+from reports import EXPENSE_TYPES, trend_report
+from .line_chart import LineChart
+
+LINES = [
+    (Vietnamese.INCOME.value, QColor(0, 0, 255)),
+    (Vietnamese.EXPENSE.value, QColor(255, 0, 0)),
+    (Vietnamese.MUST_HAVE.value, QColor(0, 128, 0)),
+    (Vietnamese.NICE_TO_HAVE.value, QColor(255, 165, 0)),
+    (Vietnamese.WASTED.value, QColor(128, 0, 128)),
+]
+
+
+class TrendScreen(QWidget):
+    backRequested = QtCore.pyqtSignal()
+    # Months shown up to the month picked on Home
+    MONTHS = 120
+
+    def __init__(self, month, year):
+        super().__init__()
+        self.loader = Loader(self, name='TrendScreen.loadData')
+        self.loader.loading.connect(self.setLoading)
+
+        self.initUI()
+        self.setMonth(month, year)
+
+    def initUI(self):
+        vbox1 = QVBoxLayout()
+
+        title_label = QLabel(Vietnamese.TREND.value)
+        title_label.setFont(QFont('Times', 15))
+        title_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+
+        vbox1.addWidget(title_label)
+        vbox1.addSpacing(15)
+
+        hbox1 = QHBoxLayout()
+        back_button = QPushButton()
+        back_button.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowBack)
+        )
+        back_button.clicked.connect(self.backButtonClicked)
+
+        hbox1.addWidget(back_button)
+        hbox1.addStretch()
+
+        self.from_input = self.createMonthInput()
+        self.to_input = self.createMonthInput()
+
+        hbox1.addWidget(QLabel(Vietnamese.FROM.value))
+        hbox1.addWidget(self.from_input)
+        hbox1.addWidget(QLabel(Vietnamese.TO.value))
+        hbox1.addWidget(self.to_input)
+
+        vbox1.addLayout(hbox1)
+        vbox1.addSpacing(15)
+
+        self.chartView = LineChart(LINES)
+        vbox1.addWidget(self.chartView)
+
+        self.loading_label = QLabel(Vietnamese.LOADING.value)
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        vbox1.addWidget(self.loading_label)
+
+        self.setLayout(vbox1)
+        self.setWindowTitle(Vietnamese.TREND.value)
+
+    def createMonthInput(self):
+        month_input = QDateEdit()
+        month_input.setCurrentSection(QDateEdit.Section.MonthSection)
+        month_input.setDisplayFormat("MM/yyyy")
+        month_input.dateChanged.connect(self.loadData)
+        return month_input
+
+    def setMonth(self, month, year):
+        last = QtCore.QDate(year, month, 1)
+
+        # Both inputs change, load once
+        for month_input, date in ((self.from_input, last.addMonths(1 - self.MONTHS)), (self.to_input, last)):
+            month_input.blockSignals(True)
+            month_input.setDate(date)
+            month_input.blockSignals(False)
+
+        self.loadData()
+
+    def setLoading(self, loading):
+        self.loading_label.setVisible(loading)
+        self.chartView.setEnabled(not loading)
+
+    def loadData(self):
+        first = self.from_input.date()
+        last = self.to_input.date()
+
+        if first > last:
+            first, last = last, first
+
+        first = (first.year(), first.month())
+        last = (last.year(), last.month())
+
+        self.loader.load(
+            writes.after(lambda: trend_report(first, last, ledger.monthly_trend(first, last))),
+            self.showTrend,
+        )
+
+    def showTrend(self, months):
+        dates = [
+            QtCore.QDateTime(QtCore.QDate(row['year'], row['month'], 1), QtCore.QTime(0, 0))
+            for row in months
+        ]
+        columns = [
+            [row['income'] for row in months],
+            [row['expense'] for row in months],
+        ] + [
+            [row['expense_types'][type] for row in months]
+            for type in EXPENSE_TYPES
+        ]
+
+        with profiling.span('TrendScreen.chart'):
+            self.chartView.setData(dates, columns)
+
+    def backButtonClicked(self):
+        self.backRequested.emit()
@@ -1 +1,77 @@
-db_connect = 'database.db'
\ No newline at end of file
+import os
+
+# THUCHI_DB and THUCHI_DB_PROFILE point a run at another database, e.g. a
+# generated benchmark ledger
+db_connect = os.environ.get('THUCHI_DB', 'database.db')
+
+# Name of the entry in db_profiles applied to every connection. Override it
+# (or add profiles) in local_settings.py.
+db_profile = os.environ.get('THUCHI_DB_PROFILE', 'balanced')
+
+db_profiles = {
+    # SQLite defaults: rollback journal and a full fsync on every commit
+    'legacy': {
+        'journal_mode': 'delete',
+        'synchronous': 'full',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'default',
+        'foreign_keys': 1,
+    },
+    # WAL only syncs on checkpoints with synchronous=normal; a power loss can
+    # drop the last commits but never corrupts the file
+    'balanced': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'memory',
+        'foreign_keys': 1,
+    },
+    # No fsync at all, for bulk loading and benchmarks
+    'fast': {
+        'journal_mode': 'wal',
+        'synchronous': 'off',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'memory',
+        'foreign_keys': 1,
+    },
+}
+
+# Months kept in the in-memory cache, counting income and expense separately
+month_cache_size = 48
+
+# Query and render timings, also turned on with THUCHI_PROFILE=1. Events are
+# written as JSON lines to profile_log, rotated at profile_log_bytes, and
+# shown in an overlay toggled with F12.
+profile = os.environ.get('THUCHI_PROFILE', '') not in ('', '0')
+profile_log = 'profile.log'
+profile_log_bytes = 1024 * 1024
+profile_log_backups = 3
+
+# Animate chart values when a month is shown or changes
+chart_animations = True
+
+# URL of a ledger server (python -m db serve) shared by several machines,
+# also set with THUCHI_SERVER. Empty to use the database file directly.
+ledger_url = os.environ.get('THUCHI_SERVER', '')
+# Seconds to wait for the server before a load or save fails
+ledger_timeout = 10
+
+# Address the ledger server listens on and its number of reader threads.
+# Use '0.0.0.0' to serve the other machines of the network.
+server_host = '127.0.0.1'
+server_port = 8765
+server_readers = 4
+
+# Saves are collected for this long, then written in one transaction on a
+# worker thread. Whatever is left is written when the app exits.
+write_behind_ms = 1000
+# Writes a save may fail before it is given up and reported; failed saves
+# are tried again write_behind_ms later
+write_retries = 5
+
+# Shares of a monthly budget, in percent, that raise an alert on the expense
+# screen when a save takes the spending of a type past them
+budget_thresholds = (80, 100)
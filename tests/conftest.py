@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The settings read these on import, so they are set before anything
+# imports db or PyQt6
+directory = tempfile.mkdtemp(prefix='thuchi-tests-')
+os.environ['THUCHI_DB'] = os.path.join(directory, 'database.db')
+os.environ.pop('THUCHI_SERVER', None)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def ledger_db():
+    # An empty, migrated ledger for every test
+    from db import db, Income, Expense, MonthlyTotal, Budget
+    from db.cache import month_cache
+
+    # The rollup last, the delete triggers leave rows of 0 behind
+    for model in (Income, Expense, Budget, MonthlyTotal):
+        model.delete().execute()
+
+    month_cache.clear()
+    yield db
+    month_cache.clear()
+
+
+@pytest.fixture(scope='session')
+def app():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def serve():
+    # Serves a ledger on a free localhost port, returns a RemoteLedger of it
+    from db.remote import RemoteLedger
+    from db.server import LedgerServer
+
+    servers = []
+
+    def start(ledger, timeout=5):
+        server = LedgerServer(ledger)
+        servers.append(server)
+        return RemoteLedger(server.start_thread(), timeout=timeout)
+
+    yield start
+
+    for server in servers:
+        server.stop_thread()
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication, QMessageBox
+
+from db.budget import month_budgets, set_budgets
+
+
+def test_a_budget_applies_until_a_later_month_sets_another(ledger_db):
+    set_budgets(2026, 3, {'MUST_HAVE': 5000000, 'WASTED': 500000})
+    set_budgets(2026, 5, {'WASTED': 0})
+
+    assert month_budgets(2026, 2) == {'MUST_HAVE': 0, 'NICE_TO_HAVE': 0, 'WASTED': 0}
+    assert month_budgets(2026, 4) == {'MUST_HAVE': 5000000, 'NICE_TO_HAVE': 0, 'WASTED': 500000}
+    # 0 ends the earlier budget
+    assert month_budgets(2027, 1) == {'MUST_HAVE': 5000000, 'NICE_TO_HAVE': 0, 'WASTED': 0}
+
+
+def test_invalid_budgets_are_refused(ledger_db):
+    with pytest.raises(ValueError):
+        set_budgets(2026, 3, {'SOMETIMES': 1})
+
+    with pytest.raises(ValueError):
+        set_budgets(2026, 3, {'WASTED': -1})
+
+    assert month_budgets(2026, 3)['WASTED'] == 0
+
+
+def wait(app, condition):
+    for _ in range(500):
+        app.processEvents()
+
+        if condition():
+            return
+
+        time.sleep(0.01)
+
+    raise AssertionError('timed out')
+
+
+def test_changing_month_does_not_drop_a_budget_being_saved(app, ledger_db):
+    from screens.expense import ExpenseScreen
+
+    screen = ExpenseScreen(6, 2026)
+    pool = QThreadPool.globalInstance()
+    release = threading.Event()
+
+    # Every thread of the pool busy, the loads of the screen wait in its queue
+    for _ in range(pool.maxThreadCount()):
+        pool.start(release.wait)
+
+    screen.saveBudgets({'WASTED': 500000})
+    screen.setMonth(7, 2026)
+    release.set()
+
+    wait(app, lambda: not screen.budgetWriter.jobs and not screen.budgetLoader.isLoading())
+
+    assert month_budgets(2026, 6)['WASTED'] == 500000
+    assert screen.budgets['WASTED'] == 500000
+
+
+def test_a_failed_budget_save_is_shown(app, ledger_db, monkeypatch):
+    from db.ledger import ledger
+    from helpers.const import Vietnamese
+    from screens.expense import ExpenseScreen
+
+    def refuse(year, month, amounts):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(ledger, 'set_budgets', refuse)
+    screen = ExpenseScreen(6, 2026)
+
+    screen.saveBudgets({'WASTED': 500000})
+    wait(app, lambda: not screen.budgetWriter.jobs)
+
+    boxes = [widget for widget in QApplication.topLevelWidgets() if isinstance(widget, QMessageBox)]
+    assert [box.text() for box in boxes] == [Vietnamese.BUDGET_SAVE_FAILED.value]
+
+    for box in boxes:
+        box.close()
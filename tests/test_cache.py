@@ -0,0 +1,79 @@
+import datetime
+
+from db.aggregates import EXPENSE, INCOME, monthly_totals
+from db.cache import MonthCache, month_cache
+from db.ledger import LocalLedger
+from db.queries import month_snapshot
+
+
+def test_store_and_lookup_by_part():
+    cache = MonthCache(4)
+    cache.store(EXPENSE, 2026, 6, 'totals', {'WASTED': 10}, 0)
+
+    assert cache.lookup(EXPENSE, 2026, 6, 'totals') == {'WASTED': 10}
+    assert cache.lookup(EXPENSE, 2026, 6, 'rows') is None
+    assert cache.lookup(INCOME, 2026, 6, 'totals') is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 2)
+
+
+def test_invalidate_drops_the_month_and_ignores_stale_loads():
+    cache = MonthCache(4)
+    version = cache.version(EXPENSE, 2026, 6)
+    cache.store(EXPENSE, 2026, 6, 'totals', {'WASTED': 10}, version)
+
+    cache.invalidate(EXPENSE, 2026, 6)
+    assert cache.lookup(EXPENSE, 2026, 6, 'totals') is None
+
+    # A load that read the month before the write must not be kept
+    cache.store(EXPENSE, 2026, 6, 'totals', {'WASTED': 10}, version)
+    assert cache.lookup(EXPENSE, 2026, 6, 'totals') is None
+
+    cache.store(EXPENSE, 2026, 6, 'totals', {'WASTED': 20}, cache.version(EXPENSE, 2026, 6))
+    assert cache.lookup(EXPENSE, 2026, 6, 'totals') == {'WASTED': 20}
+
+
+def test_clear_also_ignores_stale_loads():
+    cache = MonthCache(4)
+    cache.store(EXPENSE, 2026, 6, 'totals', {}, 0)
+    cache.clear()
+
+    cache.store(EXPENSE, 2026, 6, 'totals', {}, 0)
+    assert cache.lookup(EXPENSE, 2026, 6, 'totals') is None
+
+
+def test_least_recently_used_month_is_evicted():
+    cache = MonthCache(2)
+
+    for month in (1, 2):
+        cache.store(EXPENSE, 2026, month, 'totals', {}, 0)
+
+    cache.lookup(EXPENSE, 2026, 1, 'totals')
+    cache.store(EXPENSE, 2026, 3, 'totals', {}, 0)
+
+    assert cache.lookup(EXPENSE, 2026, 1, 'totals') == {}
+    assert cache.lookup(EXPENSE, 2026, 2, 'totals') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_saves_invalidate_the_months_they_touch(ledger_db):
+    ledger = LocalLedger()
+    june, july = datetime.date(2026, 6, 10), datetime.date(2026, 7, 10)
+    change = ledger.insert(EXPENSE, 'Cà phê', 30000, june, 'WASTED')
+
+    # Fill the cache, then write through the ledger
+    assert len(month_snapshot(EXPENSE, 2026, 6)) == 1
+    assert monthly_totals(2026, 7, months=2).get(EXPENSE, 2026, 6) == 30000
+
+    ledger.insert(EXPENSE, 'Ăn trưa', 50000, june, 'MUST_HAVE')
+    assert len(month_snapshot(EXPENSE, 2026, 6)) == 2
+    assert monthly_totals(2026, 7, months=2).get(EXPENSE, 2026, 6) == 80000
+
+    # Moving a row to another month clears both
+    assert len(month_snapshot(EXPENSE, 2026, 7)) == 0
+    ledger.update(EXPENSE, change.id, 'Cà phê', 30000, july, 'WASTED')
+
+    assert len(month_snapshot(EXPENSE, 2026, 6)) == 1
+    assert len(month_snapshot(EXPENSE, 2026, 7)) == 1
+    assert monthly_totals(2026, 7, months=2).get(EXPENSE, 2026, 6) == 50000
+    assert monthly_totals(2026, 7, months=2).get(EXPENSE, 2026, 7) == 30000
+    assert month_cache.lookup(EXPENSE, 2026, 7, 'totals', count=False) == {'WASTED': 30000}
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from db import Expense
+from db.aggregates import EXPENSE
+from db.importer import import_csv
+
+
+def expense_csv(*rows):
+    return io.StringIO('name,amount_of_money,date,type\n' + ''.join(f'{row}\n' for row in rows))
+
+
+def test_rows_differing_in_name_case_or_type_are_kept(ledger_db):
+    stream = expense_csv(
+        'Coffee,30000,2026-06-01,NICE_TO_HAVE',
+        'coffee,30000,2026-06-01,NICE_TO_HAVE',
+        'Lunch,50000,2026-06-01,MUST_HAVE',
+        'Lunch,50000,2026-06-01,WASTED',
+    )
+
+    result = import_csv(EXPENSE, stream)
+
+    assert (result.inserted, result.duplicates, result.errors) == (4, 0, [])
+    assert sorted(Expense.select(Expense.name, Expense.type).tuples()) == [
+        ('Coffee', 'NICE_TO_HAVE'),
+        ('Lunch', 'MUST_HAVE'),
+        ('Lunch', 'WASTED'),
+        ('coffee', 'NICE_TO_HAVE'),
+    ]
+
+
+def test_reimport_of_the_same_file_inserts_nothing(ledger_db):
+    rows = (
+        'Coffee,30000,2026-06-01,NICE_TO_HAVE',
+        'coffee,30000,2026-06-01,NICE_TO_HAVE',
+        'Lunch,50000,2026-06-01,MUST_HAVE',
+        'Lunch,50000,2026-06-01,WASTED',
+    )
+    import_csv(EXPENSE, expense_csv(*rows))
+
+    result = import_csv(EXPENSE, expense_csv(*rows))
+
+    assert (result.inserted, result.duplicates) == (0, 4)
+    assert Expense.select().count() == 4
+
+
+def test_amounts_out_of_range_are_row_errors(ledger_db):
+    stream = expense_csv(
+        'Cà phê,30000,2026-06-01,WASTED',
+        f'Nhà,{10 ** 30},2026-06-02,MUST_HAVE',
+        'Ăn trưa,50000,2026-06-03,MUST_HAVE',
+    )
+
+    result = import_csv(EXPENSE, stream, batch_size=1)
+
+    assert result.inserted == 2
+    assert [line for line, _ in result.errors] == [3]
+
+
+def test_committed_batches_are_not_left_cached(ledger_db, monkeypatch):
+    from db import importer
+    from db.queries import month_snapshot
+
+    # Cached while the month is empty
+    assert len(month_snapshot(EXPENSE, 2026, 6)) == 0
+
+    writes = []
+
+    def insert_batch(sql, batch):
+        if writes:
+            raise OSError('disk full')
+
+        writes.append(batch)
+        return original(sql, batch)
+
+    original = importer.insert_batch
+    monkeypatch.setattr(importer, 'insert_batch', insert_batch)
+
+    stream = expense_csv(
+        'Cà phê,30000,2026-06-01,WASTED',
+        'Ăn trưa,50000,2026-07-03,MUST_HAVE',
+    )
+
+    with pytest.raises(OSError):
+        import_csv(EXPENSE, stream, batch_size=1)
+
+    assert len(month_snapshot(EXPENSE, 2026, 6)) == 1
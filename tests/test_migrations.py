@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tables as the first release of the app created them
+BASELINE = [
+    'CREATE TABLE "income" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, '
+    '"amount_of_money" INTEGER NOT NULL, "date" DATE NOT NULL)',
+    'CREATE TABLE "expense" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, '
+    '"amount_of_money" INTEGER NOT NULL, "date" DATE NOT NULL, "type" VARCHAR(255) NOT NULL)',
+]
+
+# Run in a fresh interpreter, importing db migrates the file
+CHECK = '''
+import json
+from db import db, rollup
+from db.migrations import current_version, SCHEMA_VERSION
+from db.search import search
+
+print(json.dumps({
+    'version': current_version(),
+    'schema_version': SCHEMA_VERSION,
+    'drift': rollup.verify(),
+    'found': [row[2] for row in search('ca phe')[0]],
+    'indexes': sorted(row[0] for row in db.execute_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%'"
+    )),
+    'tables': sorted(row[0] for row in db.execute_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )),
+}))
+'''
+
+
+def migrate(path):
+    environment = {**os.environ, 'THUCHI_DB': path}
+    environment.pop('THUCHI_SERVER', None)
+    result = subprocess.run(
+        [sys.executable, '-c', CHECK],
+        cwd=ROOT, env=environment, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_a_baseline_database_migrates_to_the_current_schema(tmp_path):
+    path = str(tmp_path / 'baseline.db')
+
+    with sqlite3.connect(path) as connection:
+        for statement in BASELINE:
+            connection.execute(statement)
+
+        connection.execute("INSERT INTO income VALUES (1, 'Lương', 10000000, '2026-06-01')")
+        connection.execute("INSERT INTO expense VALUES (1, 'Cà phê', 30000, '2026-06-02', 'WASTED')")
+        connection.execute("INSERT INTO expense VALUES (2, 'Nhà', 3000000, '2026-05-02', 'MUST_HAVE')")
+
+    state = migrate(path)
+
+    assert state['version'] == state['schema_version']
+    assert state['drift'] == []
+    assert state['found'] == ['Cà phê']
+    assert {
+        'income_date',
+        'expense_date_type',
+        'income_content_hash',
+        'expense_content_hash',
+    } <= set(state['indexes'])
+    assert {'monthly_total', 'budget', 'ledger_search'} <= set(state['tables'])
+    assert 'income_search' not in state['tables']
+
+    # Nothing is left to do the second time
+    assert migrate(path) == state
+
+
+def test_a_new_database_gets_the_same_schema(tmp_path):
+    baseline = str(tmp_path / 'baseline.db')
+
+    with sqlite3.connect(baseline) as connection:
+        for statement in BASELINE:
+            connection.execute(statement)
+
+    migrated = migrate(baseline)
+    new = migrate(str(tmp_path / 'new.db'))
+
+    assert new['version'] == new['schema_version']
+    assert (new['indexes'], new['tables']) == (migrated['indexes'], migrated['tables'])
@@ -0,0 +1,26 @@
+import datetime
+
+from db.names import NameEntry, NameIndex
+
+
+def test_replace_keeps_names_added_while_loading():
+    names = NameIndex()
+    loaded = NameIndex([
+        NameEntry('Cà phê', 3, datetime.date(2026, 5, 1), 30000, 'WASTED'),
+        NameEntry('Ăn trưa', 10, datetime.date(2026, 6, 1), 50000, 'MUST_HAVE'),
+    ])
+
+    # Saved by a form before the load finished, not yet in what it read
+    names.add('Cà phê', datetime.date(2026, 6, 5), 35000, 'NICE_TO_HAVE')
+    names.add('Bánh mì', datetime.date(2026, 6, 5), 20000, 'MUST_HAVE')
+
+    names.replace(loaded)
+
+    assert names.suggest('b') == ['Bánh mì']
+    assert names.suggest('ca') == ['Cà phê']
+
+    coffee = names.get('Cà phê')
+    assert (coffee.count, coffee.last_date, coffee.amount, coffee.type) == (
+        3, datetime.date(2026, 6, 5), 35000, 'NICE_TO_HAVE',
+    )
+    assert names.get('Ăn trưa').count == 10
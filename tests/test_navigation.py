@@ -0,0 +1,29 @@
+import tracemalloc
+
+from benchmarks.navigation_memory import measure, navigate
+
+NAVIGATIONS = 1000
+MAX_GROWTH_KB = 512
+
+
+def test_memory_stays_flat_over_navigations(app, ledger_db):
+    from screens.main_window import MainWindow
+
+    window = MainWindow()
+
+    # Create every screen once before measuring
+    navigate(app, window, 8)
+
+    tracemalloc.start()
+    try:
+        widgets_before, memory_before = measure(app)
+        navigate(app, window, NAVIGATIONS)
+        widgets_after, memory_after = measure(app)
+    finally:
+        tracemalloc.stop()
+
+    assert widgets_after <= widgets_before
+    assert (memory_after - memory_before) / 1024 <= MAX_GROWTH_KB
+
+    window.close()
+    window.deleteLater()
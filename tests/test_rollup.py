@@ -0,0 +1,63 @@
+import datetime
+
+from db import Income, Expense, MonthlyTotal
+from db import rollup
+
+
+def stored(year, month, kind, type=''):
+    return rollup.stored_totals().get((year, month, kind, type), 0)
+
+
+def test_inserts_updates_and_deletes_keep_the_rollup_exact(ledger_db):
+    salary = Income.create(name='Lương', amount_of_money=10000000, date=datetime.date(2026, 6, 1))
+    rent = Expense.create(name='Nhà', amount_of_money=3000000, date=datetime.date(2026, 6, 2), type='MUST_HAVE')
+    coffee = Expense.create(name='Cà phê', amount_of_money=30000, date=datetime.date(2026, 6, 3), type='WASTED')
+
+    assert stored(2026, 6, 'income') == 10000000
+    assert stored(2026, 6, 'expense', 'MUST_HAVE') == 3000000
+    assert rollup.verify() == []
+
+    # Amount, month and type changes move the amount between rollups
+    Income.update(amount_of_money=12000000).where(Income.id == salary.id).execute()
+    Expense.update(date=datetime.date(2026, 7, 2)).where(Expense.id == rent.id).execute()
+    Expense.update(type='NICE_TO_HAVE').where(Expense.id == coffee.id).execute()
+
+    assert stored(2026, 6, 'income') == 12000000
+    assert stored(2026, 6, 'expense', 'MUST_HAVE') == 0
+    assert stored(2026, 7, 'expense', 'MUST_HAVE') == 3000000
+    assert stored(2026, 6, 'expense', 'WASTED') == 0
+    assert stored(2026, 6, 'expense', 'NICE_TO_HAVE') == 30000
+    assert rollup.verify() == []
+
+    Expense.delete_by_id(rent.id)
+    Income.delete_by_id(salary.id)
+
+    assert stored(2026, 7, 'expense', 'MUST_HAVE') == 0
+    assert stored(2026, 6, 'income') == 0
+    assert rollup.verify() == []
+
+
+def test_verify_reports_drift_and_rebuild_repairs_it(ledger_db):
+    Expense.create(name='Nhà', amount_of_money=3000000, date=datetime.date(2026, 6, 2), type='MUST_HAVE')
+
+    MonthlyTotal.update(amount_of_money=1).where(MonthlyTotal.type == 'MUST_HAVE').execute()
+
+    assert rollup.verify() == [((2026, 6, 'expense', 'MUST_HAVE'), 1, 3000000)]
+
+    rollup.rebuild()
+
+    assert rollup.verify() == []
+
+
+def test_rows_written_without_triggers_are_picked_up_by_rebuild(ledger_db):
+    rollup.drop_triggers()
+
+    try:
+        Income.create(name='Thưởng', amount_of_money=500000, date=datetime.date(2026, 5, 1))
+        assert rollup.verify() == [((2026, 5, 'income', ''), 0, 500000)]
+    finally:
+        rollup.create_triggers()
+        rollup.rebuild()
+
+    assert rollup.verify() == []
+    assert stored(2026, 5, 'income') == 500000
@@ -0,0 +1,47 @@
+import datetime
+
+from db import Income, Expense
+from db.search import search
+
+
+def test_matches_of_both_tables_are_ranked_together(ledger_db):
+    Expense.create(name='Cà phê sữa đá với bạn cũ ở quán', amount_of_money=1, date=datetime.date(2026, 6, 3), type='WASTED')
+    Income.create(name='Cà phê', amount_of_money=1, date=datetime.date(2026, 6, 1))
+    Expense.create(name='Cà phê', amount_of_money=1, date=datetime.date(2026, 6, 2), type='WASTED')
+
+    rows, more = search('ca phe')
+
+    # The closest matches first, the newer of two equal ones first
+    assert [(kind, name, date.day) for kind, _, name, date, _, _ in rows] == [
+        ('expense', 'Cà phê', 2),
+        ('income', 'Cà phê', 1),
+        ('expense', 'Cà phê sữa đá với bạn cũ ở quán', 3),
+    ]
+    assert not more
+
+
+def test_the_index_follows_edits_and_deletes(ledger_db):
+    income = Income.create(name='Lương', amount_of_money=1, date=datetime.date(2026, 6, 1))
+    expense = Expense.create(name='Lương thực', amount_of_money=2, date=datetime.date(2026, 6, 1), type='MUST_HAVE')
+
+    Income.update(name='Thưởng').where(Income.id == income.id).execute()
+
+    assert [row[:3] for row in search('luong')[0]] == [('expense', expense.id, 'Lương thực')]
+    assert [row[:3] for row in search('thuong')[0]] == [('income', income.id, 'Thưởng')]
+
+    Expense.delete_by_id(expense.id)
+
+    assert search('luong') == ([], False)
+
+
+def test_pages_do_not_overlap(ledger_db):
+    for day in range(1, 6):
+        Income.create(name='Lương', amount_of_money=day, date=datetime.date(2026, 6, day))
+        Expense.create(name='Lương thực', amount_of_money=day, date=datetime.date(2026, 6, day), type='MUST_HAVE')
+
+    first, more = search('luong', page=0, page_size=6)
+    second, last = search('luong', page=1, page_size=6)
+
+    assert more and not last
+    assert len(first) == 6 and len(second) == 4
+    assert not {row[:2] for row in first} & {row[:2] for row in second}
@@ -0,0 +1,121 @@
+import datetime
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from db.aggregates import EXPENSE
+from db.ledger import LocalLedger
+from db.remote import LedgerError, RemoteLedger
+
+
+class BrokenLedger(LocalLedger):
+
+    def month_snapshot(self, kind, year, month):
+        raise ValueError('a bug in the ledger')
+
+
+def test_invalid_rows_are_bad_requests(ledger_db, serve):
+    remote = serve(LocalLedger())
+
+    with pytest.raises(LedgerError) as error:
+        remote.insert(EXPENSE, 'Cà phê', 30000, datetime.date(2026, 6, 1), 'SOMETIMES')
+
+    assert error.value.status == 400
+
+    with pytest.raises(LedgerError) as error:
+        remote.month_snapshot(EXPENSE, 2026, 13)
+
+    assert error.value.status == 400
+
+
+def test_errors_inside_the_ledger_are_server_errors(ledger_db, serve):
+    remote = serve(BrokenLedger())
+
+    with pytest.raises(LedgerError) as error:
+        remote.month_snapshot(EXPENSE, 2026, 6)
+
+    assert error.value.status == 500
+
+
+class ProxyError(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = b'<html><body>Bad gateway</body></html>'
+        self.send_response(502)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_non_json_replies_raise_ledger_error():
+    server = HTTPServer(('127.0.0.1', 0), ProxyError)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        remote = RemoteLedger('http://127.0.0.1:{}'.format(server.server_address[1]))
+
+        with pytest.raises(LedgerError) as error:
+            remote.budgets(2026, 6)
+
+        assert error.value.status == 502
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_timeouts_raise_ledger_error():
+    # Accepts the connection but never answers
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+
+    try:
+        remote = RemoteLedger('http://127.0.0.1:{}'.format(listener.getsockname()[1]), timeout=0.2)
+
+        with pytest.raises(LedgerError) as error:
+            remote.budgets(2026, 6)
+
+        assert error.value.status is None
+    finally:
+        listener.close()
+
+
+def test_budgets_must_be_whole_non_negative_numbers(ledger_db, serve):
+    remote = serve(LocalLedger())
+
+    for amounts in ({'WASTED': None}, {'WASTED': -1}, {'WASTED': 1.5}, {'SOMETIMES': 1}):
+        with pytest.raises(LedgerError) as error:
+            remote.set_budgets(2026, 6, amounts)
+
+        assert error.value.status == 400
+
+    assert remote.set_budgets(2026, 6, {'WASTED': 0})['WASTED'] == 0
+
+
+def test_numbers_out_of_range_are_bad_requests(ledger_db, serve):
+    remote = serve(LocalLedger())
+    date = datetime.date(2026, 6, 1)
+
+    requests = [
+        lambda: remote.insert(EXPENSE, 'Nhà', 10 ** 30, date, 'MUST_HAVE'),
+        lambda: remote.month_snapshot(EXPENSE, 0, 6),
+        lambda: remote.month_snapshot(EXPENSE, 10000, 6),
+        lambda: remote.monthly_totals(10 ** 30, 6),
+        lambda: remote.get(EXPENSE, 2 ** 63),
+        lambda: remote.update(EXPENSE, 2 ** 63, 'Nhà', 1, date, 'MUST_HAVE'),
+        lambda: remote.set_budgets(2026, 6, {'WASTED': 10 ** 30}),
+        lambda: remote.search('nha', page=10 ** 30),
+    ]
+
+    for request in requests:
+        with pytest.raises(LedgerError) as error:
+            request()
+
+        assert error.value.status == 400
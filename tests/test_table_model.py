@@ -0,0 +1,170 @@
+import datetime
+
+import pytest
+
+from db import Expense
+from db.aggregates import EXPENSE
+from db.changes import RowChange, Save
+from db.ledger import LocalLedger
+from db.queries import EXPENSE_TYPES, month_snapshot
+from screens.table_model import TransactionTableModel
+
+HEADERS = ['ID', 'Nội dung', 'Ngày', *EXPENSE_TYPES]
+
+
+@pytest.fixture
+def model(app):
+    return TransactionTableModel(HEADERS, EXPENSE_TYPES)
+
+
+def add_rows(count):
+    Expense.insert_many(
+        [
+            {
+                'name': f'Chi {number}',
+                'amount_of_money': 1000 * (number + 1),
+                'date': datetime.date(2026, 6, number % 30 + 1),
+                'type': EXPENSE_TYPES[number % 3],
+            }
+            for number in range(count)
+        ]
+    ).execute()
+
+
+def test_rows_are_fetched_in_batches(ledger_db, model):
+    add_rows(250)
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+
+    # No total row until every record is fetched
+    assert model.rowCount() == 100
+    assert model.canFetchMore()
+
+    model.fetchMore()
+    assert model.rowCount() == 200
+
+    model.fetchMore()
+    assert model.rowCount() == 251
+    assert not model.canFetchMore()
+    assert model.isTotalRow(250)
+
+    totals = [
+        sum(1000 * (number + 1) for number in range(250) if number % 3 == code)
+        for code in range(3)
+    ]
+    assert [model.displayText(250, column) for column in range(3, 6)] == [
+        f'{total:,} VNĐ' for total in totals
+    ]
+
+
+def test_rows_are_shown_in_date_order(ledger_db, model):
+    add_rows(40)
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+
+    dates = [model.displayText(row, 2) for row in range(40)]
+    assert dates == sorted(dates, key=lambda date: date[:2])
+    assert model.record(0, EXPENSE).date == datetime.date(2026, 6, 1)
+    assert model.record(40, EXPENSE) is None
+
+
+def shown(model):
+    # What the view displays, total row included
+    return [
+        [model.displayText(row, column) for column in range(len(HEADERS))]
+        for row in range(model.rowCount())
+    ]
+
+
+def fresh(model):
+    # A model loaded from the database, as a month change would show it
+    other = TransactionTableModel(HEADERS, EXPENSE_TYPES)
+    other.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+
+    while other.canFetchMore():
+        other.fetchMore()
+
+    return shown(other)
+
+
+def save(model, *saves):
+    for change in LocalLedger().save([Save(EXPENSE, *fields) for fields in saves]):
+        model.applyChange(change)
+
+
+def test_empty_month_shows_zero_totals(ledger_db, model):
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+
+    assert model.rowCount() == 1
+    assert model.isTotalRow(0)
+    assert [model.displayText(0, column) for column in range(3, 6)] == ['0 VNĐ'] * 3
+
+
+def test_inserts_keep_date_order_and_totals(ledger_db, model):
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+
+    save(
+        model,
+        (None, 'Cuối tháng', 3000, datetime.date(2026, 6, 30), EXPENSE_TYPES[0]),
+        (None, 'Đầu tháng', 1000, datetime.date(2026, 6, 1), EXPENSE_TYPES[1]),
+        (None, 'Giữa tháng', 2000, datetime.date(2026, 6, 15), EXPENSE_TYPES[0]),
+    )
+
+    assert inserted == [(0, 0), (0, 0), (1, 1)]
+    assert [model.displayText(row, 1) for row in range(3)] == ['Đầu tháng', 'Giữa tháng', 'Cuối tháng']
+    assert [model.displayText(3, column) for column in range(3, 6)] == ['5,000 VNĐ', '1,000 VNĐ', '0 VNĐ']
+    assert shown(model) == fresh(model)
+
+
+def test_edits_move_rows_and_totals(ledger_db, model):
+    add_rows(3)
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+    first = model.record(0, EXPENSE)
+
+    # Amount and type change together, then the day moves past the others
+    save(model, (first.id, first.name, 9000, first.date, EXPENSE_TYPES[2]))
+    assert model.displayText(0, 3) == ''
+    assert model.displayText(0, 5) == '9,000 VNĐ'
+
+    save(model, (first.id, 'Dời ngày', 9000, datetime.date(2026, 6, 20), EXPENSE_TYPES[2]))
+    assert model.displayText(2, 1) == 'Dời ngày'
+    assert model.rowCount() == 4
+    assert shown(model) == fresh(model)
+
+
+def test_inserts_past_the_fetched_rows_wait_for_fetch_more(ledger_db, model):
+    add_rows(150)
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+
+    # Day 30 sorts after every fetched row, day 1 among them
+    save(
+        model,
+        (None, 'Sau', 500, datetime.date(2026, 6, 30), EXPENSE_TYPES[0]),
+        (None, 'Trước', 500, datetime.date(2026, 6, 1), EXPENSE_TYPES[0]),
+    )
+    names = [model.displayText(row, 1) for row in range(model.rowCount())]
+    assert model.rowCount() == 101
+    assert 'Trước' in names
+    assert 'Sau' not in names
+
+    model.fetchMore()
+    assert model.rowCount() == 153
+    assert model.displayText(151, 1) == 'Sau'
+    assert shown(model) == fresh(model)
+
+
+def test_provisional_rows_take_their_stored_id(ledger_db, model):
+    add_rows(2)
+    model.setSnapshot(month_snapshot(EXPENSE, 2026, 6))
+    model.applyChange(RowChange(EXPENSE, -1, 'Chưa lưu', datetime.date(2026, 6, 2), None, 700, None, EXPENSE_TYPES[1]))
+
+    ids = [model.record(row, EXPENSE).id for row in range(3)]
+    assert model.displayText(ids.index(-1), 0) == ''
+
+    [change] = LocalLedger().save([Save(EXPENSE, None, 'Chưa lưu', 700, datetime.date(2026, 6, 2), EXPENSE_TYPES[1])])
+    model.replaceIds({-1: change.id})
+
+    ids = [model.record(row, EXPENSE).id for row in range(3)]
+    assert -1 not in ids
+    assert model.displayText(ids.index(change.id), 1) == 'Chưa lưu'
+    assert shown(model) == fresh(model)
@@ -0,0 +1,139 @@
+import datetime
+import socket
+import time
+
+import pytest
+
+from db import Income, Expense
+from db.aggregates import INCOME, EXPENSE
+from db.changes import Row
+from db.ledger import LocalLedger
+from db.remote import RemoteLedger
+from helpers.write_queue import WriteQueue
+
+DATE = datetime.date(2026, 6, 1)
+
+
+class FlakyLedger(LocalLedger):
+    # Fails the first `failures` writes
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def save(self, saves):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('ledger unreachable')
+
+        return super().save(saves)
+
+
+@pytest.fixture
+def queue(app):
+    queues = []
+
+    def make(ledger, retries=3):
+        queue = WriteQueue(ledger, delay=0, retries=retries)
+        queue.events = []
+        queue.saved.connect(lambda changes, ids: queue.events.append(('saved', changes, ids)))
+        queue.failed.connect(lambda error, saves: queue.events.append(('failed', error, saves)))
+        queues.append(queue)
+        return queue
+
+    yield make
+
+    for queue in queues:
+        queue.close()
+
+
+def settle(app, queue):
+    # Until the queue has written everything, retries included
+    for _ in range(100):
+        queue.flush()
+        queue.pool.waitForDone()
+        app.processEvents()
+
+        if not queue.retry and not queue.pending:
+            return
+
+
+def test_a_failed_batch_is_written_later(app, ledger_db, queue):
+    writes = queue(FlakyLedger(failures=1))
+
+    first = writes.insert(EXPENSE, 'Cà phê', 30000, DATE, 'WASTED')
+    writes.flush()
+    writes.pool.waitForDone()
+    app.processEvents()
+
+    # The row inserted by the failed batch is edited, and another one added
+    original = Row(EXPENSE, first.id, 'Cà phê', 30000, DATE, 'WASTED')
+    writes.update(original, 'Cà phê sữa', 35000, DATE, 'WASTED')
+    writes.insert(INCOME, 'Lương', 10000000, DATE)
+    settle(app, writes)
+
+    assert sorted(Expense.select(Expense.name, Expense.amount_of_money).tuples()) == [('Cà phê sữa', 35000)]
+    assert Income.select().count() == 1
+    assert not [event for event in writes.events if event[0] == 'failed']
+
+    ids = {}
+    for event in writes.events:
+        ids.update(event[2])
+    assert set(ids) == {first.id, first.id - 1}
+
+
+def test_a_refused_save_does_not_hold_back_the_others(app, ledger_db, queue):
+    writes = queue(LocalLedger(), retries=2)
+
+    writes.insert(EXPENSE, 'Ăn trưa', 50000, DATE, 'MUST_HAVE')
+    # A row that is not in the ledger cannot be updated
+    writes.update(Row(EXPENSE, 12345, 'Gone', 1, DATE, 'WASTED'), 'Gone', 2, DATE, 'WASTED')
+    writes.insert(EXPENSE, 'Bánh mì', 20000, DATE, 'MUST_HAVE')
+    settle(app, writes)
+
+    assert sorted(Expense.select(Expense.name).tuples()) == [('Bánh mì',), ('Ăn trưa',)]
+
+    failed = [event for event in writes.events if event[0] == 'failed']
+    assert len(failed) == 1
+    assert [save.name for save in failed[0][2]] == ['Gone']
+
+
+class SlowLedger(LocalLedger):
+    # Makes the saves, then answers after the client gave up waiting
+
+    def save(self, saves):
+        changes = super().save(saves)
+        time.sleep(0.5)
+        return changes
+
+
+def test_saves_without_a_reply_are_not_repeated(app, ledger_db, queue, serve):
+    writes = queue(serve(SlowLedger(), timeout=0.2))
+
+    writes.insert(EXPENSE, 'Cà phê', 30000, DATE, 'WASTED')
+    settle(app, writes)
+
+    assert Expense.select().count() == 1
+
+    failed = [event for event in writes.events if event[0] == 'failed']
+    assert len(failed) == 1
+    assert failed[0][1].unknown
+    assert [save.name for save in failed[0][2]] == ['Cà phê']
+
+
+def test_saves_that_never_reached_the_server_are_tried_again(app, ledger_db, queue):
+    # Nothing listens on the port, so nothing was sent
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    port = listener.getsockname()[1]
+    listener.close()
+
+    writes = queue(RemoteLedger(f'http://127.0.0.1:{port}', timeout=1))
+    writes.insert(EXPENSE, 'Cà phê', 30000, DATE, 'WASTED')
+    writes.flush()
+    writes.pool.waitForDone()
+    app.processEvents()
+
+    assert [save.name for _, save, _ in writes.retry] == ['Cà phê']
+    assert not [event for event in writes.events if event[0] == 'failed']
+    writes.retry = []
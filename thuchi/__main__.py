@@ -0,0 +1,55 @@
+import argparse
+import datetime
+import json
+import sys
+
+from db import commands as db_commands
+import reports
+
+
+def parse_month(value):
+    try:
+        date = datetime.datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid month {value!r}, expected YYYY-MM')
+
+    return date.year, date.month
+
+
+def report_command(args):
+    if args.year is not None:
+        report = reports.year_report(args.year)
+        text = reports.render_year(report)
+    else:
+        year, month = args.month or (datetime.date.today().year, datetime.date.today().month)
+        report = reports.month_report(year, month)
+        text = reports.render_month(report)
+
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(text)
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m thuchi')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('report', help='month or year summary, without starting the GUI')
+    period = command.add_mutually_exclusive_group()
+    period.add_argument('--month', type=parse_month, help='YYYY-MM, default: this month')
+    period.add_argument('--year', type=int)
+    command.add_argument('--json', action='store_true', help='machine readable output')
+    command.set_defaults(handler=report_command)
+
+    db_commands.add_commands(commands)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())